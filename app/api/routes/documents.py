@@ -3,18 +3,57 @@ Document management endpoints
 Handles document upload, retrieval, and deletion
 """
 
-from fastapi import APIRouter, UploadFile, File, HTTPException, status
+from fastapi import APIRouter, UploadFile, File, HTTPException, Response, status
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import BinaryIO, List, Optional, Tuple
+from datetime import datetime
+from pathlib import Path
+import asyncio
+import hashlib
 import logging
+import os
+import tempfile
 
 from app.config import get_settings
-from app.utils.helpers import sanitize_filename, format_bytes
+from app.services.document_service import get_document_service
+from app.utils.helpers import sanitize_filename, format_bytes, generate_document_id
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Size of each read when streaming an upload to disk
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+def _copy_upload(source: BinaryIO, dest_path: str, max_size: int) -> Tuple[int, str]:
+    """
+    Copy an upload's spooled file to disk in fixed-size chunks
+    
+    Reads into a reusable buffer so no intermediate bytes objects are created,
+    hashing as it goes and aborting as soon as max_size is exceeded.
+    
+    Returns:
+        Tuple of (file size in bytes, SHA-256 hex digest)
+    """
+    buffer = bytearray(UPLOAD_CHUNK_SIZE)
+    view = memoryview(buffer)
+    hasher = hashlib.sha256()
+    size = 0
+    
+    with open(dest_path, "wb") as out:
+        while n := source.readinto(buffer):
+            size += n
+            if size > max_size:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"File exceeds maximum allowed size {format_bytes(max_size)}"
+                )
+            hasher.update(view[:n])
+            out.write(view[:n])
+    
+    return size, hasher.hexdigest()
+
 
 class DocumentUploadResponse(BaseModel):
     """Response model for document upload"""
@@ -32,7 +71,7 @@ class DocumentMetadata(BaseModel):
     filename: str
     file_size: str
     file_type: str
-    created_at: str
+    created_at: datetime  # Serialized to ISO 8601 by pydantic-core
     status: str
 
 
@@ -44,40 +83,41 @@ async def upload_document(file: UploadFile = File(...)):
     Supports: PDF, DOCX, TXT, DOC files
     Max size: 10MB (configurable)
     """
-    logger.info(f"Received upload request for file: {file.filename}")
+    logger.info("Received upload request for file: %s", file.filename)
     
     # Validate file extension
-    file_extension = file.filename.split(".")[-1].lower()
-    if file_extension not in settings.allowed_extensions:
+    file_extension = os.path.splitext(file.filename)[1][1:].lower()
+    if file_extension not in settings.allowed_extension_set:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"File type .{file_extension} not allowed. Allowed types: {', '.join(settings.allowed_extensions)}"
         )
     
-    # Read file content
-    content = await file.read()
-    file_size = len(content)
+    # Copy the spooled upload straight to a temporary file in a worker thread,
+    # rejecting oversize uploads early
+    fd, tmp_path = tempfile.mkstemp(suffix=f".{file_extension}")
+    os.close(fd)
     
-    # Validate file size
-    if file_size > settings.max_upload_size:
-        raise HTTPException(
-            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            detail=f"File size {format_bytes(file_size)} exceeds maximum allowed size {format_bytes(settings.max_upload_size)}"
+    try:
+        file_size, content_hash = await asyncio.to_thread(
+            _copy_upload, file.file, tmp_path, settings.max_upload_size
         )
-    
-    # Sanitize filename
-    safe_filename = sanitize_filename(file.filename)
-    
-    # TODO: Implement actual document processing
-    # - Save file to storage
-    # - Generate document ID
-    # - Process document (extract text, chunk, generate embeddings)
-    # - Store in vector database
-    
-    logger.info(f"Document upload placeholder - file: {safe_filename}, size: {format_bytes(file_size)}")
+        
+        # Sanitize filename
+        safe_filename = sanitize_filename(file.filename)
+        document_id = generate_document_id(safe_filename, content_hash)
+        
+        # TODO: Implement actual document processing
+        # - Move temporary file to storage
+        # - Process document (extract text, chunk, generate embeddings)
+        # - Store in vector database
+        
+        logger.info("Document upload placeholder - file: %s, size: %s", safe_filename, format_bytes(file_size))
+    finally:
+        Path(tmp_path).unlink(missing_ok=True)
     
     return DocumentUploadResponse(
-        document_id="doc_placeholder_123",
+        document_id=document_id,
         filename=safe_filename,
         file_size=format_bytes(file_size),
         file_type=file_extension,
@@ -92,7 +132,7 @@ async def get_document(document_id: str):
     Retrieve document metadata by ID
     """
     # TODO: Implement document retrieval from database
-    logger.info(f"Retrieving document: {document_id}")
+    logger.info("Retrieving document: %s", document_id)
     
     raise HTTPException(
         status_code=status.HTTP_501_NOT_IMPLEMENTED,
@@ -106,7 +146,7 @@ async def delete_document(document_id: str):
     Delete a document and its embeddings
     """
     # TODO: Implement document deletion
-    logger.info(f"Deleting document: {document_id}")
+    logger.info("Deleting document: %s", document_id)
     
     raise HTTPException(
         status_code=status.HTTP_501_NOT_IMPLEMENTED,
@@ -115,11 +155,38 @@ async def delete_document(document_id: str):
 
 
 @router.get("/", response_model=List[DocumentMetadata])
-async def list_documents(skip: int = 0, limit: int = 10):
+async def list_documents(
+    response: Response,
+    skip: int = 0,
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    include_count: bool = False
+):
     """
-    List all documents with pagination
+    List documents with pagination, in upload order
+    
+    Pass the last document_id of the previous page as `cursor` for keyset
+    pagination; otherwise `skip`/`limit` offset pagination is used. Both
+    modes use the same order.
+    The total count is only computed (X-Total-Count header) when
+    `include_count` is true.
     """
-    # TODO: Implement document listing
-    logger.info(f"Listing documents - skip: {skip}, limit: {limit}")
+    logger.info("Listing documents - skip: %d, limit: %d, cursor: %s", skip, limit, cursor)
+    
+    document_service = get_document_service()
+    documents = await document_service.list_documents(skip=skip, limit=limit, cursor=cursor)
     
-    return []
+    if include_count:
+        response.headers["X-Total-Count"] = str(await document_service.get_document_count())
+    
+    return [
+        DocumentMetadata(
+            document_id=doc.document_id,
+            filename=doc.filename,
+            file_size=format_bytes(doc.file_size),
+            file_type=doc.file_type,
+            created_at=doc.upload_date,
+            status=doc.status.value
+        )
+        for doc in documents
+    ]
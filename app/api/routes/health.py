@@ -4,8 +4,10 @@ Health check endpoints
 
 from fastapi import APIRouter, status
 from pydantic import BaseModel
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
+import asyncio
 import logging
+import time
 
 from app.config import get_settings
 
@@ -13,6 +15,11 @@ router = APIRouter()
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Readiness probes fire every few seconds; the answer rarely changes
+READINESS_TTL = 5.0
+PROBE_TIMEOUT = 2.0
+_last_readiness: Optional[Tuple[float, "DetailedHealthResponse"]] = None
+
 
 class HealthResponse(BaseModel):
     """Health check response model"""
@@ -42,53 +49,82 @@ async def health_check():
     )
 
 
+async def _probe_openai() -> Dict[str, Any]:
+    """Check OpenAI configuration"""
+    openai_api_key = settings.openai_api_key
+    if openai_api_key and openai_api_key != "your_openai_api_key_here":
+        return {"status": "configured", "model": settings.openai_model}
+    return {"status": "not_configured"}
+
+
+async def _probe_pinecone() -> Dict[str, Any]:
+    """Check Pinecone configuration"""
+    pinecone_api_key = settings.pinecone_api_key
+    if pinecone_api_key and pinecone_api_key != "your_pinecone_api_key_here":
+        return {
+            "status": "configured",
+            "index": settings.pinecone_index_name,
+            "environment": settings.pinecone_environment
+        }
+    return {"status": "not_configured"}
+
+
+async def _probe_teams_bot() -> Dict[str, Any]:
+    """Check Teams bot configuration (optional)"""
+    microsoft_app_id = settings.microsoft_app_id
+    if microsoft_app_id and microsoft_app_id != "your_azure_app_id_here":
+        return {"status": "configured"}
+    return {"status": "not_configured", "note": "optional"}
+
+
+# Service name -> (probe, required for readiness)
+_READINESS_PROBES = {
+    "openai": (_probe_openai, True),
+    "pinecone": (_probe_pinecone, True),
+    "teams_bot": (_probe_teams_bot, False),
+}
+
+
 @router.get("/readiness", response_model=DetailedHealthResponse)
 async def readiness_check():
     """
     Readiness check - verifies all dependencies are available
     Checks connections to external services (OpenAI, Pinecone, etc.)
+    Probes run concurrently, each bounded by PROBE_TIMEOUT
     """
+    global _last_readiness
+    
+    now = time.monotonic()
+    if _last_readiness is not None and now - _last_readiness[0] < READINESS_TTL:
+        return _last_readiness[1]
+    
+    results = await asyncio.gather(
+        *(asyncio.wait_for(probe(), timeout=PROBE_TIMEOUT) for probe, _ in _READINESS_PROBES.values()),
+        return_exceptions=True
+    )
+    
     services_status = {}
     overall_healthy = True
     
-    # Check OpenAI configuration
-    try:
-        if settings.openai_api_key and settings.openai_api_key != "your_openai_api_key_here":
-            services_status["openai"] = {"status": "configured", "model": settings.openai_model}
-        else:
-            services_status["openai"] = {"status": "not_configured"}
+    for (name, (_, required)), result in zip(_READINESS_PROBES.items(), results):
+        if isinstance(result, asyncio.TimeoutError):
+            result = {"status": "timeout"}
+        elif isinstance(result, Exception):
+            result = {"status": "error", "message": str(result)}
+        
+        services_status[name] = result
+        if required and result["status"] != "configured":
             overall_healthy = False
-    except Exception as e:
-        services_status["openai"] = {"status": "error", "message": str(e)}
-        overall_healthy = False
     
-    # Check Pinecone configuration
-    try:
-        if settings.pinecone_api_key and settings.pinecone_api_key != "your_pinecone_api_key_here":
-            services_status["pinecone"] = {
-                "status": "configured",
-                "index": settings.pinecone_index_name,
-                "environment": settings.pinecone_environment
-            }
-        else:
-            services_status["pinecone"] = {"status": "not_configured"}
-            overall_healthy = False
-    except Exception as e:
-        services_status["pinecone"] = {"status": "error", "message": str(e)}
-        overall_healthy = False
-    
-    # Check Teams bot configuration (optional)
-    if settings.microsoft_app_id and settings.microsoft_app_id != "your_azure_app_id_here":
-        services_status["teams_bot"] = {"status": "configured"}
-    else:
-        services_status["teams_bot"] = {"status": "not_configured", "note": "optional"}
-    
-    return DetailedHealthResponse(
+    response = DetailedHealthResponse(
         status="healthy" if overall_healthy else "degraded",
         version="1.0.0",
         environment=settings.env,
         services=services_status
     )
+    _last_readiness = (now, response)
+    
+    return response
 
 
 @router.get("/liveness", status_code=status.HTTP_200_OK)
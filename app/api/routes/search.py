@@ -4,10 +4,13 @@ Handles document search and similarity queries
 """
 
 from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 import logging
 
+from app.services.search_service import get_search_service
+
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
@@ -44,20 +47,56 @@ async def semantic_search(request: SearchRequest):
     
     Uses vector embeddings and similarity matching
     """
-    logger.info(f"Search query: {request.query}, top_k: {request.top_k}")
+    logger.info("Search query: %s, top_k: %d", request.query, request.top_k)
     
-    # TODO: Implement semantic search using Pinecone
-    # - Generate query embedding
-    # - Search Pinecone index
-    # - Filter by metadata if provided
-    # - Return ranked results
+    search_results = await get_search_service().search(
+        query=request.query,
+        top_k=request.top_k,
+        filter=request.filter,
+        threshold=request.threshold
+    )
     
-    raise HTTPException(
-        status_code=status.HTTP_501_NOT_IMPLEMENTED,
-        detail="Semantic search will be implemented in AI & NLP phase"
+    # Built from already-typed service results, so skip re-validation
+    results = [
+        SearchResult.model_construct(
+            document_id=result.metadata.get("document_id", result.document_id),
+            filename=result.metadata.get("original_filename") or result.metadata.get("source", ""),
+            relevance_score=result.score,
+            snippet=result.text,
+            metadata=result.metadata
+        )
+        for result in search_results["results"]
+    ]
+    
+    return SearchResponse.model_construct(
+        query=request.query,
+        results=results,
+        total_results=len(results),
+        search_time=search_results["search_time_ms"] / 1000
     )
 
 
+@router.post("/answer/stream")
+async def stream_answer(request: SearchRequest):
+    """
+    Search documents and stream the generated answer
+    
+    Returns a Server-Sent Events stream; each event carries a chunk of the answer
+    and the stream ends with a `[DONE]` event
+    """
+    logger.info("Streaming answer for query: %s, top_k: %d", request.query, request.top_k)
+    
+    async def event_stream():
+        async for chunk in get_search_service().stream_answer(request.query, request.top_k):
+            # SSE data lines cannot contain raw newlines
+            for line in chunk.split("\n"):
+                yield f"data: {line}\n"
+            yield "\n"
+        yield "data: [DONE]\n\n"
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
 @router.get("/similar/{document_id}", response_model=SearchResponse)
 async def find_similar(
     document_id: str,
@@ -67,7 +106,7 @@ async def find_similar(
     """
     Find documents similar to the specified document
     """
-    logger.info(f"Finding similar documents to: {document_id}")
+    logger.info("Finding similar documents to: %s", document_id)
     
     # TODO: Implement similarity search
     # - Get document embedding from Pinecone
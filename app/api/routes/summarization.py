@@ -57,7 +57,7 @@ async def batch_summarize(document_ids: list[str]):
     Returns job ID for tracking
     """
     # TODO: Implement batch processing
-    logger.info(f"Batch summarization request for {len(document_ids)} documents")
+    logger.info("Batch summarization request for %d documents", len(document_ids))
     
     raise HTTPException(
         status_code=status.HTTP_501_NOT_IMPLEMENTED,
@@ -71,7 +71,7 @@ async def get_summarization_job(job_id: str):
     Get status of summarization job
     """
     # TODO: Implement job status tracking
-    logger.info(f"Checking status for job: {job_id}")
+    logger.info("Checking status for job: %s", job_id)
     
     raise HTTPException(
         status_code=status.HTTP_501_NOT_IMPLEMENTED,
@@ -2,6 +2,7 @@
 Bot configuration and adapter setup.
 """
 import logging
+from functools import cache
 from botbuilder.core import BotFrameworkAdapter, BotFrameworkAdapterSettings
 from botbuilder.schema import Activity
 
@@ -26,7 +27,7 @@ class BotConfig:
         
         # Error handler
         async def on_error(context, error):
-            logger.error(f"Bot error: {error}")
+            logger.error("Bot error: %s", error)
             await context.send_activity("Sorry, something went wrong!")
         
         self.adapter.on_turn_error = on_error
@@ -36,13 +37,7 @@ class BotConfig:
         return self.adapter
 
 
-# Global bot config instance
-_bot_config = None
-
-
+@cache
 def get_bot_config() -> BotConfig:
     """Get or create bot configuration."""
-    global _bot_config
-    if _bot_config is None:
-        _bot_config = BotConfig()
-    return _bot_config
+    return BotConfig()
@@ -1,16 +1,23 @@
 """
 Microsoft Teams Bot implementation.
 """
+import asyncio
 import logging
-from typing import Dict, Any, List
+import sys
+from collections import deque
+from typing import Dict, Any, List, Callable, Awaitable, ClassVar, Set
+import numpy as np
+from cachetools import TTLCache
 from botbuilder.core import ActivityHandler, TurnContext, MessageFactory
 from botbuilder.schema import Activity, ActivityTypes, ChannelAccount, CardAction, ActionTypes
 
 from app.services.summarization_service import get_summarization_service
 from app.services.search_service import get_search_service
 from app.chains.meeting_notes_chain import create_meeting_notes_chain
+from app.config import get_settings
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
 
 
 class TeamsBot(ActivityHandler):
@@ -18,12 +25,60 @@ class TeamsBot(ActivityHandler):
     Microsoft Teams Bot for AI-Powered Workplace Automation.
     """
 
+    _HELP_TEXT: ClassVar[str] = """
+**AI Workplace Automation Bot - Available Commands**
+
+📝 **/summarize [text]** - Summarize the provided text
+- Example: `/summarize [paste long text here]`
+
+🔍 **/search [query]** - Search documents and get AI-generated answers
+- Example: `/search What were the Q4 revenue targets?`
+
+📅 **/meeting [transcript]** - Extract action items and decisions from meeting notes
+- Example: `/meeting [paste meeting transcript]`
+
+🗑️ **/clear** - Clear your conversation history
+
+❓ **/help** - Show this help message
+
+You can also just chat with me naturally, and I'll try to help!
+"""
+
+    # Cosine similarity above which extracted items are treated as duplicates
+    _NEAR_DUPLICATE_THRESHOLD: ClassVar[float] = 0.95
+
+    _WELCOME_TEXT: ClassVar[str] = (
+        "👋 **Welcome to AI Workplace Automation Bot!**\n\n"
+        "I can help you with:\n"
+        "📝 Document summarization\n"
+        "🔍 Semantic search across documents\n"
+        "📅 Meeting notes extraction\n\n"
+        "Type **/help** to see all available commands!"
+    )
+
     def __init__(self):
         super().__init__()
         self.summarization_service = get_summarization_service()
         self.search_service = get_search_service()
         self.meeting_notes_chain = create_meeting_notes_chain()
-        self.user_sessions: Dict[str, Dict[str, Any]] = {}
+        # Exact-match answers keyed by normalized query; near-duplicates are
+        # handled by the search service's answer cache
+        self._exact_answer_cache: TTLCache = TTLCache(maxsize=2000, ttl=600)
+        self._background_tasks: Set[asyncio.Task] = set()
+        # Per-user sessions, bounded by LRU size and idle TTL
+        self.user_sessions: TTLCache = TTLCache(
+            maxsize=settings.bot_max_sessions,
+            ttl=settings.bot_session_ttl
+        )
+        
+        # Command dispatch table: handler(turn_context, args, user_id)
+        self._commands: Dict[str, Callable[[TurnContext, str, str], Awaitable[None]]] = {
+            "/help": lambda ctx, args, user_id: self._command_help(ctx),
+            "/summarize": lambda ctx, args, user_id: self._command_summarize(ctx, args),
+            "/search": lambda ctx, args, user_id: self._command_search(ctx, args),
+            "/meeting": lambda ctx, args, user_id: self._command_meeting_notes(ctx, args),
+            "/clear": lambda ctx, args, user_id: self._command_clear(ctx, user_id),
+        }
 
     async def on_message_activity(self, turn_context: TurnContext):
         """
@@ -31,14 +86,12 @@ class TeamsBot(ActivityHandler):
         """
         try:
             text = turn_context.activity.text.strip()
-            user_id = turn_context.activity.from_property.id
+            # Interned so repeated session lookups for the same user compare by identity
+            user_id = sys.intern(turn_context.activity.from_property.id)
 
-            # Initialize user session if needed
-            if user_id not in self.user_sessions:
-                self.user_sessions[user_id] = {
-                    "conversation_history": [],
-                    "last_command": None
-                }
+            # Initialize user session if needed, refreshing its TTL otherwise
+            session = self.user_sessions.get(user_id)
+            self.user_sessions[user_id] = session or self._new_session()
 
             # Handle commands
             if text.startswith('/'):
@@ -47,26 +100,42 @@ class TeamsBot(ActivityHandler):
                 await self._handle_conversation(turn_context, text, user_id)
 
         except Exception as e:
-            logger.error(f"Error in on_message_activity: {e}")
+            logger.error("Error in on_message_activity: %s", e)
             await turn_context.send_activity(
                 "Sorry, I encountered an error processing your request."
             )
 
+    @staticmethod
+    def _new_session() -> Dict[str, Any]:
+        """Create an empty user session with a capped conversation history."""
+        return {
+            "conversation_history": deque(maxlen=settings.bot_max_history),
+            "last_command": None
+        }
+
+    def _send_typing(self, turn_context: TurnContext):
+        """Send a typing indicator in the background."""
+        task = asyncio.create_task(
+            turn_context.send_activity(Activity(type=ActivityTypes.typing))
+        )
+        # Keep a reference so the task is not garbage collected mid-flight
+        self._background_tasks.add(task)
+        task.add_done_callback(self._on_background_task_done)
+
+    def _on_background_task_done(self, task: asyncio.Task):
+        """Release a finished background task and log its failure, if any."""
+        self._background_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Background bot activity failed: %s", task.exception())
+
     async def _handle_command(self, turn_context: TurnContext, text: str, user_id: str):
         """Handle bot commands."""
-        command = text.split()[0].lower()
+        command = text.split(maxsplit=1)[0].lower()
         args = text[len(command):].strip()
 
-        if command == "/help":
-            await self._command_help(turn_context)
-        elif command == "/summarize":
-            await self._command_summarize(turn_context, args)
-        elif command == "/search":
-            await self._command_search(turn_context, args)
-        elif command == "/meeting":
-            await self._command_meeting_notes(turn_context, args)
-        elif command == "/clear":
-            await self._command_clear(turn_context, user_id)
+        handler = self._commands.get(command)
+        if handler:
+            await handler(turn_context, args, user_id)
         else:
             await turn_context.send_activity(
                 f"Unknown command: {command}. Type /help for available commands."
@@ -74,25 +143,7 @@ class TeamsBot(ActivityHandler):
 
     async def _command_help(self, turn_context: TurnContext):
         """Display help information."""
-        help_text = """
-**AI Workplace Automation Bot - Available Commands**
-
-📝 **/summarize [text]** - Summarize the provided text
-- Example: `/summarize [paste long text here]`
-
-🔍 **/search [query]** - Search documents and get AI-generated answers
-- Example: `/search What were the Q4 revenue targets?`
-
-📅 **/meeting [transcript]** - Extract action items and decisions from meeting notes
-- Example: `/meeting [paste meeting transcript]`
-
-🗑️ **/clear** - Clear your conversation history
-
-❓ **/help** - Show this help message
-
-You can also just chat with me naturally, and I'll try to help!
-"""
-        await turn_context.send_activity(help_text)
+        await turn_context.send_activity(self._HELP_TEXT)
 
     async def _command_summarize(self, turn_context: TurnContext, text: str):
         """Summarize provided text."""
@@ -103,10 +154,8 @@ You can also just chat with me naturally, and I'll try to help!
             return
 
         try:
-            # Send typing indicator
-            await turn_context.send_activity(
-                Activity(type=ActivityTypes.typing)
-            )
+            # Send typing indicator without delaying the actual work
+            self._send_typing(turn_context)
 
             # Summarize
             result = await self.summarization_service.summarize_text(
@@ -120,7 +169,7 @@ You can also just chat with me naturally, and I'll try to help!
             await turn_context.send_activity(response)
 
         except Exception as e:
-            logger.error(f"Error in summarize command: {e}")
+            logger.error("Error in summarize command: %s", e)
             await turn_context.send_activity(
                 "Sorry, I couldn't summarize the text. Please try again."
             )
@@ -134,32 +183,42 @@ You can also just chat with me naturally, and I'll try to help!
             return
 
         try:
-            # Send typing indicator
-            await turn_context.send_activity(
-                Activity(type=ActivityTypes.typing)
-            )
-
-            # Search with answer
-            result = await self.search_service.search_with_answer(
-                query=query,
-                top_k=5
-            )
+            # Send typing indicator without delaying the actual work
+            self._send_typing(turn_context)
+
+            # Reuse answers to identical queries without embedding them
+            query_key = " ".join(query.lower().split())
+            result = self._exact_answer_cache.get(query_key)
+
+            if result is None:
+                # Search with answer
+                result = await self.search_service.search_with_answer(
+                    query=query,
+                    top_k=5
+                )
+                self._exact_answer_cache[query_key] = result
+                cached = False
+            else:
+                cached = True
 
             # Format response
-            response = f"**Answer**\n\n{result['answer']}\n\n"
-            response += f"**Sources** ({len(result['results'])} documents)\n"
-            
-            for i, doc in enumerate(result['results'][:3], 1):
-                score = int(doc.score * 100)
-                source = doc.metadata.get('source', 'Unknown')
-                response += f"{i}. {source} (relevance: {score}%)\n"
-
-            response += f"\n_Search time: {result['search_time_ms']:.0f}ms_"
+            results = result['results']
+            sources = "".join([
+                f"{i}. {doc.metadata.get('source', 'Unknown')} (relevance: {int(doc.score * 100)}%)\n"
+                for i, doc in enumerate(results[:3], 1)
+            ])
+            footer = "_(cached)_" if cached else f"_Search time: {result['search_time_ms']:.0f}ms_"
+
+            response = (
+                f"**Answer**\n\n{result['answer']}\n\n"
+                f"**Sources** ({len(results)} documents)\n"
+                f"{sources}\n{footer}"
+            )
 
             await turn_context.send_activity(response)
 
         except Exception as e:
-            logger.error(f"Error in search command: {e}")
+            logger.error("Error in search command: %s", e)
             await turn_context.send_activity(
                 "Sorry, I couldn't complete the search. Please try again."
             )
@@ -173,50 +232,91 @@ You can also just chat with me naturally, and I'll try to help!
             return
 
         try:
-            # Send typing indicator
-            await turn_context.send_activity(
-                Activity(type=ActivityTypes.typing)
+            # Send typing indicator without delaying the actual work
+            self._send_typing(turn_context)
+
+            # Extract everything the reply shows in one LLM call
+            result = await asyncio.to_thread(
+                self.meeting_notes_chain.extract_all,
+                text,
+                ("decisions", "action_items", "key_points"),
             )
 
-            # Extract meeting notes
-            result = self.meeting_notes_chain.extract_meeting_notes(text)
+            # Collapse reworded duplicates before display
+            decisions = await asyncio.to_thread(
+                self._deduplicate, result.get('decisions') or [], 'decision'
+            )
+            action_items = await asyncio.to_thread(
+                self._deduplicate, result.get('action_items') or [], 'task'
+            )
 
             # Format response
-            response = "**Meeting Notes Extracted**\n\n"
-
-            if result.get('decisions'):
-                response += f"**Decisions** ({len(result['decisions'])})\n"
-                for i, decision in enumerate(result['decisions'][:5], 1):
-                    response += f"{i}. {decision['decision']}\n"
-                response += "\n"
-
-            if result.get('action_items'):
-                response += f"**Action Items** ({len(result['action_items'])})\n"
-                for i, item in enumerate(result['action_items'][:5], 1):
-                    owner = item.get('owner', 'Unassigned')
-                    response += f"{i}. {item['task']} - {owner}\n"
-                response += "\n"
-
-            if result.get('key_points'):
-                response += f"**Key Points**\n"
-                for point in result['key_points'][:3]:
-                    response += f"• {point}\n"
+            parts = ["**Meeting Notes Extracted**\n\n"]
+
+            if decisions:
+                parts.append(f"**Decisions** ({len(decisions)})\n")
+                parts.extend(
+                    f"{i}. {decision['decision']}\n"
+                    for i, decision in enumerate(decisions[:5], 1)
+                )
+                parts.append("\n")
+
+            if action_items:
+                parts.append(f"**Action Items** ({len(action_items)})\n")
+                parts.extend(
+                    f"{i}. {item['task']} - {item.get('owner') or 'Unassigned'}\n"
+                    for i, item in enumerate(action_items[:5], 1)
+                )
+                parts.append("\n")
+
+            key_points = result.get('key_points')
+            if key_points:
+                parts.append("**Key Points**\n")
+                parts.extend(f"• {point}\n" for point in key_points[:3])
+
+            response = "".join(parts)
 
             await turn_context.send_activity(response)
 
         except Exception as e:
-            logger.error(f"Error in meeting notes command: {e}")
+            logger.error("Error in meeting notes command: %s", e)
             await turn_context.send_activity(
                 "Sorry, I couldn't extract meeting notes. Please try again."
             )
 
+    def _deduplicate(self, items: List[Dict[str, Any]], key: str) -> List[Dict[str, Any]]:
+        """
+        Drop near-duplicate items by embedding similarity of their `key` text.
+
+        Items are kept greedily in order; an item is dropped when its cosine
+        similarity to an already kept item exceeds _NEAR_DUPLICATE_THRESHOLD.
+        """
+        if len(items) < 2:
+            return items
+
+        try:
+            vectors = self.search_service.embeddings_service.embed_texts(
+                [str(item.get(key, '')) for item in items]
+            )
+        except Exception as e:
+            logger.warning("Skipping deduplication of %s items: %s", key, e)
+            return items
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors /= np.where(norms == 0, 1, norms)
+        similarities = vectors @ vectors.T
+
+        kept: List[int] = []
+        for i in range(len(items)):
+            if not kept or similarities[i, kept].max() <= self._NEAR_DUPLICATE_THRESHOLD:
+                kept.append(i)
+
+        return [items[i] for i in kept]
+
     async def _command_clear(self, turn_context: TurnContext, user_id: str):
         """Clear user conversation history."""
         if user_id in self.user_sessions:
-            self.user_sessions[user_id] = {
-                "conversation_history": [],
-                "last_command": None
-            }
+            self.user_sessions[user_id] = self._new_session()
         await turn_context.send_activity("✅ Conversation history cleared!")
 
     async def _handle_conversation(self, turn_context: TurnContext, text: str, user_id: str):
@@ -243,21 +343,13 @@ You can also just chat with me naturally, and I'll try to help!
         """
         for member in members_added:
             if member.id != turn_context.activity.recipient.id:
-                welcome_message = (
-                    "👋 **Welcome to AI Workplace Automation Bot!**\n\n"
-                    "I can help you with:\n"
-                    "📝 Document summarization\n"
-                    "🔍 Semantic search across documents\n"
-                    "📅 Meeting notes extraction\n\n"
-                    "Type **/help** to see all available commands!"
-                )
-                await turn_context.send_activity(welcome_message)
+                await turn_context.send_activity(self._WELCOME_TEXT)
 
     async def on_conversation_update_activity(self, turn_context: TurnContext):
         """
         Handle conversation update events.
         """
-        logger.info(f"Conversation update: {turn_context.activity.type}")
+        logger.info("Conversation update: %s", turn_context.activity.type)
         await super().on_conversation_update_activity(turn_context)
 
 
@@ -2,14 +2,12 @@
 LangChain chain for meeting notes extraction.
 """
 import logging
-import json
-from typing import Dict, Any, List, Optional
-from langchain.chains import LLMChain
-from langchain_openai import ChatOpenAI
-from langchain.output_parsers import PydanticOutputParser, OutputFixingParser
+from typing import Dict, Any, List, Optional, Sequence
 from pydantic import BaseModel, Field
 
 from app.config import get_settings
+from app.core.chat_models import get_chat_model
+from app.utils.helpers import canonicalize_text
 from app.prompts.extraction_prompts import (
     meeting_notes_prompt,
     action_item_prompt,
@@ -45,6 +43,20 @@ class MeetingNotesExtraction(BaseModel):
     next_steps: List[str] = Field(default_factory=list, description="Next steps")
 
 
+# Fields produced by a full meeting notes extraction
+MEETING_NOTES_FIELDS = tuple(MeetingNotesExtraction.model_fields)
+
+
+class ActionItemList(BaseModel):
+    """Action items extracted from text."""
+    action_items: List[ActionItem] = Field(default_factory=list, description="Action items")
+
+
+class DecisionList(BaseModel):
+    """Decisions extracted from text."""
+    decisions: List[Decision] = Field(default_factory=list, description="Decisions made")
+
+
 class MeetingNotesChain:
     """
     Chain for extracting structured information from meeting notes.
@@ -54,63 +66,69 @@ class MeetingNotesChain:
         self,
         model: str = "gpt-4-turbo-preview",
         temperature: float = 0.1,
+        fast_model: str = "gpt-4o-mini",
     ):
         """
         Initialize the meeting notes extraction chain.
         
         Args:
-            model: OpenAI model to use
+            model: OpenAI model to use for full meeting notes extraction
             temperature: Sampling temperature (lower for more structured output)
+            fast_model: Smaller OpenAI model for the narrow action item and
+                decision extractors
         """
-        self.llm = ChatOpenAI(
-            model=model,
-            temperature=temperature,
-            api_key=settings.OPENAI_API_KEY,
+        self.llm = get_chat_model(model, temperature)
+        self.fast_llm = get_chat_model(fast_model, temperature)
+        
+        # Build chains once and reuse them across calls. Output is returned
+        # through function calling as validated Pydantic models, so there's
+        # no JSON to parse out of the completion text.
+        self._meeting_notes_chain = (
+            meeting_notes_prompt()
+            | self.llm.with_structured_output(MeetingNotesExtraction)
+        )
+        self._action_item_chain = (
+            action_item_prompt()
+            | self.fast_llm.with_structured_output(ActionItemList)
+        )
+        self._decision_chain = (
+            decision_extraction_prompt()
+            | self.fast_llm.with_structured_output(DecisionList)
         )
 
-    def extract_meeting_notes(self, text: str) -> Dict[str, Any]:
+    def extract_all(
+        self,
+        text: str,
+        fields: Sequence[str] = MEETING_NOTES_FIELDS,
+    ) -> Dict[str, Any]:
         """
-        Extract structured information from meeting notes.
+        Extract several kinds of information from meeting notes in a single
+        LLM call.
+        
+        Prefer this over calling the individual extract_* methods when more
+        than one field is needed.
         
         Args:
             text: Meeting transcript or notes
+            fields: Fields to return (subset of MEETING_NOTES_FIELDS)
             
         Returns:
-            Dictionary with extracted information
+            Dictionary with the requested fields
+            
+        Raises:
+            ValueError: If an unknown field is requested
         """
+        unknown = set(fields) - set(MEETING_NOTES_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown meeting notes fields: {sorted(unknown)}")
+        
         try:
-            # Create chain
-            chain = LLMChain(llm=self.llm, prompt=meeting_notes_prompt)
-            
             # Generate extraction
-            result = chain.invoke({"text": text})
-            output = result.get("text", "").strip()
-            
-            # Parse JSON output
-            try:
-                parsed = json.loads(output)
-            except json.JSONDecodeError as e:
-                logger.warning(f"Failed to parse JSON, attempting to fix: {e}")
-                # Try to extract JSON from markdown code blocks
-                if "```json" in output:
-                    output = output.split("```json")[1].split("```")[0].strip()
-                elif "```" in output:
-                    output = output.split("```")[1].split("```")[0].strip()
-                parsed = json.loads(output)
-            
-            # Structure the output
-            extraction = {
-                "decisions": parsed.get("decisions", []),
-                "action_items": parsed.get("action_items", []),
-                "key_points": parsed.get("key_points", []),
-                "participants": parsed.get("participants", []),
-                "next_steps": parsed.get("next_steps", []),
-            }
+            result = self._meeting_notes_chain.invoke({"text": canonicalize_text(text)})
+            extraction = result.model_dump(include=set(fields), exclude_none=True)
             
-            logger.info(
-                f"Extracted {len(extraction['decisions'])} decisions, "
-                f"{len(extraction['action_items'])} action items"
-            )
+            counts = ", ".join(f"{field}={len(extraction[field])}" for field in fields)
+            logger.info(f"Extracted meeting notes ({counts})")
             
             return extraction
             
@@ -118,10 +136,25 @@ class MeetingNotesChain:
             logger.error(f"Error extracting meeting notes: {e}")
             raise
 
+    def extract_meeting_notes(self, text: str) -> Dict[str, Any]:
+        """
+        Extract structured information from meeting notes.
+        
+        Args:
+            text: Meeting transcript or notes
+            
+        Returns:
+            Dictionary with extracted information
+        """
+        return self.extract_all(text)
+
     def extract_action_items(self, text: str) -> List[Dict[str, Any]]:
         """
         Extract only action items from text.
         
+        Use when only action items are needed; for several fields use
+        extract_all, which gets them all in one LLM call.
+        
         Args:
             text: Text to extract action items from
             
@@ -129,19 +162,8 @@ class MeetingNotesChain:
             List of action item dictionaries
         """
         try:
-            chain = LLMChain(llm=self.llm, prompt=action_item_prompt)
-            result = chain.invoke({"text": text})
-            output = result.get("text", "").strip()
-            
-            # Parse JSON
-            try:
-                action_items = json.loads(output)
-            except json.JSONDecodeError:
-                if "```json" in output:
-                    output = output.split("```json")[1].split("```")[0].strip()
-                elif "```" in output:
-                    output = output.split("```")[1].split("```")[0].strip()
-                action_items = json.loads(output)
+            result = self._action_item_chain.invoke({"text": canonicalize_text(text)})
+            action_items = result.model_dump(exclude_none=True)["action_items"]
             
             logger.info(f"Extracted {len(action_items)} action items")
             return action_items
@@ -154,6 +176,9 @@ class MeetingNotesChain:
         """
         Extract only decisions from text.
         
+        Use when only decisions are needed; for several fields use
+        extract_all, which gets them all in one LLM call.
+        
         Args:
             text: Text to extract decisions from
             
@@ -161,19 +186,8 @@ class MeetingNotesChain:
             List of decision dictionaries
         """
         try:
-            chain = LLMChain(llm=self.llm, prompt=decision_extraction_prompt)
-            result = chain.invoke({"text": text})
-            output = result.get("text", "").strip()
-            
-            # Parse JSON
-            try:
-                decisions = json.loads(output)
-            except json.JSONDecodeError:
-                if "```json" in output:
-                    output = output.split("```json")[1].split("```")[0].strip()
-                elif "```" in output:
-                    output = output.split("```")[1].split("```")[0].strip()
-                decisions = json.loads(output)
+            result = self._decision_chain.invoke({"text": canonicalize_text(text)})
+            decisions = result.model_dump(exclude_none=True)["decisions"]
             
             logger.info(f"Extracted {len(decisions)} decisions")
             return decisions
@@ -186,6 +200,7 @@ class MeetingNotesChain:
 def create_meeting_notes_chain(
     model: str = "gpt-4-turbo-preview",
     temperature: float = 0.1,
+    fast_model: str = "gpt-4o-mini",
 ) -> MeetingNotesChain:
     """
     Factory function to create a meeting notes extraction chain.
@@ -193,8 +208,9 @@ def create_meeting_notes_chain(
     Args:
         model: OpenAI model to use
         temperature: Sampling temperature
+        fast_model: Smaller OpenAI model for sub-extractors
         
     Returns:
         MeetingNotesChain instance
     """
-    return MeetingNotesChain(model=model, temperature=temperature)
+    return MeetingNotesChain(model=model, temperature=temperature, fast_model=fast_model)
@@ -3,13 +3,17 @@ LangChain chain for question-answering (QA) with retrieval.
 This will be enhanced with Pinecone integration in Phase 3.
 """
 import logging
-from typing import Dict, Any, List, Optional
+from collections import deque
+from typing import AsyncIterator, Deque, Dict, Any, List, Optional
 from langchain.chains import LLMChain
-from langchain_openai import ChatOpenAI
 from langchain.prompts import PromptTemplate, ChatPromptTemplate
 from langchain.schema import Document
+from langchain_core.output_parsers import StrOutputParser
 
 from app.config import get_settings
+from app.core.chat_models import get_chat_model
+from app.core.tokenizer import count_tokens
+from app.utils.helpers import canonicalize_text
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -59,16 +63,17 @@ qa_with_sources_prompt = PromptTemplate(
 
 
 # Conversational QA template (with memory)
+# History sits right before the question so the instruction prefix stays stable
 CONVERSATIONAL_QA_TEMPLATE = """You are a helpful AI assistant having a conversation with a human.
 
 Use the following pieces of context and conversation history to answer the current question.
 
-Conversation History:
-{chat_history}
-
 Context:
 {context}
 
+Conversation History:
+{chat_history}
+
 Current Question: {question}
 
 Answer:"""
@@ -90,6 +95,7 @@ class QAChain:
         model: str = "gpt-4-turbo-preview",
         temperature: float = 0.2,
         max_tokens: int = 500,
+        max_history_tokens: int = 1500,
     ):
         """
         Initialize the QA chain.
@@ -98,14 +104,23 @@ class QAChain:
             model: OpenAI model to use
             temperature: Sampling temperature
             max_tokens: Maximum tokens for answer
+            max_history_tokens: Token budget for conversation history
         """
-        self.llm = ChatOpenAI(
-            model=model,
-            temperature=temperature,
-            max_tokens=max_tokens,
-            api_key=settings.OPENAI_API_KEY,
-        )
-        self.chat_history: List[Dict[str, str]] = []
+        self.model = model
+        self.llm = get_chat_model(model, temperature, max_tokens)
+        
+        # Build chains once and reuse them across calls
+        self._qa_chain = LLMChain(llm=self.llm, prompt=qa_prompt)
+        self._qa_with_sources_chain = LLMChain(llm=self.llm, prompt=qa_with_sources_prompt)
+        self._conversational_chain = LLMChain(llm=self.llm, prompt=conversational_qa_prompt)
+        self._qa_stream_chain = qa_prompt | self.llm | StrOutputParser()
+        self._qa_with_sources_stream_chain = qa_with_sources_prompt | self.llm | StrOutputParser()
+        self.chat_history: Deque[Dict[str, str]] = deque()
+        self.max_history_tokens = max_history_tokens
+        self._history_lines: Deque[str] = deque()  # Formatted exchanges
+        self._history_tokens: Deque[int] = deque()  # Token count per exchange
+        self._history_token_total = 0
+        self._history_str = ""
 
     def answer_question(
         self,
@@ -125,16 +140,13 @@ class QAChain:
             Dictionary with answer and metadata
         """
         try:
-            # Choose appropriate prompt
-            prompt = qa_with_sources_prompt if include_sources else qa_prompt
-            
-            # Create chain
-            chain = LLMChain(llm=self.llm, prompt=prompt)
+            # Choose appropriate chain
+            chain = self._qa_with_sources_chain if include_sources else self._qa_chain
             
             # Generate answer
             result = chain.invoke({
-                "context": context,
-                "question": question,
+                "context": canonicalize_text(context),
+                "question": canonicalize_text(question),
             })
             
             answer = result.get("text", "").strip()
@@ -151,6 +163,39 @@ class QAChain:
             logger.error(f"Error answering question: {e}")
             raise
 
+    async def astream_answer(
+        self,
+        question: str,
+        context: str,
+        include_sources: bool = False,
+    ) -> AsyncIterator[str]:
+        """
+        Stream an answer token by token as it is generated.
+        
+        Args:
+            question: User's question
+            context: Relevant context to answer the question
+            include_sources: Whether to include source citations
+            
+        Yields:
+            Answer text chunks
+        """
+        try:
+            chain = (
+                self._qa_with_sources_stream_chain if include_sources
+                else self._qa_stream_chain
+            )
+            
+            async for chunk in chain.astream({
+                "context": canonicalize_text(context),
+                "question": canonicalize_text(question),
+            }):
+                yield chunk
+            
+        except Exception as e:
+            logger.error(f"Error streaming answer: {e}")
+            raise
+
     def answer_with_conversation_history(
         self,
         question: str,
@@ -169,30 +214,21 @@ class QAChain:
             Dictionary with answer and metadata
         """
         try:
-            # Format chat history
-            chat_history_str = "\n".join([
-                f"Q: {item['question']}\nA: {item['answer']}"
-                for item in self.chat_history[-5:]  # Last 5 exchanges
-            ])
-            
-            if not chat_history_str:
-                chat_history_str = "No previous conversation."
-            
-            # Create chain
-            chain = LLMChain(llm=self.llm, prompt=conversational_qa_prompt)
+            # History string is maintained incrementally by _append_history
+            chat_history_str = self._history_str or "No previous conversation."
             
             # Generate answer
-            result = chain.invoke({
+            result = self._conversational_chain.invoke({
                 "chat_history": chat_history_str,
-                "context": context,
-                "question": question,
+                "context": canonicalize_text(context),
+                "question": canonicalize_text(question),
             })
             
             answer = result.get("text", "").strip()
             
             # Update history if requested
             if update_history:
-                self.chat_history.append({
+                self._append_history({
                     "question": question,
                     "answer": answer,
                 })
@@ -212,6 +248,37 @@ class QAChain:
             logger.error(f"Error in conversational QA: {e}")
             raise
 
+    @staticmethod
+    def _format_exchange(item: Dict[str, str]) -> str:
+        """Format one Q&A exchange for the history prompt."""
+        return f"Q: {item['question']}\nA: {item['answer']}"
+
+    def _append_history(self, item: Dict[str, str]):
+        """
+        Append an exchange, dropping the oldest ones once the history
+        exceeds the token budget.
+        """
+        line = self._format_exchange(item)
+        tokens = count_tokens(line, self.model)
+        self.chat_history.append(item)
+        self._history_lines.append(line)
+        self._history_tokens.append(tokens)
+        self._history_token_total += tokens
+        
+        evicted = False
+        while self.chat_history and self._history_token_total > self.max_history_tokens:
+            self.chat_history.popleft()
+            self._history_lines.popleft()
+            self._history_token_total -= self._history_tokens.popleft()
+            evicted = True
+        
+        if evicted:
+            self._history_str = "\n".join(self._history_lines)
+        elif self._history_str:
+            self._history_str = f"{self._history_str}\n{line}"
+        else:
+            self._history_str = line
+
     def answer_from_documents(
         self,
         question: str,
@@ -230,6 +297,16 @@ class QAChain:
             Dictionary with answer and metadata
         """
         try:
+            # Drop duplicate chunks and order by source so the same set of
+            # documents always produces the same context
+            seen = set()
+            unique_docs = []
+            for doc in documents:
+                if doc.page_content not in seen:
+                    seen.add(doc.page_content)
+                    unique_docs.append(doc)
+            documents = sorted(unique_docs, key=lambda doc: doc.metadata.get("source", ""))
+            
             # Format documents as context
             context_parts = []
             for i, doc in enumerate(documents):
@@ -256,18 +333,23 @@ class QAChain:
 
     def clear_history(self):
         """Clear conversation history."""
-        self.chat_history = []
+        self.chat_history.clear()
+        self._history_lines.clear()
+        self._history_tokens.clear()
+        self._history_token_total = 0
+        self._history_str = ""
         logger.info("Cleared conversation history")
 
     def get_history(self) -> List[Dict[str, str]]:
         """Get conversation history."""
-        return self.chat_history.copy()
+        return list(self.chat_history)
 
 
 def create_qa_chain(
     model: str = "gpt-4-turbo-preview",
     temperature: float = 0.2,
     max_tokens: int = 500,
+    max_history_tokens: int = 1500,
 ) -> QAChain:
     """
     Factory function to create a QA chain.
@@ -276,6 +358,7 @@ def create_qa_chain(
         model: OpenAI model to use
         temperature: Sampling temperature
         max_tokens: Maximum tokens for answer
+        max_history_tokens: Token budget for conversation history
         
     Returns:
         QAChain instance
@@ -284,4 +367,5 @@ def create_qa_chain(
         model=model,
         temperature=temperature,
         max_tokens=max_tokens,
+        max_history_tokens=max_history_tokens,
     )
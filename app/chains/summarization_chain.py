@@ -1,15 +1,19 @@
 """
 LangChain chain for document summarization.
 """
+import asyncio
 import logging
-from typing import Dict, Any, Optional, List
-from langchain.chains import LLMChain, MapReduceDocumentsChain, ReduceDocumentsChain
+from functools import partial
+from typing import Dict, Any, Optional, List, Tuple
+from langchain.chains import LLMChain, ReduceDocumentsChain
 from langchain.chains.combine_documents.stuff import StuffDocumentsChain
-from langchain_openai import ChatOpenAI
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.schema import Document
 
 from app.config import get_settings
+from app.core.chat_models import get_chat_model
+from app.core.tokenizer import count_tokens
+from app.utils.helpers import canonicalize_text
 from app.prompts.summary_prompts import (
     get_summary_prompt,
     map_summary_prompt,
@@ -19,6 +23,9 @@ from app.prompts.summary_prompts import (
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Longest text summarized in a single pass; longer texts use map-reduce
+MAX_SINGLE_PASS_TOKENS = 4000
+
 
 class SummarizationChain:
     """
@@ -40,13 +47,21 @@ class SummarizationChain:
             temperature: Sampling temperature (lower = more focused)
             max_tokens: Maximum tokens for summary
         """
-        self.llm = ChatOpenAI(
-            model=model,
-            temperature=temperature,
-            max_tokens=max_tokens,
-            api_key=settings.OPENAI_API_KEY,
+        self.model = model
+        self.llm = get_chat_model(model, temperature, max_tokens)
+        self.max_doc_length = MAX_SINGLE_PASS_TOKENS
+        
+        # Token-based splitter for map-reduce, built once
+        self._text_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=3000,  # tokens
+            chunk_overlap=200,
+            length_function=partial(count_tokens, model=model),
         )
-        self.max_doc_length = 4000  # tokens
+        
+        # Chains are built once and reused; single-pass chains are created
+        # lazily per (length, document_type)
+        self._summary_chains: Dict[Tuple[str, str], LLMChain] = {}
+        self._map_chain, self._reduce_documents_chain = self._create_map_reduce_chains()
 
     def summarize(
         self,
@@ -66,39 +81,85 @@ class SummarizationChain:
             Dictionary with summary and metadata
         """
         try:
-            # Get appropriate prompt
-            prompt = get_summary_prompt(length, document_type)
-            
             # Check if document is too long for single pass
             if self._estimate_tokens(text) > self.max_doc_length:
                 logger.info("Document too long, using map-reduce summarization")
                 return self._map_reduce_summarize(text)
             
-            # Create chain
-            chain = LLMChain(llm=self.llm, prompt=prompt)
-            
             # Generate summary
-            result = chain.invoke({"text": text})
+            chain = self._get_summary_chain(length, document_type)
+            result = chain.invoke({"text": canonicalize_text(text)})
+            
+            return self._format_single_pass(result, length, document_type)
             
-            summary = result.get("text", "").strip()
+        except Exception as e:
+            logger.error(f"Error in summarization: {e}")
+            raise
+
+    async def asummarize(
+        self,
+        text: str,
+        length: str = "standard",
+        document_type: str = "general",
+        token_count: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Async version of summarize.
+        
+        Pass `token_count` when the caller has already counted the text's
+        tokens, so it isn't tokenized twice.
+        """
+        try:
+            if token_count is None:
+                token_count = self._estimate_tokens(text)
+            if token_count > self.max_doc_length:
+                logger.info("Document too long, using map-reduce summarization")
+                return await self._amap_reduce_summarize(text)
             
-            logger.info(f"Generated {length} summary, length: {len(summary)} chars")
+            chain = self._get_summary_chain(length, document_type)
+            result = await chain.ainvoke({"text": canonicalize_text(text)})
             
-            return {
-                "summary": summary,
-                "length": length,
-                "document_type": document_type,
-                "method": "single_pass",
-            }
+            return self._format_single_pass(result, length, document_type)
             
         except Exception as e:
-            logger.error(f"Error in summarization: {e}")
+            logger.error(f"Error in async summarization: {e}")
             raise
 
+    def _get_summary_chain(self, length: str, document_type: str) -> LLMChain:
+        """Get the cached single-pass chain for a summary length and type."""
+        key = (length, document_type)
+        chain = self._summary_chains.get(key)
+        if chain is None:
+            prompt = get_summary_prompt(length, document_type)
+            chain = LLMChain(llm=self.llm, prompt=prompt)
+            self._summary_chains[key] = chain
+        return chain
+
+    def _format_single_pass(
+        self,
+        result: Dict[str, Any],
+        length: str,
+        document_type: str,
+    ) -> Dict[str, Any]:
+        """Build the summary dictionary for a single-pass chain result."""
+        summary = result.get("text", "").strip()
+        
+        logger.info(f"Generated {length} summary, length: {len(summary)} chars")
+        
+        return {
+            "summary": summary,
+            "length": length,
+            "document_type": document_type,
+            "method": "single_pass",
+        }
+
     def _map_reduce_summarize(self, text: str) -> Dict[str, Any]:
         """
         Summarize a long document using map-reduce strategy.
         
+        Chunks are summarized in parallel (bounded by
+        settings.map_reduce_max_concurrency), then combined.
+        
         Args:
             text: Long document text
             
@@ -106,62 +167,98 @@ class SummarizationChain:
             Dictionary with summary and metadata
         """
         try:
-            # Split the document
-            text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=3000,
-                chunk_overlap=200,
-            )
-            chunks = text_splitter.split_text(text)
-            docs = [Document(page_content=chunk) for chunk in chunks]
-            
-            logger.info(f"Split document into {len(docs)} chunks for map-reduce")
-            
-            # Map chain - summarize each chunk
-            map_chain = LLMChain(llm=self.llm, prompt=map_summary_prompt)
+            docs = self._split_for_map_reduce(text)
             
-            # Reduce chain - combine summaries
-            reduce_chain = LLMChain(llm=self.llm, prompt=reduce_summary_prompt)
-            
-            # Create the combine documents chain
-            combine_documents_chain = StuffDocumentsChain(
-                llm_chain=reduce_chain,
-                document_variable_name="text",
+            # Map - summarize chunks in parallel
+            mapped = self._map_chain.batch(
+                [{"text": doc.page_content} for doc in docs],
+                config={"max_concurrency": settings.map_reduce_max_concurrency},
             )
             
-            # Reduce documents chain
-            reduce_documents_chain = ReduceDocumentsChain(
-                combine_documents_chain=combine_documents_chain,
-                collapse_documents_chain=combine_documents_chain,
-                token_max=4000,
+            # Reduce - combine chunk summaries
+            result = self._reduce_documents_chain.invoke(
+                {"input_documents": self._to_documents(mapped)}
             )
             
-            # Full map-reduce chain
-            map_reduce_chain = MapReduceDocumentsChain(
-                llm_chain=map_chain,
-                reduce_documents_chain=reduce_documents_chain,
-                document_variable_name="text",
-                return_intermediate_steps=False,
-            )
+            return self._format_map_reduce(result, len(docs))
             
-            # Execute
-            result = map_reduce_chain.invoke({"input_documents": docs})
+        except Exception as e:
+            logger.error(f"Error in map-reduce summarization: {e}")
+            raise
+
+    async def _amap_reduce_summarize(self, text: str) -> Dict[str, Any]:
+        """
+        Async version of _map_reduce_summarize.
+        """
+        try:
+            docs = self._split_for_map_reduce(text)
             
-            summary = result.get("output_text", "").strip()
+            mapped = await self._map_chain.abatch(
+                [{"text": doc.page_content} for doc in docs],
+                config={"max_concurrency": settings.map_reduce_max_concurrency},
+            )
             
-            logger.info(f"Generated map-reduce summary, length: {len(summary)} chars")
+            result = await self._reduce_documents_chain.ainvoke(
+                {"input_documents": self._to_documents(mapped)}
+            )
             
-            return {
-                "summary": summary,
-                "length": "standard",
-                "document_type": "general",
-                "method": "map_reduce",
-                "num_chunks": len(docs),
-            }
+            return self._format_map_reduce(result, len(docs))
             
         except Exception as e:
-            logger.error(f"Error in map-reduce summarization: {e}")
+            logger.error(f"Error in async map-reduce summarization: {e}")
             raise
 
+    def _split_for_map_reduce(self, text: str) -> List[Document]:
+        """Split a long document into chunks for map-reduce."""
+        chunks = self._text_splitter.split_text(text)
+        docs = [Document(page_content=chunk) for chunk in chunks]
+        
+        logger.info(f"Split document into {len(docs)} chunks for map-reduce")
+        
+        return docs
+
+    @staticmethod
+    def _to_documents(mapped: List[Dict[str, Any]]) -> List[Document]:
+        """Wrap map-step outputs as documents for the reduce step."""
+        return [Document(page_content=result["text"]) for result in mapped]
+
+    def _create_map_reduce_chains(self) -> Tuple[LLMChain, ReduceDocumentsChain]:
+        """Create the map chain and the reduce documents chain."""
+        # Map chain - summarize each chunk
+        map_chain = LLMChain(llm=self.llm, prompt=map_summary_prompt())
+        
+        # Reduce chain - combine summaries
+        reduce_chain = LLMChain(llm=self.llm, prompt=reduce_summary_prompt())
+        
+        # Create the combine documents chain
+        combine_documents_chain = StuffDocumentsChain(
+            llm_chain=reduce_chain,
+            document_variable_name="text",
+        )
+        
+        # Reduce documents chain
+        reduce_documents_chain = ReduceDocumentsChain(
+            combine_documents_chain=combine_documents_chain,
+            collapse_documents_chain=combine_documents_chain,
+            token_max=4000,
+        )
+        
+        return map_chain, reduce_documents_chain
+
+    def _format_map_reduce(self, result: Dict[str, Any], num_chunks: int) -> Dict[str, Any]:
+        """Build the summary dictionary for a map-reduce chain result."""
+        summary = result.get("output_text", "").strip()
+        
+        logger.info(f"Generated map-reduce summary, length: {len(summary)} chars")
+        
+        return {
+            "summary": summary,
+            "length": "standard",
+            "document_type": "general",
+            "method": "map_reduce",
+            "num_chunks": num_chunks,
+        }
+
     def batch_summarize(
         self,
         texts: List[str],
@@ -196,12 +293,51 @@ class SummarizationChain:
         
         return summaries
 
+    async def abatch_summarize(
+        self,
+        texts: List[str],
+        length: str = "standard",
+        document_type: str = "general",
+        max_concurrency: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Summarize multiple documents concurrently.
+        
+        Args:
+            texts: List of document texts
+            length: Summary length
+            document_type: Type of documents
+            max_concurrency: Maximum in-flight summaries
+                (defaults to settings.max_concurrent_requests)
+            
+        Returns:
+            List of summary dictionaries, in input order
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or settings.max_concurrent_requests)
+        
+        async def _summarize_one(i: int, text: str) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    logger.info(f"Summarizing document {i+1}/{len(texts)}")
+                    return await self.asummarize(text, length, document_type)
+                except Exception as e:
+                    logger.error(f"Error summarizing document {i+1}: {e}")
+                    return {
+                        "summary": "",
+                        "error": str(e),
+                        "length": length,
+                        "document_type": document_type,
+                    }
+        
+        return await asyncio.gather(
+            *(_summarize_one(i, text) for i, text in enumerate(texts))
+        )
+
     def _estimate_tokens(self, text: str) -> int:
         """
-        Rough estimation of token count.
-        ~4 characters per token is a reasonable approximation.
+        Count tokens with the model's tokenizer.
         """
-        return len(text) // 4
+        return count_tokens(text, self.model)
 
 
 def create_summarization_chain(
@@ -3,15 +3,22 @@ Configuration management for AI Workplace Automation System
 Uses Pydantic Settings for type-safe configuration with environment variables
 """
 
-from pydantic_settings import BaseSettings
-from pydantic import Field, validator
-from typing import List, Optional
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic import Field, field_validator
+from functools import cached_property, lru_cache
+from typing import FrozenSet, List, Optional
 import os
 
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables"""
     
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+    )
+    
     # Application Configuration
     env: str = Field(default="development", description="Environment: development, staging, production")
     api_host: str = Field(default="0.0.0.0", description="API host")
@@ -33,12 +40,21 @@ class Settings(BaseSettings):
     pinecone_dimension: int = Field(default=1536, description="Vector dimension")
     pinecone_cloud: str = Field(default="aws", description="Pinecone cloud provider")
     pinecone_region: str = Field(default="us-east-1", description="Pinecone region")
+    pinecone_pool_threads: int = Field(default=30, description="Pinecone index connection pool size for parallel upserts")
+    pinecone_upsert_batch_size: int = Field(default=64, description="Vectors per Pinecone upsert request")
+    pinecone_query_cache_threshold: float = Field(default=0.97, description="Minimum cosine similarity to reuse cached Pinecone results")
+    pinecone_query_cache_size: int = Field(default=1024, description="Maximum cached Pinecone queries per namespace/filter bucket")
+    pinecone_query_cache_ttl: int = Field(default=300, description="Pinecone query cache entry TTL in seconds")
+    pinecone_query_cache_quantize: bool = Field(default=True, description="Store cached Pinecone query vectors as int8 (4x smaller)")
     
     # Microsoft Teams Bot Configuration
     microsoft_app_id: Optional[str] = Field(default=None, description="Azure Bot App ID")
     microsoft_app_password: Optional[str] = Field(default=None, description="Azure Bot App Password")
     microsoft_app_tenant_id: Optional[str] = Field(default=None, description="Azure Tenant ID")
     bot_endpoint: str = Field(default="/api/messages", description="Bot messaging endpoint")
+    bot_max_sessions: int = Field(default=10000, description="Maximum number of cached bot user sessions")
+    bot_session_ttl: int = Field(default=3600, description="Bot user session TTL in seconds")
+    bot_max_history: int = Field(default=50, description="Maximum conversation turns kept per bot session")
     
     # Security
     secret_key: str = Field(..., description="Secret key for JWT tokens")
@@ -54,15 +70,48 @@ class Settings(BaseSettings):
     chunk_overlap: int = Field(default=200, description="Chunk overlap in tokens")
     max_chunks_per_document: int = Field(default=100, description="Maximum chunks per document")
     
+    # LLM Response Cache
+    llm_cache_backend: str = Field(default="memory", description="LLM response cache backend: memory, sqlite, none")
+    llm_cache_max_size: int = Field(default=1000, description="Maximum entries in the in-memory LLM cache")
+    llm_cache_path: str = Field(default=".langchain.db", description="SQLite LLM cache path")
+    
+    # Document Metadata Store
+    document_store_backend: str = Field(default="memory", description="Document metadata store backend: memory or sqlite")
+    document_store_path: str = Field(default=".documents.db", description="SQLite document metadata store path")
+    
+    # Embedding Cache
+    embedding_cache_dir: str = Field(default=".embedding_cache", description="On-disk embedding cache directory")
+    embedding_cache_size_limit: int = Field(default=1_073_741_824, description="Embedding cache size limit in bytes")
+    embedding_max_concurrency: int = Field(default=8, description="Max concurrent embedding API requests")
+    
+    # Semantic Cache
+    semantic_cache_threshold: float = Field(default=0.90, description="Minimum cosine similarity for a semantic cache hit")
+    semantic_cache_max_size: int = Field(default=5000, description="Maximum semantic cache entries")
+    semantic_cache_ttl: int = Field(default=3600, description="Semantic cache entry TTL in seconds")
+    answer_cache_threshold: float = Field(default=0.95, description="Minimum cosine similarity to reuse a cached RAG answer")
+    
+    # Summary Cache
+    summary_cache_max_size: int = Field(default=1000, description="Maximum cached text summaries")
+    summary_cache_ttl: int = Field(default=3600, description="Summary cache entry TTL in seconds")
+    
+    # Batch Jobs
+    job_store_backend: str = Field(default="memory", description="Batch job store backend: memory (per process) or redis (shared)")
+    job_ttl: int = Field(default=86400, description="Seconds a batch job's status is kept after creation")
+    
     # Rate Limiting
     rate_limit_per_minute: int = Field(default=60, description="Rate limit per minute")
     rate_limit_burst: int = Field(default=100, description="Rate limit burst size")
+    rate_limit_max_clients: int = Field(default=100_000, description="Maximum clients tracked by the rate limiter")
+    rate_limit_backend: str = Field(default="memory", description="Rate limit backend: memory (per process) or redis (shared)")
     
     # Performance
     worker_count: int = Field(default=4, description="Number of workers")
     max_concurrent_requests: int = Field(default=100, description="Max concurrent requests")
+    map_reduce_max_concurrency: int = Field(default=10, description="Max parallel LLM calls in the map-reduce map phase")
+    batch_summarize_max_concurrency: int = Field(default=5, description="Max documents summarized at once in a batch job")
+    search_batch_window_ms: float = Field(default=5.0, description="Window for coalescing concurrent search query embeddings")
     
-    # Redis (Optional - for session management)
+    # Redis (Optional - for session management, shared rate limiting and batch jobs)
     redis_host: str = Field(default="localhost", description="Redis host")
     redis_port: int = Field(default=6379, description="Redis port")
     redis_db: int = Field(default=0, description="Redis database number")
@@ -75,30 +124,29 @@ class Settings(BaseSettings):
     )
     cors_allow_credentials: bool = Field(default=True, description="Allow credentials in CORS")
     
-    @validator("allowed_extensions", pre=True)
+    @field_validator("allowed_extensions", mode="before")
+    @classmethod
     def parse_extensions(cls, v):
         """Parse allowed extensions from string or list"""
         if isinstance(v, str):
             return [ext.strip() for ext in v.split(",")]
         return v
     
-    @validator("cors_origins", pre=True)
+    @cached_property
+    def allowed_extension_set(self) -> FrozenSet[str]:
+        """Lowercased allowed extensions (without leading dot) for O(1) lookups"""
+        return frozenset(ext.lower().lstrip(".") for ext in self.allowed_extensions)
+    
+    @field_validator("cors_origins", mode="before")
+    @classmethod
     def parse_cors_origins(cls, v):
         """Parse CORS origins from string or list"""
         if isinstance(v, str):
             return [origin.strip() for origin in v.split(",")]
         return v
-    
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        case_sensitive = False
-
-
-# Global settings instance
-settings = Settings()
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Get application settings instance"""
-    return settings
+    """Get application settings instance (created once, on first use)"""
+    return Settings()
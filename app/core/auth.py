@@ -1,9 +1,13 @@
 """
 JWT authentication utilities.
 """
+import hashlib
+import hmac
 import logging
+import threading
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
+from cachetools import TTLCache
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
@@ -12,13 +16,51 @@ from app.config import get_settings
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Signing parameters, resolved once
+_SECRET_KEY = settings.secret_key
+_ALGORITHM = settings.algorithm
+_ALGORITHMS = [_ALGORITHM]
+_SECRET_KEY_BYTES = _SECRET_KEY.encode()
+
+# Password hashing: argon2id for new hashes, bcrypt still verifies existing ones
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__time_cost=2,
+    argon2__memory_cost=19456,  # KiB (19 MiB)
+    argon2__parallelism=1,
+)
+
+# Short-lived cache of successful verifications, so repeated logins/refreshes
+# of the same user skip bcrypt. Failed attempts are never cached and stay slow.
+_VERIFY_CACHE_TTL = 60  # seconds
+_verify_cache: TTLCache = TTLCache(maxsize=10000, ttl=_VERIFY_CACHE_TTL)
+_verify_cache_lock = threading.Lock()
+
+
+def _verify_cache_key(plain_password: str, hashed_password: str) -> str:
+    """Keyed digest of the credentials so the cache never holds plaintext."""
+    return hmac.new(
+        _SECRET_KEY_BYTES,
+        f"{hashed_password}\0{plain_password}".encode(),
+        hashlib.sha256,
+    ).hexdigest()
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify password against hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    key = _verify_cache_key(plain_password, hashed_password)
+    with _verify_cache_lock:
+        if key in _verify_cache:
+            return True
+    
+    if not pwd_context.verify(plain_password, hashed_password):
+        return False
+    
+    with _verify_cache_lock:
+        _verify_cache[key] = True
+    return True
 
 
 def get_password_hash(password: str) -> str:
@@ -48,8 +90,8 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
     
     encoded_jwt = jwt.encode(
         to_encode,
-        settings.secret_key,
-        algorithm=settings.algorithm
+        _SECRET_KEY,
+        algorithm=_ALGORITHM
     )
     
     return encoded_jwt
@@ -65,11 +107,16 @@ def verify_token(token: str) -> Optional[Dict[str, Any]]:
     Returns:
         Decoded token payload or None if invalid
     """
+    # A compact JWS is exactly three dot-separated segments
+    if token.count(".") != 2:
+        logger.error("JWT verification failed: malformed token")
+        return None
+    
     try:
         payload = jwt.decode(
             token,
-            settings.secret_key,
-            algorithms=[settings.algorithm]
+            _SECRET_KEY,
+            algorithms=_ALGORITHMS
         )
         return payload
     except JWTError as e:
@@ -93,6 +140,6 @@ def create_refresh_token(data: Dict[str, Any]) -> str:
     
     return jwt.encode(
         to_encode,
-        settings.secret_key,
-        algorithm=settings.algorithm
+        _SECRET_KEY,
+        algorithm=_ALGORITHM
     )
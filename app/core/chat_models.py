@@ -0,0 +1,52 @@
+"""
+Shared ChatOpenAI instances for the LangChain chains.
+"""
+import logging
+from functools import lru_cache
+from typing import Optional
+
+from langchain_openai import ChatOpenAI
+
+from app.config import get_settings
+from app.core.llm_cache import configure_llm_cache, is_cacheable
+from app.core.openai_client import get_http_clients
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+@lru_cache(maxsize=8)
+def get_chat_model(
+    model: str,
+    temperature: float,
+    max_tokens: Optional[int] = None,
+) -> ChatOpenAI:
+    """
+    Get a shared ChatOpenAI instance for a model configuration.
+    
+    Chains with the same settings reuse one instance, and all instances share
+    the process-wide OpenAI HTTP clients, so connections are reused across
+    chains.
+    
+    Args:
+        model: OpenAI model to use
+        temperature: Sampling temperature
+        max_tokens: Maximum tokens to generate
+        
+    Returns:
+        ChatOpenAI instance
+    """
+    configure_llm_cache()
+    http_client, http_async_client = get_http_clients()
+    
+    logger.info(f"Creating chat model: {model} (temperature={temperature})")
+    
+    return ChatOpenAI(
+        model=model,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        api_key=settings.OPENAI_API_KEY,
+        cache=None if is_cacheable(temperature) else False,
+        http_client=http_client,
+        http_async_client=http_async_client,
+    )
@@ -1,24 +1,137 @@
 """
 Document loaders for various file formats.
 """
+import asyncio
+import io
 import logging
-from typing import List, Dict, Any, Optional
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from multiprocessing import shared_memory
+from typing import Callable, Iterator, List, Dict, Any, Optional
 from pathlib import Path
-import PyPDF2
+import pymupdf
 import docx
+from docx.oxml.ns import qn
 from langchain.schema import Document
 from langchain_community.document_loaders import UnstructuredFileLoader
 
 logger = logging.getLogger(__name__)
 
+# PDFs with fewer pages than this are extracted in-process; below it the
+# process pool startup costs more than it saves
+PARALLEL_PDF_MIN_PAGES = 32
+
+
+@lru_cache(maxsize=1)
+def _get_load_executor() -> ThreadPoolExecutor:
+    """Thread pool shared by all loaders for loading many documents at once."""
+    return ThreadPoolExecutor(
+        max_workers=min(32, (os.cpu_count() or 1) * 4),
+        thread_name_prefix="document-loader",
+    )
+
+
+@lru_cache(maxsize=1)
+def _get_pdf_executor() -> ProcessPoolExecutor:
+    """
+    Process pool shared by all loaders for large PDF extraction.
+    
+    Workers start with forkserver (spawn where unavailable) rather than
+    fork, which is unsafe in this multi-threaded server.
+    """
+    start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return ProcessPoolExecutor(
+        max_workers=min(os.cpu_count() or 1, 8),
+        mp_context=multiprocessing.get_context(start_method),
+    )
+
+
+def _open_pdf(file_path: str, data: Optional[bytes] = None) -> "pymupdf.Document":
+    """Open a PDF from in-memory bytes if given, otherwise from disk."""
+    if data is not None:
+        return pymupdf.open(stream=data, filetype="pdf")
+    return pymupdf.open(file_path)
+
+
+def _extract_pdf_pages(
+    file_path: str,
+    start: int,
+    stop: int,
+    shm_name: Optional[str] = None,
+    size: int = 0,
+) -> List[str]:
+    """
+    Extract text from a range of PDF pages (runs in a worker process).
+    
+    Args:
+        file_path: Path to the PDF
+        start: First page index (inclusive)
+        stop: Last page index (exclusive)
+        shm_name: Shared memory block holding the PDF, when loading from memory
+        size: PDF size in bytes within the shared memory block
+        
+    Returns:
+        Text of each page in the range
+    """
+    if shm_name is None:
+        with _open_pdf(file_path) as pdf:
+            return [pdf[page_num].get_text("text") for page_num in range(start, stop)]
+    
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        view = shm.buf[:size]
+        try:
+            with pymupdf.open(stream=view, filetype="pdf") as pdf:
+                return [pdf[page_num].get_text("text") for page_num in range(start, stop)]
+        finally:
+            view.release()
+    finally:
+        shm.close()
+
+
+# WordprocessingML tags used for DOCX text extraction
+_W_P = qn('w:p')
+_W_TBL = qn('w:tbl')
+_W_TR = qn('w:tr')
+_W_TC = qn('w:tc')
+_W_RUN_TEXT = {qn('w:t'): None, qn('w:tab'): '\t', qn('w:br'): '\n', qn('w:cr'): '\n'}
+
+
+def _docx_paragraph_text(paragraph) -> str:
+    """Text of a w:p element, with tabs and line breaks like python-docx."""
+    parts = []
+    for element in paragraph.iter(*_W_RUN_TEXT):
+        replacement = _W_RUN_TEXT[element.tag]
+        parts.append((element.text or '') if replacement is None else replacement)
+    return ''.join(parts)
+
 
 class DocumentLoader:
     """
     Universal document loader supporting multiple file formats.
     """
 
-    def __init__(self):
-        self.supported_formats = ['.pdf', '.docx', '.txt', '.md']
+    def __init__(self, num_workers: Optional[int] = None):
+        """
+        Initialize the document loader.
+        
+        Args:
+            num_workers: Worker processes for large PDF extraction
+                (defaults to min(cpu_count, 8))
+        """
+        self.num_workers = num_workers or min(os.cpu_count() or 1, 8)
+        
+        # Extension -> loader dispatch table. Loaders take the file path and,
+        # for in-memory content, the file bytes (the path is then only a name).
+        self._loaders: Dict[str, Callable[[str, Optional[bytes]], List[Document]]] = {
+            '.pdf': self._load_pdf,
+            '.docx': self._load_docx,
+            '.txt': self._load_text,
+            '.md': self._load_text,
+        }
+        self.supported_formats = list(self._loaders)
 
     def load(self, file_path: str) -> List[Document]:
         """
@@ -36,32 +149,54 @@ class DocumentLoader:
             raise FileNotFoundError(f"File not found: {file_path}")
         
         extension = path.suffix.lower()
+        loader = self._loaders.get(extension)
         
-        if extension not in self.supported_formats:
+        if loader is None:
             raise ValueError(f"Unsupported file format: {extension}")
         
         try:
-            if extension == '.pdf':
-                return self._load_pdf(file_path)
-            elif extension == '.docx':
-                return self._load_docx(file_path)
-            elif extension in ['.txt', '.md']:
-                return self._load_text(file_path)
-            else:
-                # Fallback to unstructured loader
-                return self._load_unstructured(file_path)
+            return loader(file_path)
         except Exception as e:
             logger.error(f"Error loading document {file_path}: {e}")
             raise
 
-    def _load_pdf(self, file_path: str) -> List[Document]:
+    def load_many(self, file_paths: List[str]) -> List[List[Document]]:
+        """
+        Load several documents concurrently on the shared thread pool.
+        
+        Args:
+            file_paths: Paths to the documents
+            
+        Returns:
+            Documents for each path, in input order
+        """
+        return list(_get_load_executor().map(self.load, file_paths))
+
+    async def aload_many(self, file_paths: List[str]) -> List[List[Document]]:
+        """
+        Load several documents concurrently without blocking the event loop.
+        
+        Args:
+            file_paths: Paths to the documents
+            
+        Returns:
+            Documents for each path, in input order
+        """
+        loop = asyncio.get_running_loop()
+        executor = _get_load_executor()
+        return await asyncio.gather(
+            *(loop.run_in_executor(executor, self.load, file_path) for file_path in file_paths)
+        )
+
+    def _load_pdf(self, file_path: str, data: Optional[bytes] = None) -> List[Document]:
         """Load PDF document."""
+        return list(self._iter_pdf_pages(file_path, data))
+
+    def _iter_pdf_pages(self, file_path: str, data: Optional[bytes] = None) -> Iterator[Document]:
+        """Yield one Document per non-empty PDF page."""
         try:
-            documents = []
-            
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                num_pages = len(pdf_reader.pages)
+            with _open_pdf(file_path, data) as pdf:
+                num_pages = pdf.page_count
                 
                 # Extract metadata
                 metadata = {
@@ -70,39 +205,79 @@ class DocumentLoader:
                     'num_pages': num_pages,
                 }
                 
-                # Add PDF metadata if available
-                if pdf_reader.metadata:
-                    metadata['title'] = pdf_reader.metadata.get('/Title', '')
-                    metadata['author'] = pdf_reader.metadata.get('/Author', '')
-                    metadata['creation_date'] = pdf_reader.metadata.get('/CreationDate', '')
+                # Add PDF metadata if available (the property rebuilds the
+                # dict from the trailer on every access, so read it once)
+                pdf_metadata = pdf.metadata
+                if pdf_metadata:
+                    metadata['title'] = pdf_metadata.get('title', '')
+                    metadata['author'] = pdf_metadata.get('author', '')
+                    metadata['creation_date'] = pdf_metadata.get('creationDate', '')
                 
                 # Extract text from each page
-                full_text = []
-                for page_num, page in enumerate(pdf_reader.pages):
-                    text = page.extract_text()
+                if self.num_workers > 1 and num_pages >= PARALLEL_PDF_MIN_PAGES:
+                    page_texts = self._extract_pdf_parallel(file_path, num_pages, data)
+                else:
+                    page_texts = (page.get_text("text") for page in pdf)
+                
+                for page_num, text in enumerate(page_texts):
                     if text.strip():
-                        full_text.append(text)
-                        
-                        # Create document for each page
-                        page_metadata = metadata.copy()
-                        page_metadata['page'] = page_num + 1
-                        
-                        documents.append(Document(
+                        # Create document for each page (built in one step;
+                        # each page needs its own dict since downstream code
+                        # adds keys to it)
+                        yield Document(
                             page_content=text,
-                            metadata=page_metadata
-                        ))
+                            metadata={**metadata, 'page': page_num + 1}
+                        )
                 
                 logger.info(f"Loaded PDF with {num_pages} pages from {file_path}")
-                return documents
                 
         except Exception as e:
             logger.error(f"Error loading PDF {file_path}: {e}")
             raise
 
-    def _load_docx(self, file_path: str) -> List[Document]:
+    def _extract_pdf_parallel(
+        self,
+        file_path: str,
+        num_pages: int,
+        data: Optional[bytes] = None,
+    ) -> List[str]:
+        """
+        Extract PDF page text across worker processes.
+        
+        Pages are split into one contiguous range per worker so each worker
+        opens the file once. In-memory PDFs are placed in shared memory once
+        rather than pickled to every worker.
+        """
+        step = -(-num_pages // self.num_workers)  # Ceiling division
+        
+        shm = None
+        if data is not None:
+            shm = shared_memory.SharedMemory(create=True, size=len(data))
+            shm.buf[:len(data)] = data
+        
+        try:
+            executor = _get_pdf_executor()
+            futures = [
+                executor.submit(
+                    _extract_pdf_pages,
+                    file_path,
+                    start,
+                    min(start + step, num_pages),
+                    shm.name if shm is not None else None,
+                    len(data) if data is not None else 0,
+                )
+                for start in range(0, num_pages, step)
+            ]
+            return [text for future in futures for text in future.result()]
+        finally:
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+
+    def _load_docx(self, file_path: str, data: Optional[bytes] = None) -> List[Document]:
         """Load DOCX document."""
         try:
-            doc = docx.Document(file_path)
+            doc = docx.Document(io.BytesIO(data) if data is not None else file_path)
             
             # Extract metadata
             core_properties = doc.core_properties
@@ -115,20 +290,30 @@ class DocumentLoader:
                 'modified': str(core_properties.modified) if core_properties.modified else '',
             }
             
-            # Extract text from paragraphs
+            # Walk the underlying XML directly rather than python-docx's
+            # Paragraph/Table/Cell wrapper objects
+            body = doc.element.body
+            
+            # Extract text from top-level paragraphs
             paragraphs = []
-            for para in doc.paragraphs:
-                if para.text.strip():
-                    paragraphs.append(para.text)
+            for para in body.iterchildren(_W_P):
+                text = _docx_paragraph_text(para)
+                if text.strip():
+                    paragraphs.append(text)
             
             # Combine into single document
             full_text = '\n\n'.join(paragraphs)
             
-            # Also extract text from tables
+            # Also extract text from top-level tables
             tables_text = []
-            for table in doc.tables:
-                for row in table.rows:
-                    row_text = ' | '.join(cell.text.strip() for cell in row.cells)
+            for table in body.iterchildren(_W_TBL):
+                for row in table.iterchildren(_W_TR):
+                    row_text = ' | '.join(
+                        '\n'.join(
+                            _docx_paragraph_text(para) for para in cell.iterchildren(_W_P)
+                        ).strip()
+                        for cell in row.iterchildren(_W_TC)
+                    )
                     if row_text.strip():
                         tables_text.append(row_text)
             
@@ -143,11 +328,17 @@ class DocumentLoader:
             logger.error(f"Error loading DOCX {file_path}: {e}")
             raise
 
-    def _load_text(self, file_path: str) -> List[Document]:
+    def _load_text(self, file_path: str, data: Optional[bytes] = None) -> List[Document]:
         """Load plain text or markdown file."""
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                text = file.read()
+            if data is None:
+                with open(file_path, 'rb') as file:
+                    data = file.read()
+            
+            # One C-level decode over the whole buffer, then the same newline
+            # translation text-mode open() applied
+            text = data.decode('utf-8', errors='replace')
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
             
             path = Path(file_path)
             metadata = {
@@ -188,6 +379,8 @@ class DocumentLoader:
         """
         Load document from bytes (useful for uploaded files).
         
+        The content is parsed in memory; nothing is written to disk.
+        
         Args:
             file_bytes: File content as bytes
             filename: Original filename
@@ -196,31 +389,24 @@ class DocumentLoader:
         Returns:
             List of Document objects
         """
-        import tempfile
+        extension = f".{file_type.lower().lstrip('.')}"
+        loader = self._loaders.get(extension)
         
-        # Create temporary file
-        with tempfile.NamedTemporaryFile(
-            delete=False,
-            suffix=f'.{file_type}'
-        ) as tmp_file:
-            tmp_file.write(file_bytes)
-            tmp_path = tmp_file.name
+        if loader is None:
+            raise ValueError(f"Unsupported file format: {extension}")
         
         try:
-            # Load from temporary file
-            documents = self.load(tmp_path)
-            
-            # Update metadata with original filename
-            for doc in documents:
-                doc.metadata['original_filename'] = filename
-            
-            return documents
-            
-        finally:
-            # Clean up temporary file
-            Path(tmp_path).unlink(missing_ok=True)
+            documents = loader(filename, file_bytes)
+        except Exception as e:
+            logger.error(f"Error loading document {filename}: {e}")
+            raise
+        
+        for doc in documents:
+            doc.metadata['original_filename'] = filename
+        
+        return documents
 
 
-def create_document_loader() -> DocumentLoader:
+def create_document_loader(num_workers: Optional[int] = None) -> DocumentLoader:
     """Factory function to create document loader."""
-    return DocumentLoader()
+    return DocumentLoader(num_workers=num_workers)
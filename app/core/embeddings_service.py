@@ -1,10 +1,14 @@
 """
 Embeddings service for generating and caching vector embeddings.
 """
+import asyncio
 import logging
-import hashlib
-import json
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+
+import diskcache
+import numpy as np
+import xxhash
+import zstandard
 from langchain_openai import OpenAIEmbeddings
 from langchain.schema import Document
 
@@ -13,6 +17,9 @@ from app.config import get_settings
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# zstd level for cached vectors: fast to decode, worthwhile on disk
+EMBEDDING_CACHE_ZSTD_LEVEL = 3
+
 
 class EmbeddingsService:
     """
@@ -37,15 +44,40 @@ class EmbeddingsService:
             model=model,
             openai_api_key=settings.OPENAI_API_KEY,
         )
+        self.model = model
+        # "zstd" marks compressed entries so older raw float32 entries miss
+        self._cache_key_prefix = f"{model}:zstd:".encode()
         self.batch_size = batch_size
         self.use_cache = use_cache
-        self.cache: Dict[str, List[float]] = {}
+        
+        # Persistent on-disk cache, shared across processes and restarts
+        self.cache: Optional[diskcache.Cache] = None
+        if use_cache:
+            self.cache = diskcache.Cache(
+                settings.embedding_cache_dir,
+                size_limit=settings.embedding_cache_size_limit,
+            )
 
-    def _get_cache_key(self, text: str) -> str:
-        """Generate cache key from text."""
-        return hashlib.md5(text.encode()).hexdigest()
+    def _get_cache_key(self, text: str) -> bytes:
+        """Generate cache key from model and text (128-bit xxh3 digest)."""
+        digest = xxhash.xxh3_128_digest(text.encode("utf-8", "surrogatepass"))
+        return self._cache_key_prefix + digest
 
-    def embed_text(self, text: str) -> List[float]:
+    def _cache_get(self, cache_key: bytes) -> Optional[np.ndarray]:
+        """Look up a cached embedding."""
+        data = self.cache.get(cache_key)
+        if data is None:
+            return None
+        return np.frombuffer(zstandard.decompress(data), dtype=np.float32)
+
+    def _cache_set(self, cache_key: bytes, embedding: np.ndarray):
+        """Store an embedding as zstd-compressed float32 bytes."""
+        self.cache.set(
+            cache_key,
+            zstandard.compress(embedding.tobytes(), EMBEDDING_CACHE_ZSTD_LEVEL),
+        )
+
+    def embed_text(self, text: str) -> np.ndarray:
         """
         Generate embedding for a single text.
         
@@ -53,22 +85,23 @@ class EmbeddingsService:
             text: Text to embed
             
         Returns:
-            Embedding vector
+            Embedding vector (float32 array)
         """
         try:
             # Check cache
             if self.use_cache:
                 cache_key = self._get_cache_key(text)
-                if cache_key in self.cache:
+                cached = self._cache_get(cache_key)
+                if cached is not None:
                     logger.debug("Cache hit for embedding")
-                    return self.cache[cache_key]
+                    return cached
             
             # Generate embedding
-            embedding = self.embeddings.embed_query(text)
+            embedding = np.asarray(self.embeddings.embed_query(text), dtype=np.float32)
             
             # Cache result
             if self.use_cache:
-                self.cache[cache_key] = embedding
+                self._cache_set(cache_key, embedding)
             
             return embedding
             
@@ -76,7 +109,63 @@ class EmbeddingsService:
             logger.error(f"Error generating embedding: {e}")
             raise
 
-    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+    def _lookup_cached(
+        self,
+        texts: List[str],
+    ) -> Tuple[Optional[np.ndarray], List[Optional[bytes]], List[int]]:
+        """
+        Fill embeddings for cached texts.
+        
+        Returns:
+            (embedding matrix or None if nothing was cached, cache keys,
+            indices of texts that still need embedding)
+        """
+        if not self.use_cache:
+            return None, [None] * len(texts), list(range(len(texts)))
+        
+        # Keys are hashed once here and reused when storing misses
+        cache_keys: List[Optional[bytes]] = [self._get_cache_key(text) for text in texts]
+        
+        # Allocated once the dimension is known from the first vector
+        embeddings: Optional[np.ndarray] = None
+        text_indices = []
+        
+        # Plain reads: WAL readers never block, whereas transact() would take
+        # the SQLite write lock and serialize lookups across workers
+        for i, cache_key in enumerate(cache_keys):
+            cached = self._cache_get(cache_key)
+            if cached is None:
+                text_indices.append(i)
+                continue
+            if embeddings is None:
+                embeddings = np.empty((len(texts), cached.shape[0]), dtype=np.float32)
+            embeddings[i] = cached
+        
+        return embeddings, cache_keys, text_indices
+
+    def _store_batch(
+        self,
+        embeddings: Optional[np.ndarray],
+        num_texts: int,
+        batch_indices: List[int],
+        batch_embeddings: List[List[float]],
+        cache_keys: List[Optional[bytes]],
+    ) -> np.ndarray:
+        """Write a batch of generated embeddings into the matrix and cache."""
+        batch_array = np.asarray(batch_embeddings, dtype=np.float32)
+        
+        if embeddings is None:
+            embeddings = np.empty((num_texts, batch_array.shape[1]), dtype=np.float32)
+        embeddings[batch_indices] = batch_array
+        
+        if self.use_cache:
+            with self.cache.transact():
+                for i, embedding in zip(batch_indices, batch_array):
+                    self._cache_set(cache_keys[i], embedding)
+        
+        return embeddings
+
+    def embed_texts(self, texts: List[str]) -> np.ndarray:
         """
         Generate embeddings for multiple texts with batching.
         
@@ -84,50 +173,81 @@ class EmbeddingsService:
             texts: List of texts to embed
             
         Returns:
-            List of embedding vectors
+            Embedding matrix of shape (len(texts), dimension), float32
         """
         try:
-            embeddings = []
-            cache_hits = 0
-            texts_to_embed = []
-            text_indices = []
-            
-            # Check cache for each text
-            if self.use_cache:
-                for i, text in enumerate(texts):
-                    cache_key = self._get_cache_key(text)
-                    if cache_key in self.cache:
-                        embeddings.append(self.cache[cache_key])
-                        cache_hits += 1
-                    else:
-                        texts_to_embed.append(text)
-                        text_indices.append(i)
-                        embeddings.append(None)  # Placeholder
-            else:
-                texts_to_embed = texts
-                text_indices = list(range(len(texts)))
-                embeddings = [None] * len(texts)
+            embeddings, cache_keys, text_indices = self._lookup_cached(texts)
             
             # Generate embeddings for uncached texts in batches
-            if texts_to_embed:
-                for i in range(0, len(texts_to_embed), self.batch_size):
-                    batch = texts_to_embed[i:i + self.batch_size]
-                    batch_embeddings = self.embeddings.embed_documents(batch)
-                    
-                    # Store in results and cache
-                    for j, embedding in enumerate(batch_embeddings):
-                        idx = text_indices[i + j]
-                        embeddings[idx] = embedding
-                        
-                        if self.use_cache:
-                            cache_key = self._get_cache_key(texts[idx])
-                            self.cache[cache_key] = embedding
+            for start in range(0, len(text_indices), self.batch_size):
+                batch_indices = text_indices[start:start + self.batch_size]
+                batch_embeddings = self.embeddings.embed_documents(
+                    [texts[i] for i in batch_indices]
+                )
+                embeddings = self._store_batch(
+                    embeddings, len(texts), batch_indices, batch_embeddings, cache_keys
+                )
             
             logger.info(
-                f"Generated {len(texts_to_embed)} embeddings, "
-                f"{cache_hits} cache hits"
+                f"Generated {len(text_indices)} embeddings, "
+                f"{len(texts) - len(text_indices)} cache hits"
             )
             
+            if embeddings is None:
+                return np.empty((0, 0), dtype=np.float32)
+            return embeddings
+            
+        except Exception as e:
+            logger.error(f"Error generating embeddings: {e}")
+            raise
+
+    async def aembed_texts(
+        self,
+        texts: List[str],
+        max_concurrency: Optional[int] = None,
+    ) -> np.ndarray:
+        """
+        Generate embeddings for multiple texts, sending batches concurrently.
+        
+        Args:
+            texts: List of texts to embed
+            max_concurrency: Maximum in-flight embedding requests
+                (defaults to settings.embedding_max_concurrency)
+            
+        Returns:
+            Embedding matrix of shape (len(texts), dimension), float32
+        """
+        try:
+            # Cache reads are disk I/O, so keep them off the event loop
+            embeddings, cache_keys, text_indices = await asyncio.to_thread(
+                self._lookup_cached, texts
+            )
+            semaphore = asyncio.Semaphore(max_concurrency or settings.embedding_max_concurrency)
+            
+            async def _embed_batch(batch_indices: List[int]) -> List[List[float]]:
+                async with semaphore:
+                    return await self.embeddings.aembed_documents(
+                        [texts[i] for i in batch_indices]
+                    )
+            
+            batches = [
+                text_indices[start:start + self.batch_size]
+                for start in range(0, len(text_indices), self.batch_size)
+            ]
+            results = await asyncio.gather(*(_embed_batch(batch) for batch in batches))
+            
+            for batch_indices, batch_embeddings in zip(batches, results):
+                embeddings = self._store_batch(
+                    embeddings, len(texts), batch_indices, batch_embeddings, cache_keys
+                )
+            
+            logger.info(
+                f"Generated {len(text_indices)} embeddings in {len(batches)} concurrent batches, "
+                f"{len(texts) - len(text_indices)} cache hits"
+            )
+            
+            if embeddings is None:
+                return np.empty((0, 0), dtype=np.float32)
             return embeddings
             
         except Exception as e:
@@ -154,18 +274,18 @@ class EmbeddingsService:
             # Generate embeddings
             embeddings = self.embed_texts(texts)
             
-            # Prepare vectors for Pinecone
-            vectors = []
-            for i, (doc, embedding) in enumerate(zip(documents, embeddings)):
-                vector = {
+            # Prepare vectors for Pinecone. Metadata is a shallow copy plus the
+            # full chunk text, which is all search results and RAG context
+            # get back; token-sized chunks stay well under Pinecone's 40 KB
+            # metadata limit.
+            vectors = [
+                {
                     "id": doc.metadata.get("id", f"doc_{i}"),
-                    "values": embedding,
-                    "metadata": {
-                        **doc.metadata,
-                        "text": doc.page_content[:1000],  # Store first 1000 chars
-                    }
+                    "values": embedding.tolist(),
+                    "metadata": dict(doc.metadata, text=doc.page_content),
                 }
-                vectors.append(vector)
+                for i, (doc, embedding) in enumerate(zip(documents, embeddings))
+            ]
             
             logger.info(f"Prepared {len(vectors)} vectors for Pinecone")
             
@@ -177,42 +297,13 @@ class EmbeddingsService:
 
     def clear_cache(self):
         """Clear embedding cache."""
-        self.cache.clear()
+        if self.cache is not None:
+            self.cache.clear()
         logger.info("Cleared embedding cache")
 
     def get_cache_size(self) -> int:
         """Get number of cached embeddings."""
-        return len(self.cache)
-
-    def save_cache(self, filepath: str):
-        """
-        Save cache to file.
-        
-        Args:
-            filepath: Path to save cache
-        """
-        try:
-            with open(filepath, 'w') as f:
-                json.dump(self.cache, f)
-            logger.info(f"Saved embedding cache to {filepath}")
-        except Exception as e:
-            logger.error(f"Error saving cache: {e}")
-            raise
-
-    def load_cache(self, filepath: str):
-        """
-        Load cache from file.
-        
-        Args:
-            filepath: Path to load cache from
-        """
-        try:
-            with open(filepath, 'r') as f:
-                self.cache = json.load(f)
-            logger.info(f"Loaded {len(self.cache)} embeddings from {filepath}")
-        except Exception as e:
-            logger.error(f"Error loading cache: {e}")
-            raise
+        return len(self.cache) if self.cache is not None else 0
 
 
 def create_embeddings_service(
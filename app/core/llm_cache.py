@@ -0,0 +1,79 @@
+"""
+LLM response caching shared by the LangChain chains.
+"""
+import logging
+import threading
+from typing import Any, Optional
+
+from cachetools import LRUCache
+from langchain.globals import set_llm_cache
+from langchain_community.cache import SQLiteCache
+from langchain_core.caches import BaseCache, RETURN_VAL_TYPE
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Above this temperature responses are intentionally varied, so don't cache
+MAX_CACHEABLE_TEMPERATURE = 0.5
+
+_configured = False
+_configure_lock = threading.Lock()
+
+
+class BoundedInMemoryCache(BaseCache):
+    """
+    Exact-match LLM cache keyed on (prompt, llm_string) with LRU eviction.
+    """
+
+    def __init__(self, max_size: int = 1000):
+        self._cache: LRUCache = LRUCache(maxsize=max_size)
+        self._lock = threading.Lock()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        """Look up a cached generation."""
+        with self._lock:
+            return self._cache.get((prompt, llm_string))
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """Store a generation."""
+        with self._lock:
+            self._cache[(prompt, llm_string)] = return_val
+
+    def clear(self, **kwargs: Any) -> None:
+        """Clear the cache."""
+        with self._lock:
+            self._cache.clear()
+
+
+def configure_llm_cache():
+    """
+    Install the process-wide LangChain LLM cache once.
+
+    The backend is selected by `settings.llm_cache_backend`:
+    'memory' (bounded LRU), 'sqlite' (persistent across processes) or 'none'.
+    """
+    global _configured
+    if _configured:
+        return
+
+    with _configure_lock:
+        if _configured:
+            return
+
+        backend = settings.llm_cache_backend.lower()
+        if backend == "memory":
+            set_llm_cache(BoundedInMemoryCache(max_size=settings.llm_cache_max_size))
+        elif backend == "sqlite":
+            set_llm_cache(SQLiteCache(database_path=settings.llm_cache_path))
+        elif backend != "none":
+            logger.warning(f"Unknown LLM cache backend '{backend}', caching disabled")
+
+        logger.info(f"Configured LLM cache backend: {backend}")
+        _configured = True
+
+
+def is_cacheable(temperature: float) -> bool:
+    """Whether responses at this temperature are deterministic enough to cache."""
+    return temperature <= MAX_CACHEABLE_TEMPERATURE
@@ -1,8 +1,10 @@
 """
 Logging configuration for the application.
 """
+import atexit
 import logging
 import logging.handlers
+import queue
 import sys
 from pathlib import Path
 
@@ -10,9 +12,16 @@ from app.config import get_settings
 
 settings = get_settings()
 
+# Background thread that performs the actual handler I/O
+_queue_listener = None
+
 
 def setup_logging():
     """Configure application logging."""
+    global _queue_listener
+    
+    if _queue_listener is not None:
+        return
     
     # Create logs directory if it doesn't exist
     logs_dir = Path("logs")
@@ -55,10 +64,19 @@ def setup_logging():
     error_file_handler.setLevel(logging.ERROR)
     error_file_handler.setFormatter(file_formatter)
     
-    # Add handlers
-    root_logger.addHandler(console_handler)
-    root_logger.addHandler(file_handler)
-    root_logger.addHandler(error_file_handler)
+    # Callers only enqueue records; a listener thread does the writes
+    log_queue: queue.Queue = queue.Queue(-1)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    
+    _queue_listener = logging.handlers.QueueListener(
+        log_queue,
+        console_handler,
+        file_handler,
+        error_file_handler,
+        respect_handler_level=True,
+    )
+    _queue_listener.start()
+    atexit.register(_queue_listener.stop)
     
     # Reduce noise from third-party libraries
     logging.getLogger("httpx").setLevel(logging.WARNING)
@@ -2,79 +2,111 @@
 Metrics collection for monitoring.
 """
 import time
-from typing import Dict, Any
+from typing import Dict, Any, List
 from collections import defaultdict
 import threading
 
 
+def _new_metrics_shard() -> Dict[str, Dict[str, Any]]:
+    """Create an empty per-thread metrics shard."""
+    return defaultdict(lambda: {
+        "count": 0,
+        "total_time": 0.0,
+        "errors": 0,
+        "successes": 0
+    })
+
+
 class MetricsCollector:
     """
     Simple metrics collector for monitoring application performance.
+
+    Each thread records into its own shard, so writes never take a lock;
+    shards are folded together when metrics are read.
     """
 
     def __init__(self):
-        self._metrics: Dict[str, Any] = defaultdict(lambda: {
-            "count": 0,
-            "total_time": 0.0,
-            "errors": 0,
-            "successes": 0
-        })
-        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._shards: List[Dict[str, Dict[str, Any]]] = []
+        self._shards_lock = threading.Lock()  # Guards shard registration only
+
+    def _shard(self) -> Dict[str, Dict[str, Any]]:
+        """Get the calling thread's shard, registering it on first use."""
+        try:
+            return self._local.metrics
+        except AttributeError:
+            shard = _new_metrics_shard()
+            with self._shards_lock:
+                self._shards.append(shard)
+            self._local.metrics = shard
+            return shard
 
     def record_request(self, endpoint: str, duration: float, success: bool = True):
         """
         Record a request metric.
-        
+
         Args:
             endpoint: API endpoint
             duration: Request duration in seconds
             success: Whether request was successful
         """
-        with self._lock:
-            metrics = self._metrics[endpoint]
-            metrics["count"] += 1
-            metrics["total_time"] += duration
-            
-            if success:
-                metrics["successes"] += 1
-            else:
-                metrics["errors"] += 1
+        metrics = self._shard()[endpoint]
+        metrics["count"] += 1
+        metrics["total_time"] += duration
+
+        if success:
+            metrics["successes"] += 1
+        else:
+            metrics["errors"] += 1
 
     def record_llm_call(self, model: str, tokens: int, cost: float):
         """Record LLM API call metrics."""
-        with self._lock:
-            metrics = self._metrics[f"llm_{model}"]
-            metrics["count"] += 1
-            metrics["tokens"] = metrics.get("tokens", 0) + tokens
-            metrics["cost"] = metrics.get("cost", 0.0) + cost
+        metrics = self._shard()[f"llm_{model}"]
+        metrics["count"] += 1
+        metrics["tokens"] = metrics.get("tokens", 0) + tokens
+        metrics["cost"] = metrics.get("cost", 0.0) + cost
 
     def get_metrics(self) -> Dict[str, Any]:
         """Get all collected metrics."""
-        with self._lock:
-            return dict(self._metrics)
+        merged: Dict[str, Dict[str, Any]] = {}
+
+        with self._shards_lock:
+            shards = list(self._shards)
+
+        for shard in shards:
+            # Snapshot first: the owning thread may add keys concurrently
+            for name, metrics in list(shard.items()):
+                total = merged.setdefault(name, {})
+                for key, value in list(metrics.items()):
+                    total[key] = total.get(key, 0) + value
+
+        return merged
 
     def get_endpoint_metrics(self, endpoint: str) -> Dict[str, Any]:
         """Get metrics for specific endpoint."""
-        with self._lock:
-            metrics = self._metrics.get(endpoint, {})
-            if metrics.get("count", 0) > 0:
-                metrics["avg_time"] = metrics["total_time"] / metrics["count"]
-                metrics["error_rate"] = metrics["errors"] / metrics["count"]
-            return dict(metrics)
+        metrics = self.get_metrics().get(endpoint, {})
+        if metrics.get("count", 0) > 0:
+            metrics["avg_time"] = metrics["total_time"] / metrics["count"]
+            metrics["error_rate"] = metrics["errors"] / metrics["count"]
+        return metrics
 
     def reset(self):
         """Reset all metrics."""
-        with self._lock:
-            self._metrics.clear()
+        with self._shards_lock:
+            for shard in self._shards:
+                shard.clear()
 
 
 # Global metrics collector
 _metrics_collector = None
+_metrics_collector_lock = threading.Lock()
 
 
 def get_metrics_collector() -> MetricsCollector:
     """Get or create metrics collector."""
     global _metrics_collector
     if _metrics_collector is None:
-        _metrics_collector = MetricsCollector()
+        with _metrics_collector_lock:
+            if _metrics_collector is None:
+                _metrics_collector = MetricsCollector()
     return _metrics_collector
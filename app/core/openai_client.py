@@ -1,10 +1,12 @@
 """
 OpenAI client with error handling, retry logic, and rate limiting.
 """
+import threading
 import time
-from typing import Optional, Dict, Any, List
-from functools import wraps
+from typing import Optional, Dict, Any, List, Tuple
+from functools import lru_cache, wraps
 import logging
+import httpx
 from openai import OpenAI, AsyncOpenAI
 from openai import RateLimitError, APIError, APIConnectionError, APITimeoutError
 from tenacity import (
@@ -20,6 +22,24 @@ from app.config import get_settings
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Shared connection pool settings for all OpenAI HTTP traffic
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+HTTP_TIMEOUT = httpx.Timeout(60.0)
+
+
+@lru_cache(maxsize=1)
+def get_http_clients() -> Tuple[httpx.Client, httpx.AsyncClient]:
+    """
+    Get the process-wide (sync, async) HTTP/2 clients for OpenAI requests.
+    
+    Sharing them lets concurrent requests multiplex over pooled connections
+    instead of each client doing its own TLS handshakes.
+    """
+    return (
+        httpx.Client(http2=True, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT),
+        httpx.AsyncClient(http2=True, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT),
+    )
+
 
 class OpenAIClientWrapper:
     """
@@ -27,8 +47,12 @@ class OpenAIClientWrapper:
     """
 
     def __init__(self):
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
-        self.async_client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        http_client, async_http_client = get_http_clients()
+        self.client = OpenAI(api_key=settings.OPENAI_API_KEY, http_client=http_client)
+        self.async_client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            http_client=async_http_client,
+        )
         self.total_tokens_used = 0
         self.total_cost = 0.0
         
@@ -39,16 +63,19 @@ class OpenAIClientWrapper:
             "gpt-3.5-turbo": {"input": 0.0005, "output": 0.0015},
             "text-embedding-ada-002": {"input": 0.0001, "output": 0.0},
         }
+        
+        # Per-token (input, output) prices, precomputed for _calculate_cost
+        self._price_per_token = {
+            model: (price["input"] / 1000, price["output"] / 1000)
+            for model, price in self.pricing.items()
+        }
+        # Use GPT-4 pricing as default for unknown models
+        self._default_price = self._price_per_token["gpt-4"]
 
     def _calculate_cost(self, model: str, input_tokens: int, output_tokens: int) -> float:
         """Calculate cost based on token usage."""
-        if model not in self.pricing:
-            # Use GPT-4 pricing as default for unknown models
-            model = "gpt-4"
-        
-        pricing = self.pricing[model]
-        cost = (input_tokens / 1000 * pricing["input"]) + (output_tokens / 1000 * pricing["output"])
-        return cost
+        input_price, output_price = self._price_per_token.get(model, self._default_price)
+        return input_tokens * input_price + output_tokens * output_price
 
     def _update_usage_stats(self, usage: Dict[str, Any], model: str):
         """Update usage statistics."""
@@ -272,11 +299,14 @@ class OpenAIClientWrapper:
 
 # Global client instance
 _openai_client: Optional[OpenAIClientWrapper] = None
+_openai_client_lock = threading.Lock()
 
 
 def get_openai_client() -> OpenAIClientWrapper:
     """Get or create the global OpenAI client instance."""
     global _openai_client
     if _openai_client is None:
-        _openai_client = OpenAIClientWrapper()
+        with _openai_client_lock:
+            if _openai_client is None:
+                _openai_client = OpenAIClientWrapper()
     return _openai_client
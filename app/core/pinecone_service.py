@@ -2,15 +2,114 @@
 Pinecone vector database service for semantic search.
 """
 import logging
-from typing import List, Dict, Any, Optional
+import threading
+from typing import Callable, List, Dict, Any, Optional, Tuple, Union
+
+import numpy as np
+import orjson
+from cachetools import LRUCache
 from pinecone import Pinecone, ServerlessSpec
 from langchain.schema import Document
 
 from app.config import get_settings
+from app.services.semantic_cache import SemanticCache
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Query vectors may be lists (as the Pinecone SDK takes them) or float32
+# arrays (as the embeddings service returns them)
+Vector = Union[List[float], np.ndarray]
+
+
+def _as_list(vector: Vector) -> List[float]:
+    """Convert a query vector to the plain list the Pinecone SDK sends."""
+    return vector.tolist() if isinstance(vector, np.ndarray) else vector
+
+
+class SemanticQueryCache:
+    """
+    Cache of Pinecone query results for near-duplicate query vectors.
+    
+    Queries only match within the same (namespace, top_k, filter,
+    include_metadata) bucket; each bucket is a SemanticCache, and the least
+    recently used bucket is dropped once `max_buckets` is reached.
+    """
+
+    def __init__(
+        self,
+        dimension: int,
+        threshold: float = 0.97,
+        max_size: int = 1024,
+        ttl: float = 300.0,
+        max_buckets: int = 8,
+        quantize: bool = True,
+    ):
+        """
+        Initialize semantic query cache.
+        
+        Args:
+            dimension: Embedding dimension
+            threshold: Minimum cosine similarity for a cache hit
+            max_size: Maximum cached queries per bucket
+            ttl: Entry time-to-live in seconds
+            max_buckets: Maximum number of (namespace, top_k, filter) buckets
+            quantize: Store cached query vectors as int8
+        """
+        self.dimension = dimension
+        self.threshold = threshold
+        self.max_size = max_size
+        self.ttl = ttl
+        self.quantize = quantize
+        self._buckets: LRUCache = LRUCache(maxsize=max_buckets)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def bucket_key(
+        namespace: str,
+        top_k: int,
+        filter: Optional[Dict[str, Any]],
+        include_metadata: bool,
+    ) -> Tuple[str, int, bytes, bool]:
+        """Build the bucket key for a query's parameters."""
+        filter_key = orjson.dumps(filter, option=orjson.OPT_SORT_KEYS) if filter else b""
+        return (namespace, top_k, filter_key, include_metadata)
+
+    def get(self, query_vector: Vector, bucket_key: Tuple) -> Optional[List[Any]]:
+        """Look up cached matches for a query vector."""
+        with self._lock:
+            bucket = self._buckets.get(bucket_key)
+        if bucket is None:
+            return None
+        matches = bucket.get(query_vector)
+        return list(matches) if matches is not None else None
+
+    def put(self, query_vector: Vector, bucket_key: Tuple, matches: List[Any]):
+        """Store the matches for a query vector."""
+        with self._lock:
+            bucket = self._buckets.get(bucket_key)
+            if bucket is None:
+                bucket = SemanticCache(
+                    dimension=self.dimension,
+                    threshold=self.threshold,
+                    max_size=self.max_size,
+                    ttl=self.ttl,
+                    quantize=self.quantize,
+                )
+                self._buckets[bucket_key] = bucket
+        bucket.put(query_vector, list(matches))
+
+    def invalidate(self, namespace: str):
+        """Drop cached results for a namespace after its vectors change."""
+        with self._lock:
+            for key in [key for key in self._buckets if key[0] == namespace]:
+                del self._buckets[key]
+
+    def clear(self):
+        """Drop all cached results."""
+        with self._lock:
+            self._buckets.clear()
+
 
 class PineconeService:
     """
@@ -22,6 +121,10 @@ class PineconeService:
         index_name: Optional[str] = None,
         dimension: int = 1536,  # OpenAI ada-002 embedding dimension
         metric: str = "cosine",
+        pool_threads: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        document_chunk_size: int = 1000,
+        use_query_cache: bool = True,
     ):
         """
         Initialize Pinecone service.
@@ -30,12 +133,51 @@ class PineconeService:
             index_name: Name of the Pinecone index
             dimension: Dimension of embeddings
             metric: Distance metric (cosine, euclidean, dotproduct)
+            pool_threads: Index connection pool size for parallel upserts
+                (defaults to settings.pinecone_pool_threads)
+            batch_size: Vectors per upsert request
+                (defaults to settings.pinecone_upsert_batch_size)
+            document_chunk_size: Vectors staged per upsert window
+            use_query_cache: Serve near-duplicate queries from memory
         """
         self.pc = Pinecone(api_key=settings.PINECONE_API_KEY)
         self.index_name = index_name or settings.PINECONE_INDEX_NAME
         self.dimension = dimension
         self.metric = metric
+        self.pool_threads = pool_threads or settings.pinecone_pool_threads
+        self.batch_size = batch_size or settings.pinecone_upsert_batch_size
+        self.document_chunk_size = document_chunk_size
         self.index = None
+        
+        self.query_cache: Optional[SemanticQueryCache] = None
+        if use_query_cache:
+            self.query_cache = SemanticQueryCache(
+                dimension=dimension,
+                threshold=settings.pinecone_query_cache_threshold,
+                max_size=settings.pinecone_query_cache_size,
+                ttl=settings.pinecone_query_cache_ttl,
+                quantize=settings.pinecone_query_cache_quantize,
+            )
+        
+        # Called with the namespace whenever its vectors change, so caches
+        # built on query results elsewhere can be dropped too
+        self._invalidation_listeners: List[Callable[[str], None]] = []
+
+    def add_invalidation_listener(self, listener: Callable[[str], None]):
+        """
+        Register a callback run after vectors in a namespace change.
+        
+        Args:
+            listener: Called with the namespace after each upsert or delete
+        """
+        self._invalidation_listeners.append(listener)
+
+    def _invalidate(self, namespace: str):
+        """Drop cached query results for a namespace and notify listeners."""
+        if self.query_cache is not None:
+            self.query_cache.invalidate(namespace)
+        for listener in self._invalidation_listeners:
+            listener(namespace)
 
     def create_index(self, delete_if_exists: bool = False):
         """
@@ -54,7 +196,7 @@ class PineconeService:
                     self.pc.delete_index(self.index_name)
                 else:
                     logger.info(f"Index {self.index_name} already exists")
-                    self.index = self.pc.Index(self.index_name)
+                    self.index = self._connect()
                     return
             
             # Create new index
@@ -69,18 +211,22 @@ class PineconeService:
                 )
             )
             
-            self.index = self.pc.Index(self.index_name)
+            self.index = self._connect()
             logger.info(f"Created Pinecone index: {self.index_name}")
             
         except Exception as e:
             logger.error(f"Error creating index: {e}")
             raise
 
+    def _connect(self):
+        """Open the index with a connection pool for parallel requests."""
+        return self.pc.Index(self.index_name, pool_threads=self.pool_threads)
+
     def get_index(self):
         """Get or create index connection."""
         if self.index is None:
             try:
-                self.index = self.pc.Index(self.index_name)
+                self.index = self._connect()
             except Exception as e:
                 logger.error(f"Error connecting to index: {e}")
                 raise
@@ -90,31 +236,36 @@ class PineconeService:
         self,
         vectors: List[Dict[str, Any]],
         namespace: str = "",
-        batch_size: int = 100,
+        batch_size: Optional[int] = None,
+        document_chunk_size: Optional[int] = None,
     ) -> Dict[str, Any]:
         """
         Upsert vectors to Pinecone.
         
+        Vectors are staged in windows of `document_chunk_size`; the batches
+        within a window are sent concurrently over the index connection pool.
+        
         Args:
             vectors: List of vector dictionaries with id, values, and metadata
             namespace: Namespace for the vectors
-            batch_size: Batch size for upserting
+            batch_size: Batch size for upserting (defaults to self.batch_size)
+            document_chunk_size: Vectors per window
+                (defaults to self.document_chunk_size)
             
         Returns:
             Upsert statistics
         """
         try:
             index = self.get_index()
+            batch_size = batch_size or self.batch_size
+            document_chunk_size = document_chunk_size or self.document_chunk_size
             
-            # Batch upsert
             total_upserted = 0
-            for i in range(0, len(vectors), batch_size):
-                batch = vectors[i:i + batch_size]
-                response = index.upsert(
-                    vectors=batch,
-                    namespace=namespace
-                )
-                total_upserted += response.get('upserted_count', len(batch))
+            for start in range(0, len(vectors), document_chunk_size):
+                window = vectors[start:start + document_chunk_size]
+                total_upserted += self._upsert_window(index, window, namespace, batch_size)
+            
+            self._invalidate(namespace)
             
             logger.info(
                 f"Upserted {total_upserted} vectors to namespace '{namespace}'"
@@ -129,9 +280,32 @@ class PineconeService:
             logger.error(f"Error upserting vectors: {e}")
             raise
 
+    def _upsert_window(
+        self,
+        index,
+        vectors: List[Dict[str, Any]],
+        namespace: str,
+        batch_size: int,
+    ) -> int:
+        """Issue every batch of a window at once, then wait for all of them."""
+        batches = [
+            vectors[i:i + batch_size]
+            for i in range(0, len(vectors), batch_size)
+        ]
+        async_results = [
+            index.upsert(vectors=batch, namespace=namespace, async_req=True)
+            for batch in batches
+        ]
+        
+        upserted = 0
+        for batch, async_result in zip(batches, async_results):
+            response = async_result.get()
+            upserted += response.get('upserted_count', len(batch))
+        return upserted
+
     def query(
         self,
-        query_vector: List[float],
+        query_vector: Vector,
         top_k: int = 5,
         namespace: str = "",
         filter: Optional[Dict[str, Any]] = None,
@@ -140,8 +314,11 @@ class PineconeService:
         """
         Query Pinecone for similar vectors.
         
+        Near-duplicate queries with the same parameters are answered from
+        the in-process query cache.
+        
         Args:
-            query_vector: Query embedding vector
+            query_vector: Query embedding vector (list or float32 array)
             top_k: Number of results to return
             namespace: Namespace to query
             filter: Metadata filter
@@ -151,10 +328,21 @@ class PineconeService:
             List of matches with scores and metadata
         """
         try:
+            if self.query_cache is not None:
+                # Convert once; the cache lookup and store both reuse it
+                cache_vector = np.asarray(query_vector, dtype=np.float32)
+                bucket_key = SemanticQueryCache.bucket_key(
+                    namespace, top_k, filter, include_metadata
+                )
+                cached = self.query_cache.get(cache_vector, bucket_key)
+                if cached is not None:
+                    logger.debug(f"Query cache hit in namespace '{namespace}'")
+                    return cached
+            
             index = self.get_index()
             
             response = index.query(
-                vector=query_vector,
+                vector=_as_list(query_vector),
                 top_k=top_k,
                 namespace=namespace,
                 filter=filter,
@@ -165,12 +353,83 @@ class PineconeService:
             
             logger.info(f"Found {len(matches)} matches in namespace '{namespace}'")
             
+            if self.query_cache is not None:
+                self.query_cache.put(cache_vector, bucket_key, matches)
+            
             return matches
             
         except Exception as e:
             logger.error(f"Error querying vectors: {e}")
             raise
 
+    def query_many(
+        self,
+        query_vectors: List[Vector],
+        top_k: int = 5,
+        namespace: str = "",
+        filter: Optional[Dict[str, Any]] = None,
+        include_metadata: bool = True,
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Query Pinecone for several vectors concurrently.
+        
+        Cache misses are issued at once over the index connection pool and
+        then collected, so their network latency overlaps.
+        
+        Args:
+            query_vectors: Query embedding vectors (lists or float32 arrays)
+            top_k: Number of results per query
+            namespace: Namespace to query
+            filter: Metadata filter
+            include_metadata: Include metadata in results
+            
+        Returns:
+            Matches for each query vector, in input order
+        """
+        try:
+            results: List[Optional[List[Dict[str, Any]]]] = [None] * len(query_vectors)
+            
+            bucket_key = None
+            cache_vectors: List[np.ndarray] = []
+            if self.query_cache is not None:
+                bucket_key = SemanticQueryCache.bucket_key(
+                    namespace, top_k, filter, include_metadata
+                )
+                cache_vectors = [np.asarray(v, dtype=np.float32) for v in query_vectors]
+                for i, cache_vector in enumerate(cache_vectors):
+                    results[i] = self.query_cache.get(cache_vector, bucket_key)
+            
+            misses = [i for i, matches in enumerate(results) if matches is None]
+            if misses:
+                index = self.get_index()
+                async_results = [
+                    index.query(
+                        vector=_as_list(query_vectors[i]),
+                        top_k=top_k,
+                        namespace=namespace,
+                        filter=filter,
+                        include_metadata=include_metadata,
+                        async_req=True,
+                    )
+                    for i in misses
+                ]
+                
+                for i, async_result in zip(misses, async_results):
+                    results[i] = async_result.get().get('matches', [])
+                    if self.query_cache is not None:
+                        self.query_cache.put(cache_vectors[i], bucket_key, results[i])
+            
+            logger.info(
+                f"Ran {len(query_vectors)} queries in namespace '{namespace}' "
+                f"({len(query_vectors) - len(misses)} cache hits)"
+            )
+            
+            return results
+            
+        except Exception as e:
+            logger.error(f"Error querying vectors: {e}")
+            raise
+
     def delete(
         self,
         ids: Optional[List[str]] = None,
@@ -200,6 +459,8 @@ class PineconeService:
                 index.delete(filter=filter, namespace=namespace)
                 logger.info(f"Deleted vectors with filter from namespace '{namespace}'")
             
+            self._invalidate(namespace)
+            
         except Exception as e:
             logger.error(f"Error deleting vectors: {e}")
             raise
@@ -252,6 +513,9 @@ class PineconeService:
 def create_pinecone_service(
     index_name: Optional[str] = None,
     dimension: int = 1536,
+    pool_threads: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    document_chunk_size: int = 1000,
 ) -> PineconeService:
     """
     Factory function to create Pinecone service.
@@ -259,6 +523,9 @@ def create_pinecone_service(
     Args:
         index_name: Name of the index
         dimension: Embedding dimension
+        pool_threads: Index connection pool size (defaults to settings)
+        batch_size: Vectors per upsert request (defaults to settings)
+        document_chunk_size: Vectors staged per upsert window
         
     Returns:
         PineconeService instance
@@ -266,4 +533,25 @@ def create_pinecone_service(
     return PineconeService(
         index_name=index_name,
         dimension=dimension,
+        pool_threads=pool_threads,
+        batch_size=batch_size,
+        document_chunk_size=document_chunk_size,
     )
+
+
+# Global service instance, shared so all callers reuse one index connection
+# pool and one query cache
+_pinecone_service: Optional[PineconeService] = None
+_pinecone_service_lock = threading.Lock()
+
+
+def get_pinecone_service() -> PineconeService:
+    """Get or create the global Pinecone service instance."""
+    global _pinecone_service
+    if _pinecone_service is None:
+        with _pinecone_service_lock:
+            if _pinecone_service is None:
+                _pinecone_service = create_pinecone_service(
+                    dimension=settings.pinecone_dimension,
+                )
+    return _pinecone_service
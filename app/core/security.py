@@ -1,13 +1,17 @@
 """
 Security middleware for rate limiting and request validation.
+
+The middlewares are plain ASGI callables rather than BaseHTTPMiddleware
+subclasses, so they add no per-request task group or response buffering.
 """
 import logging
 import time
-from collections import defaultdict
-from typing import Dict, Tuple
-from fastapi import Request, HTTPException, status
-from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from collections import OrderedDict, deque
+from typing import Deque, Tuple
+from fastapi import status
+from fastapi.responses import ORJSONResponse
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.config import get_settings
 
@@ -15,97 +19,254 @@ logger = logging.getLogger(__name__)
 settings = get_settings()
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
+# Fixed-window counter: increment, and start the window's expiry on first hit
+RATE_LIMIT_LUA = """
+local count = redis.call('INCR', KEYS[1])
+if count == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+return count
+"""
+
+
+class RateLimitMiddleware:
     """
-    Rate limiting middleware using token bucket algorithm.
+    Rate limiting middleware.
+
+    The backend is selected by `settings.rate_limit_backend`: 'memory'
+    (per-process sliding window) or 'redis' (fixed window shared by all
+    workers). If Redis is unreachable, requests fall back to the in-memory
+    limiter rather than failing.
     """
 
-    def __init__(self, app):
-        super().__init__(app)
-        self.requests: Dict[str, list] = defaultdict(list)
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        # Per-client request timestamps, oldest first; never longer than
+        # the limit, since requests beyond it are rejected, not recorded.
+        # Clients are kept in least-recently-seen order so idle ones can be
+        # evicted from the front.
+        self.requests: "OrderedDict[str, Deque[float]]" = OrderedDict()
         self.rate_limit = settings.rate_limit_per_minute
+        self.max_clients = settings.rate_limit_max_clients
         self.window = 60  # 60 seconds
+        self._limit_header = str(self.rate_limit)
+
+        self._redis = None
+        self._redis_hit = None
+        backend = settings.rate_limit_backend.lower()
+        if backend == "redis":
+            # Optional dependency, only needed for the shared backend
+            import redis.asyncio as aioredis
+
+            self._redis = aioredis.Redis(
+                host=settings.redis_host,
+                port=settings.redis_port,
+                db=settings.redis_db,
+                password=settings.redis_password,
+            )
+            self._redis_hit = self._redis.register_script(RATE_LIMIT_LUA)
+        elif backend != "memory":
+            logger.warning(f"Unknown rate limit backend '{backend}', using memory")
+
+    def _evict_idle_clients(self, current_time: float):
+        """Drop clients with no requests left in the window, oldest first."""
+        requests = self.requests
+        while requests:
+            timestamps = next(iter(requests.values()))
+            if timestamps and current_time - timestamps[-1] < self.window:
+                break
+            requests.popitem(last=False)
+
+    def _check_memory(self, client_ip: str) -> Tuple[bool, int]:
+        """
+        Record a request in the in-process sliding window.
+
+        Returns:
+            (whether the request is allowed, requests remaining)
+        """
+        current_time = time.monotonic()
+
+        self._evict_idle_clients(current_time)
+
+        timestamps = self.requests.get(client_ip)
+        if timestamps is None:
+            if len(self.requests) >= self.max_clients:
+                self.requests.popitem(last=False)
+            timestamps = self.requests[client_ip] = deque(maxlen=self.rate_limit)
+        else:
+            self.requests.move_to_end(client_ip)
+
+        # Expire requests that have left the window
+        while timestamps and current_time - timestamps[0] >= self.window:
+            timestamps.popleft()
+
+        if len(timestamps) >= self.rate_limit:
+            return False, 0
+
+        timestamps.append(current_time)
+        return True, self.rate_limit - len(timestamps)
+
+    async def _check_redis(self, client_ip: str) -> Tuple[bool, int]:
+        """
+        Count a request in the shared Redis window (one round trip).
+
+        Returns:
+            (whether the request is allowed, requests remaining)
+        """
+        window_id = int(time.time() // self.window)
+        count = await self._redis_hit(
+            keys=[f"ratelimit:{client_ip}:{window_id}"],
+            args=[self.window],
+        )
+        return count <= self.rate_limit, max(self.rate_limit - count, 0)
 
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
         """Process request with rate limiting."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # Get client identifier (IP address)
-        client_ip = request.client.host
-        current_time = time.time()
+        client = scope.get("client")
+        client_ip = client[0] if client else ""
 
-        # Clean old requests
-        self.requests[client_ip] = [
-            req_time for req_time in self.requests[client_ip]
-            if current_time - req_time < self.window
-        ]
+        if self._redis is not None:
+            try:
+                allowed, remaining = await self._check_redis(client_ip)
+            except Exception as e:
+                logger.warning(f"Redis rate limiting unavailable, using memory: {e}")
+                allowed, remaining = self._check_memory(client_ip)
+        else:
+            allowed, remaining = self._check_memory(client_ip)
 
         # Check rate limit
-        if len(self.requests[client_ip]) >= self.rate_limit:
+        if not allowed:
             logger.warning(f"Rate limit exceeded for {client_ip}")
-            return JSONResponse(
+            response = ORJSONResponse(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                 content={
                     "detail": "Rate limit exceeded. Please try again later.",
                     "retry_after": self.window
                 }
             )
+            await response(scope, receive, send)
+            return
+
+        remaining_header = str(remaining)
 
-        # Add current request
-        self.requests[client_ip].append(current_time)
+        async def send_with_rate_limit_headers(message: Message):
+            if message["type"] == "http.response.start":
+                # Add rate limit headers
+                headers = MutableHeaders(scope=message)
+                headers["X-RateLimit-Limit"] = self._limit_header
+                headers["X-RateLimit-Remaining"] = remaining_header
+            await send(message)
 
         # Continue processing
-        response = await call_next(request)
-        
-        # Add rate limit headers
-        response.headers["X-RateLimit-Limit"] = str(self.rate_limit)
-        response.headers["X-RateLimit-Remaining"] = str(
-            self.rate_limit - len(self.requests[client_ip])
-        )
-        
-        return response
+        await self.app(scope, receive, send_with_rate_limit_headers)
+
+
+# Security headers added to every response
+SECURITY_HEADERS = {
+    "X-Content-Type-Options": "nosniff",
+    "X-Frame-Options": "DENY",
+    "X-XSS-Protection": "1; mode=block",
+    "Strict-Transport-Security": "max-age=31536000; includeSubDomains",
+}
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+class SecurityHeadersMiddleware:
     """Add security headers to responses."""
 
-    async def dispatch(self, request: Request, call_next):
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
         """Add security headers."""
-        response = await call_next(request)
-        
-        # Security headers
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-        
-        return response
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_security_headers(message: Message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for name, value in SECURITY_HEADERS.items():
+                    headers[name] = value
+            await send(message)
+
+        await self.app(scope, receive, send_with_security_headers)
 
 
-class RequestValidationMiddleware(BaseHTTPMiddleware):
-    """Validate and sanitize requests."""
+# Body media types accepted on methods that carry a request body
+ALLOWED_CONTENT_TYPES = frozenset({
+    b"application/json",
+    b"multipart/form-data",
+    b"application/x-www-form-urlencoded",
+})
+BODY_METHODS = frozenset({"POST", "PUT", "PATCH"})
+
+
+class RequestValidationMiddleware:
+    """
+    Validate and sanitize requests.
+
+    Checks run on the raw request headers, so rejected requests are
+    answered before any of their body is read.
+    """
 
     MAX_CONTENT_LENGTH = 10 * 1024 * 1024  # 10MB
 
-    async def dispatch(self, request: Request, call_next):
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
         """Validate request."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # One pass over the (lowercased) raw headers
+        content_length = None
+        content_type = b""
+        chunked = False
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                content_length = value
+            elif name == b"content-type":
+                # Media type only, without parameters such as charset/boundary
+                content_type = value.split(b";", 1)[0].strip().lower()
+            elif name == b"transfer-encoding":
+                chunked = True
+
         # Check content length
-        content_length = request.headers.get("content-length")
-        if content_length and int(content_length) > self.MAX_CONTENT_LENGTH:
-            return JSONResponse(
-                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                content={"detail": "Request entity too large"}
-            )
+        length = 0
+        if content_length is not None:
+            try:
+                length = int(content_length)
+            except ValueError:
+                await self._reject(scope, receive, send, status.HTTP_400_BAD_REQUEST, "Invalid Content-Length")
+                return
+            if length > self.MAX_CONTENT_LENGTH:
+                await self._reject(
+                    scope, receive, send,
+                    status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, "Request entity too large"
+                )
+                return
+
+        # Check content type of request bodies
+        if scope["method"] in BODY_METHODS and (length > 0 or chunked):
+            if content_type not in ALLOWED_CONTENT_TYPES:
+                logger.warning(f"Invalid content type: {content_type.decode('latin-1')}")
+                await self._reject(
+                    scope, receive, send,
+                    status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, "Unsupported content type"
+                )
+                return
+
+        await self.app(scope, receive, send)
 
-        # Check content type for POST/PUT
-        if request.method in ["POST", "PUT", "PATCH"]:
-            content_type = request.headers.get("content-type", "")
-            allowed_types = [
-                "application/json",
-                "multipart/form-data",
-                "application/x-www-form-urlencoded"
-            ]
-            
-            if not any(allowed in content_type for allowed in allowed_types):
-                logger.warning(f"Invalid content type: {content_type}")
-
-        response = await call_next(request)
-        return response
+    @staticmethod
+    async def _reject(scope: Scope, receive: Receive, send: Send, status_code: int, detail: str):
+        """Answer the request with an error without running the app."""
+        response = ORJSONResponse(status_code=status_code, content={"detail": detail})
+        await response(scope, receive, send)
@@ -2,12 +2,26 @@
 Text splitter for intelligent document chunking.
 """
 import logging
-from typing import List, Optional, Dict, Any
+import threading
+from typing import Iterable, Iterator, List, Optional, Dict, Any, Sequence
+
+import xxhash
+from cachetools import LRUCache
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.schema import Document
 
+from app.core.tokenizer import count_tokens
+
 logger = logging.getLogger(__name__)
 
+# Content-addressed cache of split results, shared by all splitters; keys
+# include the splitter configuration, values are tuples of chunks
+_split_cache: LRUCache = LRUCache(maxsize=512)
+_split_cache_lock = threading.Lock()
+
+# Content type is classified from this many characters at each end of a text
+CONTENT_SAMPLE_CHARS = 16_384
+
 
 class DocumentTextSplitter:
     """
@@ -50,6 +64,38 @@ class DocumentTextSplitter:
             length_function=length_function,
             separators=separators,
         )
+        self._cache_params = (chunk_size, chunk_overlap, tuple(separators), length_function)
+
+    def _split_cached(self, text: str, store: bool = True) -> Sequence[str]:
+        """
+        Split text, reusing the result for previously seen content.
+        
+        With `store=False` a miss is split without adding it to the cache,
+        so its chunks can be freed as soon as the caller is done with them.
+        """
+        key = (xxhash.xxh3_128_digest(text.encode("utf-8", "surrogatepass")), self._cache_params)
+        with _split_cache_lock:
+            chunks = _split_cache.get(key)
+        if chunks is None:
+            chunks = self.splitter.split_text(text)
+            if store:
+                chunks = tuple(chunks)
+                with _split_cache_lock:
+                    _split_cache[key] = chunks
+        return chunks
+
+    def _chunk_documents(self, documents: Iterable[Document], store: bool) -> Iterator[Document]:
+        """Yield chunk Documents for each document in turn."""
+        chunk_id = 0
+        for doc in documents:
+            # Loader metadata holds only flat scalar values, so each chunk gets
+            # a shallow copy built in one step rather than a deepcopy
+            for chunk in self._split_cached(doc.page_content, store):
+                yield Document(
+                    page_content=chunk,
+                    metadata={**doc.metadata, 'chunk_id': chunk_id, 'chunk_size': len(chunk)},
+                )
+                chunk_id += 1
 
     def split_text(self, text: str) -> List[str]:
         """
@@ -62,7 +108,7 @@ class DocumentTextSplitter:
             List of text chunks
         """
         try:
-            chunks = self.splitter.split_text(text)
+            chunks = list(self._split_cached(text))
             logger.info(
                 f"Split text into {len(chunks)} chunks "
                 f"(size: {self.chunk_size}, overlap: {self.chunk_overlap})"
@@ -72,6 +118,37 @@ class DocumentTextSplitter:
             logger.error(f"Error splitting text: {e}")
             raise
 
+    def iter_split_text(self, text: str) -> Iterator[str]:
+        """
+        Yield the chunks of a text.
+        
+        Unlike split_text, a newly split text is not added to the split
+        cache, so its chunks are not kept alive after iteration.
+        
+        Args:
+            text: Text to split
+            
+        Yields:
+            Text chunks
+        """
+        yield from self._split_cached(text, store=False)
+
+    def iter_split_documents(self, documents: Iterable[Document]) -> Iterator[Document]:
+        """
+        Split documents one at a time, building chunk Documents as they are
+        consumed.
+        
+        Only the current document's chunks are held at once: newly split
+        texts are not added to the split cache, unlike split_documents.
+        
+        Args:
+            documents: Document objects (may itself be a lazy iterable)
+            
+        Yields:
+            Chunked Document objects with metadata
+        """
+        return self._chunk_documents(documents, store=False)
+
     def split_documents(self, documents: List[Document]) -> List[Document]:
         """
         Split documents into chunks while preserving metadata.
@@ -83,12 +160,7 @@ class DocumentTextSplitter:
             List of chunked Document objects with metadata
         """
         try:
-            chunked_docs = self.splitter.split_documents(documents)
-            
-            # Add chunk metadata
-            for i, doc in enumerate(chunked_docs):
-                doc.metadata['chunk_id'] = i
-                doc.metadata['chunk_size'] = len(doc.page_content)
+            chunked_docs = list(self._chunk_documents(documents, store=True))
             
             logger.info(
                 f"Split {len(documents)} documents into {len(chunked_docs)} chunks"
@@ -116,13 +188,9 @@ class DocumentTextSplitter:
             List of chunked documents
         """
         try:
-            # Create initial document
+            # One-off text, so stream it rather than filling the split cache
             doc = Document(page_content=text, metadata=metadata)
-            
-            # Split and preserve metadata
-            chunks = self.split_documents([doc])
-            
-            return chunks
+            return list(self.iter_split_documents([doc]))
             
         except Exception as e:
             logger.error(f"Error splitting document with metadata: {e}")
@@ -130,10 +198,9 @@ class DocumentTextSplitter:
 
     def estimate_tokens(self, text: str) -> int:
         """
-        Estimate token count (rough approximation).
-        ~4 characters per token for English text.
+        Count tokens with the OpenAI (cl100k) tokenizer.
         """
-        return len(text) // 4
+        return count_tokens(text)
 
     def should_split(self, text: str) -> bool:
         """
@@ -153,6 +220,7 @@ class AdaptiveTextSplitter(DocumentTextSplitter):
         code_chunk_size: int = 500,
         table_chunk_size: int = 2000,
         chunk_overlap: int = 150,
+        length_function: callable = len,
     ):
         """
         Initialize adaptive splitter with different sizes for different content.
@@ -162,21 +230,25 @@ class AdaptiveTextSplitter(DocumentTextSplitter):
             code_chunk_size: Chunk size for code
             table_chunk_size: Chunk size for tables (larger to preserve structure)
             chunk_overlap: Overlap between chunks
+            length_function: Function to measure chunk length
         """
         super().__init__(
             chunk_size=default_chunk_size,
-            chunk_overlap=chunk_overlap
+            chunk_overlap=chunk_overlap,
+            length_function=length_function,
         )
         
         self.code_splitter = RecursiveCharacterTextSplitter(
             chunk_size=code_chunk_size,
             chunk_overlap=chunk_overlap,
+            length_function=length_function,
             separators=["\n\n", "\n", " ", ""],
         )
         
         self.table_splitter = RecursiveCharacterTextSplitter(
             chunk_size=table_chunk_size,
             chunk_overlap=chunk_overlap,
+            length_function=length_function,
             separators=["\n\n", "\n"],
         )
 
@@ -184,8 +256,16 @@ class AdaptiveTextSplitter(DocumentTextSplitter):
         """
         Split documents adaptively based on content type.
         """
-        all_chunks = []
+        all_chunks = list(self.iter_split_documents(documents))
+        
+        logger.info(f"Adaptively split into {len(all_chunks)} chunks")
         
+        return all_chunks
+
+    def iter_split_documents(self, documents: Iterable[Document]) -> Iterator[Document]:
+        """
+        Lazily split documents adaptively based on content type.
+        """
         for doc in documents:
             # Detect content type
             content_type = self._detect_content_type(doc.page_content)
@@ -201,17 +281,18 @@ class AdaptiveTextSplitter(DocumentTextSplitter):
             # Add content type to metadata
             for chunk in chunks:
                 chunk.metadata['content_type'] = content_type
-            
-            all_chunks.extend(chunks)
-        
-        logger.info(f"Adaptively split into {len(all_chunks)} chunks")
-        
-        return all_chunks
+                yield chunk
 
     def _detect_content_type(self, text: str) -> str:
         """
         Detect content type (code, table, or general text).
+        
+        Long texts are classified from their head and tail only, so the
+        cost is bounded regardless of document size.
         """
+        if len(text) > 2 * CONTENT_SAMPLE_CHARS:
+            text = text[:CONTENT_SAMPLE_CHARS] + text[-CONTENT_SAMPLE_CHARS:]
+        
         # Simple heuristics
         if '```' in text or text.count('\n    ') > 5:
             return 'code'
@@ -225,6 +306,7 @@ def create_text_splitter(
     chunk_size: int = 1000,
     chunk_overlap: int = 150,
     adaptive: bool = False,
+    length_function: callable = len,
 ) -> DocumentTextSplitter:
     """
     Factory function to create text splitter.
@@ -233,6 +315,8 @@ def create_text_splitter(
         chunk_size: Target chunk size
         chunk_overlap: Overlap between chunks
         adaptive: Use adaptive splitter
+        length_function: Function to measure chunk length (e.g. count_tokens
+            to size chunks in tokens rather than characters)
         
     Returns:
         DocumentTextSplitter instance
@@ -241,9 +325,11 @@ def create_text_splitter(
         return AdaptiveTextSplitter(
             default_chunk_size=chunk_size,
             chunk_overlap=chunk_overlap,
+            length_function=length_function,
         )
     else:
         return DocumentTextSplitter(
             chunk_size=chunk_size,
             chunk_overlap=chunk_overlap,
+            length_function=length_function,
         )
@@ -0,0 +1,41 @@
+"""
+Token counting with tiktoken.
+"""
+from functools import lru_cache
+
+import tiktoken
+
+# Encoding used when tiktoken does not recognise the model name
+DEFAULT_ENCODING = "cl100k_base"
+
+
+@lru_cache(maxsize=None)
+def get_encoding(model: str) -> tiktoken.Encoding:
+    """
+    Get the (cached) tiktoken encoding for a model.
+    
+    Args:
+        model: OpenAI model name
+        
+    Returns:
+        tiktoken Encoding instance
+    """
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding(DEFAULT_ENCODING)
+
+
+def count_tokens(text: str, model: str = "gpt-4") -> int:
+    """
+    Count tokens in text exactly as the model's tokenizer would.
+    
+    Args:
+        text: Text to count
+        model: OpenAI model name
+        
+    Returns:
+        Number of tokens
+    """
+    # Treat special-token strings in user text as plain text
+    return len(get_encoding(model).encode(text, disallowed_special=()))
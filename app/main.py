@@ -4,13 +4,18 @@ FastAPI application entry point
 
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from contextlib import asynccontextmanager
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import logging
 import time
 
 from app.config import get_settings
+from app.core.pinecone_service import get_pinecone_service
+from app.services.document_service import get_document_service
+from app.services.search_service import get_search_service
 from app.utils.logger import setup_logging
 from app.api.routes import health, documents, summarization, search
 
@@ -41,6 +46,20 @@ async def lifespan(app: FastAPI):
         logger.info("Verifying Pinecone configuration...")
         logger.info(f"Index name: {settings.pinecone_index_name}")
         
+        # Open the shared index connection pool before the first request
+        try:
+            get_pinecone_service().get_index()
+        except Exception as e:
+            logger.warning(f"Pinecone index warm-up failed, will retry on first use: {e}")
+        
+        # Build the services (clients, splitters, chains) now rather than
+        # on the first request that needs them
+        try:
+            get_document_service()
+            get_search_service()
+        except Exception as e:
+            logger.warning(f"Service warm-up failed, will retry on first use: {e}")
+        
         logger.info("Application startup complete!")
     except Exception as e:
         logger.error(f"Startup error: {str(e)}")
@@ -59,6 +78,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -72,37 +92,56 @@ app.add_middleware(
 )
 
 
-# Request logging middleware
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    """Log all incoming requests"""
-    start_time = time.time()
-    
-    # Log request
-    logger.info(f"Request: {request.method} {request.url.path}")
-    
-    # Process request
-    response = await call_next(request)
-    
-    # Calculate processing time
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
-    
-    # Log response
-    logger.info(
-        f"Response: {request.method} {request.url.path} "
-        f"Status: {response.status_code} Time: {process_time:.3f}s"
-    )
+class RequestLoggingMiddleware:
+    """
+    Log all incoming requests and add an X-Process-Time header.
     
-    return response
+    Pure ASGI middleware: avoids the per-request task and stream plumbing
+    of BaseHTTPMiddleware, and reads method/path straight from the scope.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start_time = time.perf_counter_ns()
+        log_enabled = logger.isEnabledFor(logging.INFO)
+        
+        # Log request
+        if log_enabled:
+            logger.info("Request: %s %s", scope["method"], scope["path"])
+        
+        async def send_with_process_time(message: Message):
+            if message["type"] == "http.response.start":
+                # Processing time up to the response headers, as before
+                process_time = (time.perf_counter_ns() - start_time) / 1e9
+                MutableHeaders(scope=message).append("X-Process-Time", str(process_time))
+                
+                # Log response
+                if log_enabled:
+                    logger.info(
+                        "Response: %s %s Status: %d Time: %.3fs",
+                        scope["method"], scope["path"], message["status"], process_time
+                    )
+            await send(message)
+        
+        await self.app(scope, receive, send_with_process_time)
+
+
+# Request logging middleware
+app.add_middleware(RequestLoggingMiddleware)
 
 
 # Exception handlers
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """Handle validation errors"""
-    logger.warning(f"Validation error for {request.url.path}: {exc.errors()}")
-    return JSONResponse(
+    logger.warning("Validation error for %s: %s", request.url.path, exc.errors())
+    return ORJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={
             "detail": exc.errors(),
@@ -114,8 +153,8 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle unexpected errors"""
-    logger.error(f"Unexpected error for {request.url.path}: {str(exc)}", exc_info=True)
-    return JSONResponse(
+    logger.error("Unexpected error for %s: %s", request.url.path, exc, exc_info=True)
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "message": "Internal server error",
@@ -1,7 +1,7 @@
 """
 Pydantic models for documents.
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from enum import Enum
@@ -20,13 +20,14 @@ class DocumentUpload(BaseModel):
     filename: str = Field(..., description="Original filename")
     file_type: str = Field(..., description="File type/extension")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "filename": "quarterly_report.pdf",
                 "file_type": "pdf"
             }
         }
+    )
 
 
 class DocumentMetadata(BaseModel):
@@ -42,8 +43,8 @@ class DocumentMetadata(BaseModel):
     title: Optional[str] = Field(None, description="Document title")
     author: Optional[str] = Field(None, description="Document author")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "document_id": "doc_123abc",
                 "filename": "report.pdf",
@@ -54,6 +55,7 @@ class DocumentMetadata(BaseModel):
                 "num_chunks": 25
             }
         }
+    )
 
 
 class DocumentChunk(BaseModel):
@@ -81,8 +83,8 @@ class DocumentSummary(BaseModel):
     num_chunks: Optional[int] = Field(None, description="Number of chunks processed")
     generated_at: datetime = Field(default_factory=datetime.utcnow)
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "document_id": "doc_123abc",
                 "summary": "This document discusses quarterly financial results...",
@@ -91,6 +93,7 @@ class DocumentSummary(BaseModel):
                 "generated_at": "2024-01-01T12:00:00Z"
             }
         }
+    )
 
 
 class SummarizationRequest(BaseModel):
@@ -100,14 +103,15 @@ class SummarizationRequest(BaseModel):
     length: SummaryLength = Field(default=SummaryLength.STANDARD)
     document_type: str = Field(default="general", description="Document type")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "document_id": "doc_123abc",
                 "length": "standard",
                 "document_type": "general"
             }
         }
+    )
 
 
 class BatchSummarizationRequest(BaseModel):
@@ -115,13 +119,14 @@ class BatchSummarizationRequest(BaseModel):
     document_ids: List[str] = Field(..., description="List of document IDs")
     length: SummaryLength = Field(default=SummaryLength.STANDARD)
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "document_ids": ["doc_123", "doc_456", "doc_789"],
                 "length": "brief"
             }
         }
+    )
 
 
 class DocumentListResponse(BaseModel):
@@ -131,8 +136,8 @@ class DocumentListResponse(BaseModel):
     page: int
     page_size: int
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "documents": [],
                 "total": 100,
@@ -140,3 +145,4 @@ class DocumentListResponse(BaseModel):
                 "page_size": 20
             }
         }
+    )
@@ -1,7 +1,7 @@
 """
 Pydantic models for meeting notes.
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional
 from datetime import datetime, date
 
@@ -14,8 +14,8 @@ class ActionItem(BaseModel):
     priority: str = Field(default="medium", description="Priority level")
     status: str = Field(default="pending", description="Status")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "task": "Prepare Q4 presentation",
                 "owner": "John Doe",
@@ -23,6 +23,7 @@ class ActionItem(BaseModel):
                 "priority": "high"
             }
         }
+    )
 
 
 class Decision(BaseModel):
@@ -31,14 +32,15 @@ class Decision(BaseModel):
     context: Optional[str] = Field(None, description="Context or reasoning")
     impact: Optional[str] = Field(None, description="Expected impact")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "decision": "Approved budget increase of 15%",
                 "context": "To support expanded marketing campaign",
                 "impact": "Expected 20% increase in customer acquisition"
             }
         }
+    )
 
 
 class MeetingNotes(BaseModel):
@@ -52,8 +54,8 @@ class MeetingNotes(BaseModel):
     key_points: List[str] = Field(default_factory=list)
     next_steps: List[str] = Field(default_factory=list)
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "title": "Q4 Planning Meeting",
                 "date": "2024-01-15T10:00:00Z",
@@ -64,6 +66,7 @@ class MeetingNotes(BaseModel):
                 "next_steps": ["Schedule follow-up meeting"]
             }
         }
+    )
 
 
 class MeetingExtractionRequest(BaseModel):
@@ -71,10 +74,12 @@ class MeetingExtractionRequest(BaseModel):
     text: str = Field(..., description="Meeting transcript or notes")
     meeting_title: Optional[str] = Field(None, description="Meeting title")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        defer_build=True,
+        json_schema_extra={
             "example": {
                 "text": "Meeting transcript here...",
                 "meeting_title": "Weekly Team Sync"
             }
         }
+    )
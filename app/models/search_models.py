@@ -1,7 +1,7 @@
 """
 Pydantic models for search functionality.
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
@@ -14,14 +14,15 @@ class SearchQuery(BaseModel):
     filter: Optional[Dict[str, Any]] = Field(None, description="Metadata filters")
     include_metadata: bool = Field(default=True, description="Include metadata in results")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "query": "What were the Q4 revenue targets?",
                 "top_k": 5,
                 "include_metadata": True
             }
         }
+    )
 
 
 class SearchResult(BaseModel):
@@ -31,8 +32,8 @@ class SearchResult(BaseModel):
     text: str = Field(..., description="Matched text content")
     metadata: Dict[str, Any] = Field(default_factory=dict)
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "document_id": "doc_123",
                 "score": 0.85,
@@ -40,6 +41,7 @@ class SearchResult(BaseModel):
                 "metadata": {"source": "report.pdf", "page": 3}
             }
         }
+    )
 
 
 class SearchResponse(BaseModel):
@@ -49,8 +51,8 @@ class SearchResponse(BaseModel):
     total_results: int = Field(..., description="Total number of results")
     search_time_ms: float = Field(..., description="Search time in milliseconds")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "query": "revenue targets",
                 "results": [],
@@ -58,6 +60,7 @@ class SearchResponse(BaseModel):
                 "search_time_ms": 145.2
             }
         }
+    )
 
 
 class SimilarDocumentRequest(BaseModel):
@@ -65,10 +68,12 @@ class SimilarDocumentRequest(BaseModel):
     document_id: str = Field(..., description="Document ID to find similar documents for")
     top_k: int = Field(default=5, description="Number of similar documents", ge=1, le=20)
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        defer_build=True,
+        json_schema_extra={
             "example": {
                 "document_id": "doc_123",
                 "top_k": 5
             }
         }
+    )
@@ -1,6 +1,8 @@
 """
 Prompt templates for extracting information from meeting notes and documents.
 """
+from functools import cache
+
 from langchain.prompts import PromptTemplate
 from pydantic import BaseModel, Field
 from typing import List, Optional
@@ -35,10 +37,14 @@ Meeting Transcript:
 
 Extracted Information (JSON):"""
 
-meeting_notes_prompt = PromptTemplate(
-    input_variables=["text"],
-    template=MEETING_NOTES_EXTRACTION_TEMPLATE,
-)
+
+@cache
+def meeting_notes_prompt() -> PromptTemplate:
+    """Prompt for extracting structured meeting notes."""
+    return PromptTemplate(
+        input_variables=["text"],
+        template=MEETING_NOTES_EXTRACTION_TEMPLATE,
+    )
 
 
 # Action item extraction prompt
@@ -61,10 +67,14 @@ Text:
 
 Action Items (JSON):"""
 
-action_item_prompt = PromptTemplate(
-    input_variables=["text"],
-    template=ACTION_ITEM_EXTRACTION_TEMPLATE,
-)
+
+@cache
+def action_item_prompt() -> PromptTemplate:
+    """Prompt for extracting action items."""
+    return PromptTemplate(
+        input_variables=["text"],
+        template=ACTION_ITEM_EXTRACTION_TEMPLATE,
+    )
 
 
 # Decision extraction prompt
@@ -86,27 +96,37 @@ Text:
 
 Decisions (JSON):"""
 
-decision_extraction_prompt = PromptTemplate(
-    input_variables=["text"],
-    template=DECISION_EXTRACTION_TEMPLATE,
-)
+
+@cache
+def decision_extraction_prompt() -> PromptTemplate:
+    """Prompt for extracting decisions."""
+    return PromptTemplate(
+        input_variables=["text"],
+        template=DECISION_EXTRACTION_TEMPLATE,
+    )
 
 
 # Key points extraction prompt
 KEY_POINTS_EXTRACTION_TEMPLATE = """You are an expert at identifying the most important points from text.
 
-Extract the {num_points} most important key points from the following text. 
+Extract the most important key points from the following text.
 Return them as a JSON array of strings, ordered by importance.
 
 Text:
 {text}
 
+Number of key points to extract: {num_points}
+
 Key Points (JSON array):"""
 
-key_points_prompt = PromptTemplate(
-    input_variables=["text", "num_points"],
-    template=KEY_POINTS_EXTRACTION_TEMPLATE,
-)
+
+@cache
+def key_points_prompt() -> PromptTemplate:
+    """Prompt for extracting key points."""
+    return PromptTemplate(
+        input_variables=["text", "num_points"],
+        template=KEY_POINTS_EXTRACTION_TEMPLATE,
+    )
 
 
 # Sentiment analysis prompt (optional)
@@ -131,10 +151,14 @@ Text:
 
 Sentiment Analysis (JSON):"""
 
-sentiment_analysis_prompt = PromptTemplate(
-    input_variables=["text"],
-    template=SENTIMENT_ANALYSIS_TEMPLATE,
-)
+
+@cache
+def sentiment_analysis_prompt() -> PromptTemplate:
+    """Prompt for sentiment and tone analysis."""
+    return PromptTemplate(
+        input_variables=["text"],
+        template=SENTIMENT_ANALYSIS_TEMPLATE,
+    )
 
 
 # Entity extraction prompt
@@ -163,14 +187,18 @@ Text:
 
 Extracted Entities (JSON):"""
 
-entity_extraction_prompt = PromptTemplate(
-    input_variables=["text"],
-    template=ENTITY_EXTRACTION_TEMPLATE,
-)
+
+@cache
+def entity_extraction_prompt() -> PromptTemplate:
+    """Prompt for extracting named entities."""
+    return PromptTemplate(
+        input_variables=["text"],
+        template=ENTITY_EXTRACTION_TEMPLATE,
+    )
 
 
 # Question generation prompt (for creating FAQs)
-QUESTION_GENERATION_TEMPLATE = """Based on the following document, generate {num_questions} relevant questions that it answers.
+QUESTION_GENERATION_TEMPLATE = """Based on the following document, generate relevant questions that it answers.
 
 These questions should:
 - Cover the main topics and key information
@@ -183,12 +211,30 @@ Return as a JSON array of strings:
 Document:
 {text}
 
+Number of questions to generate: {num_questions}
+
 Generated Questions (JSON):"""
 
-question_generation_prompt = PromptTemplate(
-    input_variables=["text", "num_questions"],
-    template=QUESTION_GENERATION_TEMPLATE,
-)
+
+@cache
+def question_generation_prompt() -> PromptTemplate:
+    """Prompt for generating questions a document answers."""
+    return PromptTemplate(
+        input_variables=["text", "num_questions"],
+        template=QUESTION_GENERATION_TEMPLATE,
+    )
+
+
+# Prompt factories by extraction type
+_EXTRACTION_PROMPTS = {
+    "meeting_notes": meeting_notes_prompt,
+    "action_items": action_item_prompt,
+    "decisions": decision_extraction_prompt,
+    "key_points": key_points_prompt,
+    "sentiment": sentiment_analysis_prompt,
+    "entities": entity_extraction_prompt,
+    "questions": question_generation_prompt,
+}
 
 
 def get_extraction_prompt(extraction_type: str) -> PromptTemplate:
@@ -202,14 +248,4 @@ def get_extraction_prompt(extraction_type: str) -> PromptTemplate:
     Returns:
         Appropriate PromptTemplate
     """
-    prompts = {
-        "meeting_notes": meeting_notes_prompt,
-        "action_items": action_item_prompt,
-        "decisions": decision_extraction_prompt,
-        "key_points": key_points_prompt,
-        "sentiment": sentiment_analysis_prompt,
-        "entities": entity_extraction_prompt,
-        "questions": question_generation_prompt,
-    }
-    
-    return prompts.get(extraction_type, meeting_notes_prompt)
+    return _EXTRACTION_PROMPTS.get(extraction_type, meeting_notes_prompt)()
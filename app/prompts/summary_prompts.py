@@ -1,6 +1,8 @@
 """
 Prompt templates for document summarization.
 """
+from functools import cache
+
 from langchain.prompts import PromptTemplate, ChatPromptTemplate
 from langchain.prompts.few_shot import FewShotPromptTemplate
 
@@ -15,10 +17,14 @@ Document:
 
 Brief Summary:"""
 
-brief_summary_prompt = PromptTemplate(
-    input_variables=["text"],
-    template=BRIEF_SUMMARY_TEMPLATE,
-)
+
+@cache
+def brief_summary_prompt() -> PromptTemplate:
+    """Prompt for a 2-3 sentence summary."""
+    return PromptTemplate(
+        input_variables=["text"],
+        template=BRIEF_SUMMARY_TEMPLATE,
+    )
 
 
 # Standard summary prompt template
@@ -35,10 +41,14 @@ Document:
 
 Comprehensive Summary:"""
 
-standard_summary_prompt = PromptTemplate(
-    input_variables=["text"],
-    template=STANDARD_SUMMARY_TEMPLATE,
-)
+
+@cache
+def standard_summary_prompt() -> PromptTemplate:
+    """Prompt for a standard-length summary."""
+    return PromptTemplate(
+        input_variables=["text"],
+        template=STANDARD_SUMMARY_TEMPLATE,
+    )
 
 
 # Detailed summary prompt template
@@ -56,10 +66,14 @@ Document:
 
 Detailed Summary:"""
 
-detailed_summary_prompt = PromptTemplate(
-    input_variables=["text"],
-    template=DETAILED_SUMMARY_TEMPLATE,
-)
+
+@cache
+def detailed_summary_prompt() -> PromptTemplate:
+    """Prompt for a detailed summary."""
+    return PromptTemplate(
+        input_variables=["text"],
+        template=DETAILED_SUMMARY_TEMPLATE,
+    )
 
 
 # Map-reduce summary prompts for long documents
@@ -71,10 +85,14 @@ Summarize the key points from this section concisely:
 
 Section Summary:"""
 
-map_summary_prompt = PromptTemplate(
-    input_variables=["text"],
-    template=MAP_SUMMARY_TEMPLATE,
-)
+
+@cache
+def map_summary_prompt() -> PromptTemplate:
+    """Prompt for summarizing one chunk in the map step."""
+    return PromptTemplate(
+        input_variables=["text"],
+        template=MAP_SUMMARY_TEMPLATE,
+    )
 
 
 REDUCE_SUMMARY_TEMPLATE = """You are combining multiple section summaries into a cohesive final summary.
@@ -90,10 +108,14 @@ Section Summaries:
 
 Final Combined Summary:"""
 
-reduce_summary_prompt = PromptTemplate(
-    input_variables=["text"],
-    template=REDUCE_SUMMARY_TEMPLATE,
-)
+
+@cache
+def reduce_summary_prompt() -> PromptTemplate:
+    """Prompt for combining chunk summaries in the reduce step."""
+    return PromptTemplate(
+        input_variables=["text"],
+        template=REDUCE_SUMMARY_TEMPLATE,
+    )
 
 
 # Technical document summary template
@@ -111,10 +133,14 @@ Document:
 
 Technical Summary:"""
 
-technical_summary_prompt = PromptTemplate(
-    input_variables=["text"],
-    template=TECHNICAL_SUMMARY_TEMPLATE,
-)
+
+@cache
+def technical_summary_prompt() -> PromptTemplate:
+    """Prompt for summarizing technical documents."""
+    return PromptTemplate(
+        input_variables=["text"],
+        template=TECHNICAL_SUMMARY_TEMPLATE,
+    )
 
 
 # Few-shot examples for better summarization
@@ -134,13 +160,36 @@ summary_example_template = PromptTemplate(
     template="Document: {text}\nSummary: {summary}",
 )
 
-few_shot_summary_prompt = FewShotPromptTemplate(
-    examples=summary_examples,
-    example_prompt=summary_example_template,
-    prefix="You are an expert at creating concise, informative summaries. Here are some examples:\n",
-    suffix="\nNow create a summary for this document:\n\nDocument: {text}\nSummary:",
-    input_variables=["text"],
-)
+
+@cache
+def few_shot_summary_prompt() -> PromptTemplate:
+    """Prompt that shows example summaries before the document."""
+    few_shot_template = FewShotPromptTemplate(
+        examples=summary_examples,
+        example_prompt=summary_example_template,
+        prefix="You are an expert at creating concise, informative summaries. Here are some examples:\n",
+        suffix="\nNow create a summary for this document:\n\nDocument: {text}\nSummary:",
+        input_variables=["text"],
+    )
+    # The examples are fixed, so render them once into a plain template
+    # instead of re-formatting every example on each call
+    return PromptTemplate(
+        input_variables=["text"],
+        template=few_shot_template.format(text="{text}"),
+    )
+
+
+# Prompt factories: document type takes precedence over length
+_SUMMARY_PROMPTS_BY_TYPE = {
+    "technical": technical_summary_prompt,
+    "few-shot": few_shot_summary_prompt,
+}
+
+_SUMMARY_PROMPTS_BY_LENGTH = {
+    "brief": brief_summary_prompt,
+    "standard": standard_summary_prompt,
+    "detailed": detailed_summary_prompt,
+}
 
 
 def get_summary_prompt(length: str = "standard", document_type: str = "general") -> PromptTemplate:
@@ -154,15 +203,8 @@ def get_summary_prompt(length: str = "standard", document_type: str = "general")
     Returns:
         Appropriate PromptTemplate
     """
-    if document_type == "technical":
-        return technical_summary_prompt
-    
-    if document_type == "few-shot":
-        return few_shot_summary_prompt
+    prompt_factory = _SUMMARY_PROMPTS_BY_TYPE.get(document_type)
+    if prompt_factory is None:
+        prompt_factory = _SUMMARY_PROMPTS_BY_LENGTH.get(length, standard_summary_prompt)
     
-    if length == "brief":
-        return brief_summary_prompt
-    elif length == "detailed":
-        return detailed_summary_prompt
-    else:
-        return standard_summary_prompt
+    return prompt_factory()
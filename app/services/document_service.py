@@ -1,16 +1,22 @@
 """
 Document management service.
 """
+import asyncio
 import logging
+import threading
 import uuid
 from typing import List, Optional, Dict, Any
 from pathlib import Path
 from datetime import datetime
 
+from langchain.schema import Document
+
 from app.core.document_loader import create_document_loader
 from app.core.text_splitter import create_text_splitter
+from app.core.tokenizer import count_tokens
 from app.core.embeddings_service import create_embeddings_service
-from app.core.pinecone_service import create_pinecone_service
+from app.core.pinecone_service import get_pinecone_service
+from app.services.document_store import create_document_store
 from app.models.document_models import DocumentMetadata, DocumentStatus, DocumentChunk
 from app.config import get_settings
 
@@ -23,13 +29,15 @@ class DocumentService:
 
     def __init__(self):
         self.document_loader = create_document_loader()
+        # chunk_size and chunk_overlap are configured in tokens
         self.text_splitter = create_text_splitter(
             chunk_size=settings.chunk_size,
-            chunk_overlap=settings.chunk_overlap
+            chunk_overlap=settings.chunk_overlap,
+            length_function=count_tokens,
         )
         self.embeddings_service = create_embeddings_service()
-        self.pinecone_service = create_pinecone_service()
-        self.documents_db: Dict[str, DocumentMetadata] = {}  # In-memory storage
+        self.pinecone_service = get_pinecone_service()
+        self.document_store = create_document_store()
 
     async def upload_and_process_document(
         self,
@@ -60,7 +68,7 @@ class DocumentService:
                 status=DocumentStatus.PROCESSING
             )
             
-            self.documents_db[document_id] = metadata
+            self.document_store.put(metadata)
             
             # Load document
             documents = self.document_loader.load_from_bytes(
@@ -84,12 +92,11 @@ class DocumentService:
                 chunk.metadata["id"] = f"{document_id}_chunk_{i}"
             
             # Generate embeddings and store in Pinecone
-            vectors = self.embeddings_service.embed_documents(chunks)
-            self.pinecone_service.upsert(vectors=vectors)
+            await self._embed_and_upsert(chunks)
             
             # Update status
             metadata.status = DocumentStatus.COMPLETED
-            self.documents_db[document_id] = metadata
+            self.document_store.put(metadata)
             
             logger.info(f"Processed document {document_id}: {metadata.num_chunks} chunks")
             
@@ -97,13 +104,51 @@ class DocumentService:
             
         except Exception as e:
             logger.error(f"Error processing document: {e}")
-            if document_id in self.documents_db:
-                self.documents_db[document_id].status = DocumentStatus.FAILED
+            failed = self.document_store.get(document_id)
+            if failed is not None:
+                failed.status = DocumentStatus.FAILED
+                self.document_store.put(failed)
             raise
 
+    async def _embed_and_upsert(self, chunks: List[Document]):
+        """
+        Embed chunks in batches and upsert each batch as soon as it is ready.
+        
+        Embedding and upserting both block on network I/O, so they run in
+        worker threads and later batches embed while earlier ones upload.
+        
+        Args:
+            chunks: Chunk documents with IDs set in their metadata
+        """
+        batch_size = self.embeddings_service.batch_size
+        semaphore = asyncio.Semaphore(settings.embedding_max_concurrency)
+        
+        async def _embed_batch(batch: List[Document]) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await asyncio.to_thread(self.embeddings_service.embed_documents, batch)
+        
+        embed_tasks = [
+            _embed_batch(chunks[start:start + batch_size])
+            for start in range(0, len(chunks), batch_size)
+        ]
+        upsert_tasks = []
+        try:
+            for next_batch in asyncio.as_completed(embed_tasks):
+                vectors = await next_batch
+                upsert_tasks.append(asyncio.ensure_future(
+                    asyncio.to_thread(self.pinecone_service.upsert, vectors=vectors)
+                ))
+        finally:
+            # Let in-flight upserts finish (or fail) before reporting
+            results = await asyncio.gather(*upsert_tasks, return_exceptions=True)
+        
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+
     async def get_document(self, document_id: str) -> Optional[DocumentMetadata]:
         """Get document metadata by ID."""
-        return self.documents_db.get(document_id)
+        return self.document_store.get(document_id)
 
     async def delete_document(self, document_id: str) -> bool:
         """
@@ -116,7 +161,7 @@ class DocumentService:
             True if deleted successfully
         """
         try:
-            if document_id not in self.documents_db:
+            if self.document_store.get(document_id) is None:
                 return False
             
             # Delete from Pinecone (filter by document_id in metadata)
@@ -125,7 +170,7 @@ class DocumentService:
             )
             
             # Delete from local storage
-            del self.documents_db[document_id]
+            self.document_store.delete(document_id)
             
             logger.info(f"Deleted document {document_id}")
             return True
@@ -137,24 +182,38 @@ class DocumentService:
     async def list_documents(
         self,
         skip: int = 0,
-        limit: int = 20
+        limit: int = 20,
+        cursor: Optional[str] = None
     ) -> List[DocumentMetadata]:
-        """List all documents with pagination."""
-        all_docs = list(self.documents_db.values())
-        return all_docs[skip:skip + limit]
+        """
+        List documents with pagination.
+        
+        Args:
+            skip: Number of documents to skip (offset pagination)
+            limit: Maximum number of documents to return
+            cursor: Last document ID of the previous page (keyset pagination
+                in the same insertion order; takes precedence over skip)
+            
+        Returns:
+            Page of document metadata
+        """
+        return self.document_store.list(skip=skip, limit=limit, cursor=cursor)
 
     async def get_document_count(self) -> int:
         """Get total document count."""
-        return len(self.documents_db)
+        return self.document_store.count()
 
 
 # Global service instance
 _document_service: Optional[DocumentService] = None
+_document_service_lock = threading.Lock()
 
 
 def get_document_service() -> DocumentService:
     """Get or create document service instance."""
     global _document_service
     if _document_service is None:
-        _document_service = DocumentService()
+        with _document_service_lock:
+            if _document_service is None:
+                _document_service = DocumentService()
     return _document_service
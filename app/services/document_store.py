@@ -0,0 +1,200 @@
+"""
+Storage backends for document metadata.
+"""
+import logging
+import sqlite3
+import threading
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from app.models.document_models import DocumentMetadata
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class InMemoryDocumentStore:
+    """
+    Process-local document metadata store.
+    
+    Documents are kept in insertion order with an increasing sequence
+    number, so offset pages are a list slice and a cursor page starts after
+    the cursor document's position, found by bisecting the sequence numbers.
+    """
+
+    def __init__(self):
+        self._documents: Dict[str, DocumentMetadata] = {}
+        self._seq: Dict[str, int] = {}  # Insertion sequence number per ID
+        self._doc_order: List[str] = []  # IDs in insertion order
+        self._seqs: List[int] = []  # Sequence numbers, parallel to _doc_order
+        self._next_seq = 0
+
+    def put(self, metadata: DocumentMetadata):
+        """Insert or replace a document's metadata."""
+        document_id = metadata.document_id
+        if document_id not in self._documents:
+            self._seq[document_id] = self._next_seq
+            self._doc_order.append(document_id)
+            self._seqs.append(self._next_seq)
+            self._next_seq += 1
+        self._documents[document_id] = metadata
+
+    def get(self, document_id: str) -> Optional[DocumentMetadata]:
+        """Get a document's metadata, or None if it is unknown."""
+        return self._documents.get(document_id)
+
+    def delete(self, document_id: str) -> bool:
+        """Remove a document, returning whether it existed."""
+        if self._documents.pop(document_id, None) is None:
+            return False
+
+        idx = bisect_left(self._seqs, self._seq.pop(document_id))
+        del self._doc_order[idx]
+        del self._seqs[idx]
+        return True
+
+    def list(
+        self,
+        skip: int = 0,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> List[DocumentMetadata]:
+        """
+        List documents in insertion order.
+        
+        `cursor` is the last document ID of the previous page and takes
+        precedence over `skip`; an unknown cursor gives an empty page.
+        """
+        if cursor is not None:
+            seq = self._seq.get(cursor)
+            if seq is None:
+                return []
+            skip = bisect_right(self._seqs, seq)
+        page_ids = self._doc_order[skip:skip + limit]
+        return [self._documents[doc_id] for doc_id in page_ids]
+
+    def count(self) -> int:
+        """Number of stored documents."""
+        return len(self._documents)
+
+
+class SQLiteDocumentStore:
+    """
+    Document metadata store backed by a SQLite file.
+
+    Only the pages being served are held in memory, and metadata survives
+    restarts. The database runs in WAL mode so reads don't block on writes
+    from other worker processes.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize SQLite document store.
+
+        Args:
+            path: Database file path
+        """
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            # seq keeps insertion order for both offset and keyset
+            # pagination; the unique index on document_id serves lookups,
+            # including resolving a cursor to its seq
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS documents ("
+                "seq INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "document_id TEXT NOT NULL UNIQUE, "
+                "data BLOB NOT NULL)"
+            )
+
+        logger.info(f"Opened document store at {path}")
+
+    def put(self, metadata: DocumentMetadata):
+        """Insert or replace a document's metadata."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO documents (document_id, data) VALUES (?, ?) "
+                "ON CONFLICT(document_id) DO UPDATE SET data = excluded.data",
+                (metadata.document_id, metadata.model_dump_json()),
+            )
+
+    def get(self, document_id: str) -> Optional[DocumentMetadata]:
+        """Get a document's metadata, or None if it is unknown."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM documents WHERE document_id = ?", (document_id,)
+            ).fetchone()
+        return DocumentMetadata.model_validate_json(row[0]) if row else None
+
+    def delete(self, document_id: str) -> bool:
+        """Remove a document, returning whether it existed."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM documents WHERE document_id = ?", (document_id,)
+            )
+        return cursor.rowcount > 0
+
+    def list(
+        self,
+        skip: int = 0,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> List[DocumentMetadata]:
+        """
+        List documents in insertion order.
+        
+        `cursor` is the last document ID of the previous page and takes
+        precedence over `skip`; an unknown cursor gives an empty page.
+        """
+        with self._lock:
+            if cursor is not None:
+                rows = self._conn.execute(
+                    "SELECT data FROM documents "
+                    "WHERE seq > (SELECT seq FROM documents WHERE document_id = ?) "
+                    "ORDER BY seq LIMIT ?",
+                    (cursor, limit),
+                ).fetchall()
+            else:
+                rows = self._conn.execute(
+                    "SELECT data FROM documents ORDER BY seq LIMIT ? OFFSET ?",
+                    (limit, skip),
+                ).fetchall()
+        return [DocumentMetadata.model_validate_json(data) for (data,) in rows]
+
+    def count(self) -> int:
+        """Number of stored documents."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def create_document_store(
+    backend: Optional[str] = None,
+    path: Optional[str] = None,
+):
+    """
+    Factory function to create a document metadata store.
+
+    Args:
+        backend: 'memory' or 'sqlite' (defaults to settings)
+        path: SQLite database path (defaults to settings)
+
+    Returns:
+        InMemoryDocumentStore or SQLiteDocumentStore instance
+    """
+    backend = (backend or settings.document_store_backend).lower()
+    if backend == "sqlite":
+        return SQLiteDocumentStore(path or settings.document_store_path)
+    if backend != "memory":
+        logger.warning(f"Unknown document store backend '{backend}', using memory")
+    return InMemoryDocumentStore()
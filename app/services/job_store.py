@@ -0,0 +1,134 @@
+"""
+Storage backends for batch job progress.
+"""
+import logging
+from typing import Any, Dict, Optional
+
+import orjson
+from cachetools import TTLCache
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class InMemoryJobStore:
+    """
+    Process-local job store.
+
+    Jobs expire `ttl` seconds after creation, and the oldest are evicted
+    beyond `max_jobs`, so finished jobs don't accumulate forever.
+    """
+
+    def __init__(self, ttl: float, max_jobs: int = 10_000):
+        self._jobs: TTLCache = TTLCache(maxsize=max_jobs, ttl=ttl)
+
+    async def create(self, job_id: str, job: Dict[str, Any]):
+        """Store a new job; `results` starts empty and `completed` at 0."""
+        self._jobs[job_id] = {**job, "completed": 0, "results": []}
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job with its results so far, or None if unknown."""
+        return self._jobs.get(job_id)
+
+    async def set_status(self, job_id: str, status: str):
+        """Update a job's status."""
+        job = self._jobs.get(job_id)
+        if job is not None:
+            job["status"] = status
+
+    async def add_result(self, job_id: str, result: Dict[str, Any]):
+        """Append one document's result and advance the completed count."""
+        job = self._jobs.get(job_id)
+        if job is not None:
+            job["results"].append(result)
+            job["completed"] += 1
+
+
+class RedisJobStore:
+    """
+    Job store shared by all workers through Redis.
+
+    Each job is a hash of its scalar fields plus a list of results, both
+    with a `ttl` expiry. Results are appended with RPUSH and counted with
+    HINCRBY in one transaction, so concurrent writers never
+    read-modify-write the job.
+    """
+
+    KEY_PREFIX = "workplace:jobs:"
+
+    def __init__(self, ttl: int):
+        # Optional dependency, only needed for the shared backend
+        import redis.asyncio as aioredis
+
+        self.ttl = ttl
+        self._redis = aioredis.Redis(
+            host=settings.redis_host,
+            port=settings.redis_port,
+            db=settings.redis_db,
+            password=settings.redis_password,
+        )
+
+    def _keys(self, job_id: str):
+        key = f"{self.KEY_PREFIX}{job_id}"
+        return key, f"{key}:results"
+
+    async def create(self, job_id: str, job: Dict[str, Any]):
+        """Store a new job; `results` starts empty and `completed` at 0."""
+        key, _ = self._keys(job_id)
+        fields = {name: orjson.dumps(value) for name, value in job.items()}
+        fields["completed"] = 0
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping=fields)
+            pipe.expire(key, self.ttl)
+            await pipe.execute()
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job with its results so far, or None if unknown."""
+        key, results_key = self._keys(job_id)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hgetall(key)
+            pipe.lrange(results_key, 0, -1)
+            fields, results = await pipe.execute()
+
+        if not fields:
+            return None
+
+        job = {name.decode(): orjson.loads(value) for name, value in fields.items()}
+        job["results"] = [orjson.loads(result) for result in results]
+        return job
+
+    async def set_status(self, job_id: str, status: str):
+        """Update a job's status."""
+        key, _ = self._keys(job_id)
+        await self._redis.hset(key, "status", orjson.dumps(status))
+
+    async def add_result(self, job_id: str, result: Dict[str, Any]):
+        """Append one document's result and advance the completed count."""
+        key, results_key = self._keys(job_id)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.rpush(results_key, orjson.dumps(result))
+            pipe.expire(results_key, self.ttl)
+            pipe.hincrby(key, "completed", 1)
+            await pipe.execute()
+
+
+def create_job_store(backend: Optional[str] = None, ttl: Optional[int] = None):
+    """
+    Factory function to create a job store.
+
+    Args:
+        backend: 'memory' or 'redis' (defaults to settings)
+        ttl: Seconds a job is kept after creation (defaults to settings)
+
+    Returns:
+        InMemoryJobStore or RedisJobStore instance
+    """
+    backend = (backend or settings.job_store_backend).lower()
+    ttl = ttl or settings.job_ttl
+    if backend == "redis":
+        return RedisJobStore(ttl)
+    if backend != "memory":
+        logger.warning(f"Unknown job store backend '{backend}', using memory")
+    return InMemoryJobStore(ttl)
@@ -1,13 +1,19 @@
 """
 Search service for semantic search.
 """
+import asyncio
 import logging
+import threading
 import time
-from typing import List, Dict, Any
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
 
-from app.core.pinecone_service import create_pinecone_service
+import numpy as np
+from cachetools import LRUCache
+
+from app.core.pinecone_service import get_pinecone_service
 from app.core.embeddings_service import create_embeddings_service
 from app.chains.qa_chain import create_qa_chain
+from app.services.semantic_cache import create_semantic_cache
 from app.models.search_models import SearchResult
 from app.config import get_settings
 
@@ -15,20 +21,105 @@ logger = logging.getLogger(__name__)
 settings = get_settings()
 
 
+def _to_search_result(match: Dict[str, Any]) -> SearchResult:
+    """
+    Build a search result from a Pinecone match.
+    
+    The chunk text is moved out of the metadata so it isn't returned twice.
+    Matches may be shared through the query cache, so the metadata is copied
+    rather than modified in place.
+    """
+    metadata = match.get('metadata') or {}
+    text = metadata.get('text', '')
+    if 'text' in metadata:
+        metadata = {key: value for key, value in metadata.items() if key != 'text'}
+    
+    # Pinecone data is trusted, so skip validation
+    return SearchResult.model_construct(
+        document_id=match.get('id', ''),
+        score=match.get('score', 0.0),
+        text=text,
+        metadata=metadata
+    )
+
+
 class SearchService:
     """Service for semantic search operations."""
 
     def __init__(self):
-        self.pinecone_service = create_pinecone_service()
+        self.pinecone_service = get_pinecone_service()
         self.embeddings_service = create_embeddings_service()
         self.qa_chain = create_qa_chain()
+        
+        # (top_k, results, answer) for past RAG questions, matched by query
+        # embedding. Dropped whenever indexed vectors change, since answers
+        # may then cite removed or miss newly added documents.
+        self.answer_cache = create_semantic_cache(threshold=settings.answer_cache_threshold)
+        self.pinecone_service.add_invalidation_listener(self._on_vectors_changed)
+        
+        # Query embeddings requested within one batching window are sent
+        # to the embeddings API together
+        self._pending_queries: List[Tuple[str, asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        
+        # Embeddings of recent query strings, so repeats skip the embedding
+        # service entirely
+        self._recent_embeddings: LRUCache = LRUCache(maxsize=1024)
+        
+        # int8 codes and scale of vectors fetched for similar-document
+        # lookups, a quarter of the float32 size
+        self._document_vectors: LRUCache = LRUCache(maxsize=4096)
+
+    def _on_vectors_changed(self, namespace: str):
+        """Drop cached RAG answers after an upsert or delete."""
+        # Answers are not keyed by namespace, so any change clears them all
+        self.answer_cache.clear()
+        logger.debug(f"Cleared answer cache after vectors changed in '{namespace}'")
+
+    async def _embed_query(self, query: str) -> np.ndarray:
+        """Embed a query, coalescing with concurrent searches."""
+        embedding = self._recent_embeddings.get(query)
+        if embedding is not None:
+            return embedding
+        
+        future = asyncio.get_running_loop().create_future()
+        self._pending_queries.append((query, future))
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_pending_queries())
+        embedding = await future
+        self._recent_embeddings[query] = embedding
+        return embedding
+
+    async def _flush_pending_queries(self):
+        """Embed every query queued during the batching window in one call."""
+        await asyncio.sleep(settings.search_batch_window_ms / 1000)
+        pending, self._pending_queries = self._pending_queries, []
+        self._flush_task = None
+        
+        try:
+            embeddings = await self.embeddings_service.aembed_texts(
+                [query for query, _ in pending]
+            )
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        if len(pending) > 1:
+            logger.debug(f"Embedded {len(pending)} coalesced search queries")
+        for (_, future), embedding in zip(pending, embeddings):
+            if not future.done():
+                future.set_result(embedding)
 
     async def search(
         self,
         query: str,
         top_k: int = 5,
         namespace: str = "",
-        filter: Dict[str, Any] = None
+        filter: Dict[str, Any] = None,
+        threshold: Optional[float] = None,
+        query_embedding: Optional[np.ndarray] = None
     ) -> Dict[str, Any]:
         """
         Perform semantic search.
@@ -38,78 +129,112 @@ class SearchService:
             top_k: Number of results
             namespace: Pinecone namespace
             filter: Metadata filters
+            threshold: Minimum similarity score; lower-scoring matches are
+                dropped before results are built
+            query_embedding: Precomputed embedding of `query`, if the caller
+                already has one
             
         Returns:
             Search results with timing
         """
         try:
-            start_time = time.time()
+            start_ns = time.perf_counter_ns()
             
-            # Generate query embedding
-            query_embedding = self.embeddings_service.embed_text(query)
+            # Generate query embedding (batched with concurrent searches)
+            if query_embedding is None:
+                query_embedding = await self._embed_query(query)
             
-            # Search in Pinecone
-            matches = self.pinecone_service.query(
-                query_vector=query_embedding,
-                top_k=top_k,
-                namespace=namespace,
-                filter=filter,
-                include_metadata=True
+            return await self._search_by_embedding(
+                query, query_embedding, start_ns, top_k, namespace, filter, threshold
             )
             
-            # Format results
-            results = []
-            for match in matches:
-                result = SearchResult(
-                    document_id=match.get('id', ''),
-                    score=match.get('score', 0.0),
-                    text=match.get('metadata', {}).get('text', ''),
-                    metadata=match.get('metadata', {})
-                )
-                results.append(result)
-            
-            search_time_ms = (time.time() - start_time) * 1000
-            
-            logger.info(f"Search completed: {len(results)} results in {search_time_ms:.2f}ms")
-            
-            return {
-                "query": query,
-                "results": results,
-                "total_results": len(results),
-                "search_time_ms": search_time_ms
-            }
-            
         except Exception as e:
             logger.error(f"Error performing search: {e}")
             raise
 
+    async def _search_by_embedding(
+        self,
+        query: str,
+        query_embedding: np.ndarray,
+        start_ns: int,
+        top_k: int = 5,
+        namespace: str = "",
+        filter: Dict[str, Any] = None,
+        threshold: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Run the Pinecone part of a search for an already embedded query."""
+        # Search in Pinecone, off the event loop so concurrent searches'
+        # requests overlap
+        matches = await asyncio.to_thread(
+            self.pinecone_service.query,
+            query_vector=query_embedding,
+            top_k=top_k,
+            namespace=namespace,
+            filter=filter,
+            include_metadata=True
+        )
+        
+        # Pinecone has no score cutoff, so drop weak matches right away
+        if threshold is not None:
+            matches = [m for m in matches if m.get('score', 0.0) >= threshold]
+        
+        results = [_to_search_result(match) for match in matches]
+        
+        search_time_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
+        
+        logger.info(f"Search completed: {len(results)} results in {search_time_ms:.2f}ms")
+        
+        return {
+            "query": query,
+            "results": results,
+            "total_results": len(results),
+            "search_time_ms": search_time_ms
+        }
+
     async def search_with_answer(
         self,
         query: str,
-        top_k: int = 5
+        top_k: int = 5,
+        query_embedding: Optional[np.ndarray] = None
     ) -> Dict[str, Any]:
         """
         Search and generate answer using RAG.
         
+        Near-duplicate questions are answered from the semantic answer
+        cache, skipping both the Pinecone query and the LLM call.
+        
         Args:
             query: Search query
             top_k: Number of results to retrieve
+            query_embedding: Precomputed embedding of `query`, if the caller
+                already has one
             
         Returns:
             Search results with generated answer
         """
         try:
-            # Perform search
-            search_results = await self.search(query, top_k)
+            start_ns = time.perf_counter_ns()
+            if query_embedding is None:
+                query_embedding = await self._embed_query(query)
             
-            # Prepare context from search results
-            context_parts = []
-            for i, result in enumerate(search_results["results"]):
-                context_parts.append(
-                    f"[Source {i+1}] {result.text}"
-                )
+            cached = self.answer_cache.get(query_embedding)
+            if cached is not None and cached[0] == top_k:
+                _, results, answer = cached
+                return {
+                    "query": query,
+                    "results": results,
+                    "total_results": len(results),
+                    "search_time_ms": (time.perf_counter_ns() - start_ns) / 1_000_000,
+                    "answer": answer
+                }
             
-            context = "\n\n".join(context_parts)
+            # Perform search with the embedding computed above
+            search_results = await self._search_by_embedding(
+                query, query_embedding, start_ns, top_k
+            )
+            
+            # Prepare context from search results
+            context = self._build_context(search_results["results"])
             
             # Generate answer
             answer_result = self.qa_chain.answer_question(
@@ -118,6 +243,10 @@ class SearchService:
                 include_sources=True
             )
             
+            self.answer_cache.put(
+                query_embedding, (top_k, search_results["results"], answer_result["answer"])
+            )
+            
             return {
                 **search_results,
                 "answer": answer_result["answer"]
@@ -127,6 +256,62 @@ class SearchService:
             logger.error(f"Error in search with answer: {e}")
             raise
 
+    async def stream_answer(
+        self,
+        query: str,
+        top_k: int = 5
+    ) -> AsyncIterator[str]:
+        """
+        Search and stream the generated RAG answer as it is produced.
+        
+        Args:
+            query: Search query
+            top_k: Number of results to retrieve
+            
+        Yields:
+            Answer text chunks
+        """
+        search_results = await self.search(query, top_k)
+        context = self._build_context(search_results["results"])
+        
+        async for chunk in self.qa_chain.astream_answer(
+            question=query,
+            context=context,
+            include_sources=True
+        ):
+            yield chunk
+
+    def _build_context(self, results: List[SearchResult]) -> str:
+        """Format search results as numbered sources for the QA prompt."""
+        return "\n\n".join(
+            f"[Source {i+1}] {result.text}"
+            for i, result in enumerate(results)
+        )
+
+    def _get_document_vector(self, document_id: str) -> np.ndarray:
+        """
+        Get a stored document vector, fetching it from Pinecone on a miss.
+        
+        Args:
+            document_id: Vector ID
+            
+        Returns:
+            Document embedding as float32 (dequantized when cached)
+        """
+        cached = self._document_vectors.get(document_id)
+        if cached is not None:
+            codes, scale = cached
+            return codes.astype(np.float32) * scale
+        
+        vectors = self.pinecone_service.fetch([document_id])
+        if not vectors:
+            raise ValueError(f"Document {document_id} not found")
+        
+        vector = np.asarray(vectors[document_id]['values'], dtype=np.float32)
+        scale = float(np.abs(vector).max()) / 127 or 1.0
+        self._document_vectors[document_id] = (np.round(vector / scale).astype(np.int8), scale)
+        return vector
+
     async def find_similar_documents(
         self,
         document_id: str,
@@ -143,37 +328,25 @@ class SearchService:
             List of similar documents
         """
         try:
-            # Fetch document vectors from Pinecone
-            vectors = self.pinecone_service.fetch([document_id])
-            
-            if not vectors:
-                raise ValueError(f"Document {document_id} not found")
-            
-            # Get the embedding
-            doc_vector = vectors[document_id]['values']
+            doc_vector = self._get_document_vector(document_id)
             
-            # Search for similar vectors
+            # Query unfiltered for one extra match and drop the source
+            # document here. A per-document filter would give every call its
+            # own query cache bucket and evict the ones searches use.
             matches = self.pinecone_service.query(
                 query_vector=doc_vector,
-                top_k=top_k + 1,  # +1 to exclude the document itself
+                top_k=top_k + 1,
                 include_metadata=True
             )
             
-            # Filter out the source document and format results
-            results = []
-            for match in matches:
-                if match['id'] != document_id:
-                    result = SearchResult(
-                        document_id=match['id'],
-                        score=match['score'],
-                        text=match.get('metadata', {}).get('text', ''),
-                        metadata=match.get('metadata', {})
-                    )
-                    results.append(result)
+            results = [
+                _to_search_result(match) for match in matches
+                if match.get('id') != document_id
+            ][:top_k]
             
             logger.info(f"Found {len(results)} similar documents to {document_id}")
             
-            return results[:top_k]
+            return results
             
         except Exception as e:
             logger.error(f"Error finding similar documents: {e}")
@@ -181,12 +354,15 @@ class SearchService:
 
 
 # Global service instance
-_search_service = None
+_search_service: Optional[SearchService] = None
+_search_service_lock = threading.Lock()
 
 
 def get_search_service() -> SearchService:
     """Get or create search service instance."""
     global _search_service
     if _search_service is None:
-        _search_service = SearchService()
+        with _search_service_lock:
+            if _search_service is None:
+                _search_service = SearchService()
     return _search_service
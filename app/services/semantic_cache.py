@@ -0,0 +1,206 @@
+"""
+Semantic cache for reusing responses to near-duplicate queries.
+"""
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class SemanticCache:
+    """
+    In-process cache keyed by embedding similarity.
+
+    Embeddings are L2-normalized and stored in a preallocated float32 matrix,
+    so a lookup is a single inner-product scan. Entries expire after a TTL and
+    the least recently used entry is evicted once the cache is full.
+
+    With `quantize`, rows are stored as int8 with a per-row scale, a quarter
+    of the memory, at the cost of a dequantizing scan on lookup.
+    """
+
+    def __init__(
+        self,
+        dimension: int = 1536,
+        threshold: float = 0.90,
+        max_size: int = 5000,
+        ttl: float = 3600.0,
+        quantize: bool = False,
+    ):
+        """
+        Initialize semantic cache.
+
+        Args:
+            dimension: Embedding dimension
+            threshold: Minimum cosine similarity for a cache hit
+            max_size: Maximum number of cached entries
+            ttl: Entry time-to-live in seconds
+            quantize: Store embeddings as int8 instead of float32
+        """
+        self.dimension = dimension
+        self.threshold = threshold
+        self.max_size = max_size
+        self.ttl = ttl
+        self.quantize = quantize
+
+        if quantize:
+            self._vectors = np.zeros((max_size, dimension), dtype=np.int8)
+            self._scales = np.zeros(max_size, dtype=np.float32)
+        else:
+            self._vectors = np.zeros((max_size, dimension), dtype=np.float32)
+        self._values: List[Any] = [None] * max_size
+        self._created = np.zeros(max_size, dtype=np.float64)
+        self._last_access = np.zeros(max_size, dtype=np.float64)
+        self._hit_counts = np.zeros(max_size, dtype=np.int64)
+        self._occupied = np.zeros(max_size, dtype=bool)
+        self._size = 0  # High-water mark of used slots
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def _normalize(self, embedding: Sequence[float]) -> np.ndarray:
+        """Convert an embedding to a unit-length float32 vector."""
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def _scores(self, query: np.ndarray) -> np.ndarray:
+        """Cosine similarity of the query against every slot in use."""
+        if not self.quantize:
+            return self._vectors[:self._size] @ query
+        # Dequantize then use the float32 BLAS product; NumPy's integer
+        # matmul is several times slower than the conversion
+        return (self._vectors[:self._size].astype(np.float32) @ query) * self._scales[:self._size]
+
+    def _live_mask(self, now: float) -> np.ndarray:
+        """Mask of occupied, unexpired slots within the high-water mark."""
+        return self._occupied[:self._size] & (now - self._created[:self._size] < self.ttl)
+
+    def get(self, embedding: Sequence[float]) -> Optional[Any]:
+        """
+        Look up the cached value for the most similar embedding.
+
+        Args:
+            embedding: Query embedding
+
+        Returns:
+            Cached value if similarity meets the threshold, otherwise None
+        """
+        query = self._normalize(embedding)
+        now = time.monotonic()
+
+        with self._lock:
+            live = self._live_mask(now)
+            if not live.any():
+                self.misses += 1
+                return None
+
+            scores = self._scores(query)
+            scores[~live] = -np.inf
+            idx = int(np.argmax(scores))
+
+            if scores[idx] < self.threshold:
+                self.misses += 1
+                return None
+
+            self._last_access[idx] = now
+            self._hit_counts[idx] += 1
+            self.hits += 1
+
+            logger.debug(f"Semantic cache hit (similarity: {scores[idx]:.3f})")
+            return self._values[idx]
+
+    def put(self, embedding: Sequence[float], value: Any):
+        """
+        Store a value under an embedding.
+
+        Args:
+            embedding: Query embedding
+            value: Value to cache
+        """
+        vector = self._normalize(embedding)
+        now = time.monotonic()
+
+        with self._lock:
+            slot = self._free_slot(now)
+
+            if self.quantize:
+                scale = float(np.abs(vector).max()) / 127 or 1.0
+                self._vectors[slot] = np.round(vector / scale)
+                self._scales[slot] = scale
+            else:
+                self._vectors[slot] = vector
+            self._values[slot] = value
+            self._created[slot] = now
+            self._last_access[slot] = now
+            self._hit_counts[slot] = 0
+            self._occupied[slot] = True
+            self._size = max(self._size, slot + 1)
+
+    def _free_slot(self, now: float) -> int:
+        """Pick a slot to write: expired, then unused, then least recently used."""
+        if self._size:
+            expired = np.flatnonzero(~self._live_mask(now))
+            if expired.size:
+                return int(expired[0])
+
+        if self._size < self.max_size:
+            return self._size
+
+        return int(np.argmin(self._last_access))
+
+    def clear(self):
+        """Remove all cached entries."""
+        with self._lock:
+            self._occupied[:] = False
+            self._values = [None] * self.max_size
+            self._size = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._live_mask(time.monotonic()).sum())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        total = self.hits + self.misses
+        return {
+            "size": len(self),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+def create_semantic_cache(
+    dimension: Optional[int] = None,
+    threshold: Optional[float] = None,
+    max_size: Optional[int] = None,
+    ttl: Optional[float] = None,
+) -> SemanticCache:
+    """
+    Factory function to create a semantic cache.
+
+    Args:
+        dimension: Embedding dimension (defaults to settings)
+        threshold: Cosine similarity threshold (defaults to settings)
+        max_size: Maximum entries (defaults to settings)
+        ttl: Entry TTL in seconds (defaults to settings)
+
+    Returns:
+        SemanticCache instance
+    """
+    return SemanticCache(
+        dimension=dimension or settings.pinecone_dimension,
+        threshold=threshold if threshold is not None else settings.semantic_cache_threshold,
+        max_size=max_size or settings.semantic_cache_max_size,
+        ttl=ttl or settings.semantic_cache_ttl,
+    )
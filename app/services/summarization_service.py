@@ -1,12 +1,27 @@
 """
 Summarization service.
 """
+import asyncio
 import logging
-from typing import Dict, List, Any
+import threading
+from functools import cached_property
+from typing import Dict, List, Any, Optional, Set, Tuple
 import uuid
 
-from app.chains.summarization_chain import create_summarization_chain
+import numpy as np
+import xxhash
+
+from app.chains.summarization_chain import (
+    MAX_SINGLE_PASS_TOKENS,
+    SummarizationChain,
+    create_summarization_chain,
+)
+from app.core.embeddings_service import create_embeddings_service
+from app.core.tokenizer import count_tokens
+from app.services.semantic_cache import SemanticCache, create_semantic_cache
+from app.services.tinylfu_cache import TinyLFUCache
 from app.services.document_service import get_document_service
+from app.services.job_store import create_job_store
 from app.models.document_models import SummaryLength
 from app.config import get_settings
 
@@ -18,9 +33,54 @@ class SummarizationService:
     """Service for document summarization."""
 
     def __init__(self):
-        self.chain = create_summarization_chain()
         self.document_service = get_document_service()
-        self.jobs: Dict[str, Dict[str, Any]] = {}  # Job tracking
+        self.job_store = create_job_store()
+        self._job_tasks: Set[asyncio.Task] = set()  # Keeps running jobs referenced
+        
+        # Finished summaries keyed by (text digest, length, document_type);
+        # TinyLFU admission keeps one-off documents from evicting repeats
+        self.summary_cache = TinyLFUCache(
+            maxsize=settings.summary_cache_max_size,
+            ttl=settings.summary_cache_ttl,
+        )
+        
+        # Summaries of near-duplicate texts, one cache per (length,
+        # document_type) so summary styles never mix
+        self.embeddings_service = create_embeddings_service()
+        self._semantic_caches: Dict[Tuple[str, str], SemanticCache] = {}
+
+    @cached_property
+    def chain(self) -> SummarizationChain:
+        """Summarization chain, built on first use."""
+        return create_summarization_chain()
+
+    def _semantic_cache(self, length: str, document_type: str) -> SemanticCache:
+        """Get the semantic summary cache for a length and type."""
+        key = (length, document_type)
+        cache = self._semantic_caches.get(key)
+        if cache is None:
+            cache = create_semantic_cache(
+                max_size=settings.summary_cache_max_size,
+                ttl=settings.summary_cache_ttl,
+            )
+            self._semantic_caches[key] = cache
+        return cache
+
+    async def _embed_for_cache(self, text: str, token_count: int) -> Optional[np.ndarray]:
+        """
+        Embed text for the semantic summary cache.
+        
+        Texts long enough to need map-reduce are skipped, as they can exceed
+        the embedding model's input limit. Embedding errors only disable the
+        semantic lookup for this request.
+        """
+        if token_count > MAX_SINGLE_PASS_TOKENS:
+            return None
+        try:
+            return (await self.embeddings_service.aembed_texts([text]))[0]
+        except Exception as e:
+            logger.warning(f"Skipping semantic summary cache: {e}")
+            return None
 
     async def summarize_document(
         self,
@@ -74,18 +134,56 @@ class SummarizationService:
         """
         Summarize raw text.
         
+        Identical requests are answered from the summary cache, and
+        near-duplicate texts from the semantic summary cache, without
+        running the chain. While the semantic cache is empty there is
+        nothing to look up, so the text is embedded alongside the
+        summarization instead of before it.
+        
         Args:
             text: Text to summarize
             length: Summary length
             document_type: Document type
             
         Returns:
-            Summary result
+            Summary result, with `cache_hit` set when served from the cache
         """
         try:
-            result = self.chain.summarize(text, length, document_type)
+            cache_key = (
+                xxhash.xxh3_128_digest(text.encode("utf-8", "surrogatepass")),
+                length,
+                document_type,
+            )
+            cached = self.summary_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Summary cache hit ({len(text)} chars)")
+                return {**cached, "cache_hit": True}
+            
+            token_count = count_tokens(text)
+            semantic_cache = self._semantic_cache(length, document_type)
+            embedding_task = asyncio.create_task(self._embed_for_cache(text, token_count))
+            if len(semantic_cache):
+                embedding = await embedding_task
+                if embedding is not None:
+                    cached = semantic_cache.get(embedding)
+                    if cached is not None:
+                        logger.info(f"Semantic summary cache hit ({len(text)} chars)")
+                        self.summary_cache[cache_key] = cached
+                        return {**cached, "cache_hit": True}
+            
+            try:
+                result = await self.chain.asummarize(
+                    text, length, document_type, token_count=token_count
+                )
+            except Exception:
+                embedding_task.cancel()
+                raise
+            embedding = await embedding_task
+            self.summary_cache[cache_key] = result
+            if embedding is not None:
+                semantic_cache.put(embedding, result)
             logger.info(f"Summarized text ({len(text)} chars)")
-            return result
+            return {**result, "cache_hit": False}
             
         except Exception as e:
             logger.error(f"Error summarizing text: {e}")
@@ -109,19 +207,18 @@ class SummarizationService:
         try:
             job_id = str(uuid.uuid4())
             
-            self.jobs[job_id] = {
+            await self.job_store.create(job_id, {
                 "status": "pending",
                 "document_ids": document_ids,
                 "length": length,
                 "total": len(document_ids),
-                "completed": 0,
-                "results": []
-            }
+            })
             
             logger.info(f"Created batch summarization job {job_id} for {len(document_ids)} documents")
             
-            # TODO: Implement async batch processing
-            # For now, just track the job
+            task = asyncio.create_task(self._run_batch(job_id, document_ids, length))
+            self._job_tasks.add(task)
+            task.add_done_callback(self._job_tasks.discard)
             
             return job_id
             
@@ -129,20 +226,50 @@ class SummarizationService:
             logger.error(f"Error creating batch summarization job: {e}")
             raise
 
+    async def _run_batch(self, job_id: str, document_ids: List[str], length: str):
+        """
+        Summarize a job's documents concurrently, recording progress.
+        
+        At most settings.batch_summarize_max_concurrency documents are
+        summarized at once. A failed document is recorded in the results
+        and does not stop the rest of the job.
+        """
+        await self.job_store.set_status(job_id, "running")
+        semaphore = asyncio.Semaphore(settings.batch_summarize_max_concurrency)
+        
+        async def _summarize_one(document_id: str) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    return await self.summarize_document(document_id, length)
+                except Exception as e:
+                    return {"document_id": document_id, "error": str(e)}
+        
+        for next_result in asyncio.as_completed(
+            [_summarize_one(document_id) for document_id in document_ids]
+        ):
+            await self.job_store.add_result(job_id, await next_result)
+        
+        await self.job_store.set_status(job_id, "completed")
+        logger.info(f"Finished batch summarization job {job_id}")
+
     async def get_job_status(self, job_id: str) -> Dict[str, Any]:
         """Get batch summarization job status."""
-        if job_id not in self.jobs:
+        job = await self.job_store.get(job_id)
+        if job is None:
             raise ValueError(f"Job {job_id} not found")
-        return self.jobs[job_id]
+        return job
 
 
 # Global service instance
-_summarization_service: SummarizationService = None
+_summarization_service: Optional[SummarizationService] = None
+_summarization_service_lock = threading.Lock()
 
 
 def get_summarization_service() -> SummarizationService:
     """Get or create summarization service instance."""
     global _summarization_service
     if _summarization_service is None:
-        _summarization_service = SummarizationService()
+        with _summarization_service_lock:
+            if _summarization_service is None:
+                _summarization_service = SummarizationService()
     return _summarization_service
@@ -0,0 +1,150 @@
+"""
+TTL cache with TinyLFU admission, so one-off entries can't flush hot ones.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Tuple
+
+import numpy as np
+import xxhash
+
+
+class FrequencySketch:
+    """
+    Count-min sketch of recent access frequencies.
+
+    Counters saturate at 15 and are all halved every `sample_size`
+    increments, so the estimate tracks recent popularity rather than
+    all-time counts.
+    """
+
+    DEPTH = 4
+    MAX_COUNT = 15
+    MIN_WIDTH = 256  # Keeps tiny caches from colliding most keys
+
+    def __init__(self, capacity: int):
+        """
+        Initialize frequency sketch.
+
+        Args:
+            capacity: Number of entries in the cache being guarded
+        """
+        width = max(self.MIN_WIDTH, 1 << (capacity - 1).bit_length())
+        self._mask = width - 1
+        self._table = np.zeros((self.DEPTH, width), dtype=np.uint8)
+        self._rows = np.arange(self.DEPTH)
+        self.sample_size = 10 * width
+        self._additions = 0
+
+    def _indexes(self, key: Hashable) -> np.ndarray:
+        """One counter index per row, each from a differently seeded hash."""
+        # repr() rather than hash(), which varies with PYTHONHASHSEED
+        data = repr(key).encode("utf-8", "surrogatepass")
+        return np.fromiter(
+            (xxhash.xxh3_64_intdigest(data, seed=row) & self._mask for row in range(self.DEPTH)),
+            dtype=np.int64,
+            count=self.DEPTH,
+        )
+
+    def estimate(self, key: Hashable) -> int:
+        """Estimated recent access count of a key."""
+        return int(self._table[self._rows, self._indexes(key)].min())
+
+    def increment(self, key: Hashable):
+        """Record one access to a key."""
+        idx = self._indexes(key)
+        counters = self._table[self._rows, idx]
+        self._table[self._rows, idx] = np.minimum(counters + 1, self.MAX_COUNT)
+
+        self._additions += 1
+        if self._additions >= self.sample_size:
+            self._table >>= 1
+            self._additions //= 2
+
+
+class TinyLFUCache:
+    """
+    LRU cache with a TTL and TinyLFU admission.
+
+    Every lookup is counted in a frequency sketch. Once the cache is full,
+    a new key only displaces the least recently used entry if the sketch
+    has seen it more often than that victim (or the victim has expired);
+    otherwise the new key is rejected. A scan of one-off keys therefore
+    leaves the frequently reused entries resident.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        Initialize cache.
+
+        Args:
+            maxsize: Maximum number of entries
+            ttl: Entry time-to-live in seconds
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._sketch = FrequencySketch(maxsize)
+
+        self.hits = 0
+        self.misses = 0
+        self.admissions = 0
+        self.rejections = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Look up a key, counting the access toward its admission."""
+        self._sketch.increment(key)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires, value = entry
+            if expires > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+
+        self.misses += 1
+        return default
+
+    def __setitem__(self, key: Hashable, value: Any):
+        now = time.monotonic()
+        if key in self._entries:
+            self._entries[key] = (now + self.ttl, value)
+            self._entries.move_to_end(key)
+            return
+
+        if len(self._entries) >= self.maxsize:
+            victim = next(iter(self._entries))
+            victim_live = self._entries[victim][0] > now
+            if victim_live and self._sketch.estimate(key) <= self._sketch.estimate(victim):
+                self.rejections += 1
+                return
+            del self._entries[victim]
+
+        self._entries[key] = (now + self.ttl, value)
+        self.admissions += 1
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and entry[0] > time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self):
+        """Remove all cached entries."""
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        total = self.hits + self.misses
+        return {
+            "size": len(self),
+            "max_size": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "admissions": self.admissions,
+            "rejections": self.rejections,
+        }
@@ -3,10 +3,19 @@ Helper utility functions
 """
 
 import hashlib
+import time
 from datetime import datetime
-from typing import Any, Dict
+from pathlib import Path
+from typing import Any, Dict, Union
 import re
 
+import xxhash
+
+# Any character that isn't alphanumeric, dash, underscore, or dot
+_UNSAFE_FILENAME_CHARS = re.compile(r'[^\w\-.]')
+
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
 
 def generate_document_id(filename: str, content_hash: str = None) -> str:
     """
@@ -19,13 +28,14 @@ def generate_document_id(filename: str, content_hash: str = None) -> str:
     Returns:
         Unique document identifier
     """
-    timestamp = datetime.utcnow().isoformat()
-    base_string = f"{filename}_{timestamp}"
+    base_string = f"{filename}_{time.time_ns()}"
     
     if content_hash:
         base_string += f"_{content_hash}"
     
-    return hashlib.sha256(base_string.encode()).hexdigest()[:16]
+    # IDs only need to be unique, not unforgeable, so a fast
+    # non-cryptographic hash is enough
+    return xxhash.xxh3_128_hexdigest(base_string.encode("utf-8", "surrogatepass"))[:16]
 
 
 def sanitize_filename(filename: str) -> str:
@@ -38,17 +48,18 @@ def sanitize_filename(filename: str) -> str:
     Returns:
         Sanitized filename
     """
-    # Remove any character that isn't alphanumeric, dash, underscore, or dot
-    sanitized = re.sub(r'[^\w\-.]', '_', filename)
-    return sanitized
+    return _UNSAFE_FILENAME_CHARS.sub('_', filename)
 
 
-def calculate_file_hash(content: bytes) -> str:
+def calculate_file_hash(content: Union[bytes, bytearray, memoryview]) -> str:
     """
     Calculate SHA-256 hash of file content
     
+    Any buffer is hashed in place, so pass a bytearray, mmap or memoryview
+    as-is rather than converting it with bytes(), which copies it.
+    
     Args:
-        content: File content as bytes
+        content: File content as a bytes-like object
         
     Returns:
         Hexadecimal hash string
@@ -56,6 +67,20 @@ def calculate_file_hash(content: bytes) -> str:
     return hashlib.sha256(content).hexdigest()
 
 
+def calculate_file_hash_path(path: Union[str, Path]) -> str:
+    """
+    Calculate SHA-256 hash of a file on disk without reading it into memory
+    
+    Args:
+        path: Path to the file
+        
+    Returns:
+        Hexadecimal hash string
+    """
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
 def format_bytes(size: int) -> str:
     """
     Format bytes to human-readable size
@@ -66,11 +91,11 @@ def format_bytes(size: int) -> str:
     Returns:
         Formatted size string (e.g., "1.5 MB")
     """
-    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-        if size < 1024.0:
-            return f"{size:.1f} {unit}"
-        size /= 1024.0
-    return f"{size:.1f} PB"
+    if size < 1024:
+        return f"{size:.1f} B"
+    # Each unit is 2**10 of the previous one, so the bit length picks it
+    exponent = min((int(size).bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    return f"{size / (1 << (10 * exponent)):.1f} {_SIZE_UNITS[exponent]}"
 
 
 def create_metadata(
@@ -102,3 +127,21 @@ def create_metadata(
         **kwargs
     }
     return metadata
+
+
+def canonicalize_text(text: str) -> str:
+    """
+    Canonicalize text before sending it to an LLM
+    
+    Normalizes line endings and strips trailing whitespace so that inputs
+    differing only in formatting produce identical prompts (and therefore
+    hit prompt-prefix and response caches).
+    
+    Args:
+        text: Raw input text
+        
+    Returns:
+        Canonicalized text
+    """
+    lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    return "\n".join(line.rstrip() for line in lines).strip()
@@ -2,16 +2,31 @@
 Logging configuration
 """
 
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
 from pathlib import Path
 from app.config import get_settings
 
 settings = get_settings()
 
+LOG_FILE_MAX_BYTES = 100 * 1024 * 1024
+LOG_FILE_BACKUP_COUNT = 5
+LOG_BUFFER_CAPACITY = 256  # Records buffered before a file write
+
+# Background thread that performs the actual handler I/O
+_queue_listener = None
+
 
 def setup_logging():
     """Configure application logging"""
+    global _queue_listener
+    
+    root_logger = logging.getLogger()
+    if _queue_listener is not None:
+        return root_logger
     
     # Create logs directory if it doesn't exist
     log_dir = Path("logs")
@@ -32,16 +47,36 @@ def setup_logging():
     console_handler.setLevel(log_level)
     console_handler.setFormatter(formatter)
     
-    # File handler
-    file_handler = logging.FileHandler(log_dir / "app.log")
+    # File handler: rotated so the log can't grow without bound, and
+    # buffered so records reach the file in batches rather than one write
+    # per line. Warnings and errors flush the buffer immediately.
+    rotating_handler = logging.handlers.RotatingFileHandler(
+        log_dir / "app.log",
+        maxBytes=LOG_FILE_MAX_BYTES,
+        backupCount=LOG_FILE_BACKUP_COUNT,
+    )
+    rotating_handler.setFormatter(formatter)
+    file_handler = logging.handlers.MemoryHandler(
+        capacity=LOG_BUFFER_CAPACITY,
+        flushLevel=logging.WARNING,
+        target=rotating_handler,
+    )
     file_handler.setLevel(log_level)
-    file_handler.setFormatter(formatter)
     
-    # Configure root logger
-    root_logger = logging.getLogger()
+    # Configure root logger: callers only enqueue records, and a listener
+    # thread writes them to the console and file handlers
+    log_queue: queue.Queue = queue.Queue(-1)
     root_logger.setLevel(log_level)
-    root_logger.addHandler(console_handler)
-    root_logger.addHandler(file_handler)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    
+    _queue_listener = logging.handlers.QueueListener(
+        log_queue,
+        console_handler,
+        file_handler,
+        respect_handler_level=True,
+    )
+    _queue_listener.start()
+    atexit.register(_queue_listener.stop)
     
     # Reduce noise from third-party libraries
     logging.getLogger("uvicorn").setLevel(logging.INFO)
@@ -0,0 +1,19 @@
+"""
+Shared test fixtures.
+"""
+import pytest
+
+from app.core.document_loader import create_document_loader
+from app.core.text_splitter import create_text_splitter
+
+
+@pytest.fixture(scope="session")
+def document_loader():
+    """Document loader shared across tests; it holds no per-test state."""
+    return create_document_loader()
+
+
+@pytest.fixture(scope="session")
+def small_splitter():
+    """Text splitter with small chunks, shared across tests."""
+    return create_text_splitter(chunk_size=100, chunk_overlap=20)
@@ -5,7 +5,11 @@ import pytest
 from unittest.mock import Mock, patch, MagicMock
 
 from app.chains.summarization_chain import SummarizationChain, create_summarization_chain
-from app.chains.meeting_notes_chain import MeetingNotesChain, create_meeting_notes_chain
+from app.chains.meeting_notes_chain import (
+    MeetingNotesChain,
+    MeetingNotesExtraction,
+    create_meeting_notes_chain,
+)
 from app.chains.qa_chain import QAChain, create_qa_chain
 
 
@@ -56,25 +60,20 @@ class TestMeetingNotesChain:
         chain = create_meeting_notes_chain()
         assert isinstance(chain, MeetingNotesChain)
 
-    @patch('app.chains.meeting_notes_chain.LLMChain')
-    def test_extract_meeting_notes(self, mock_llm_chain):
+    def test_extract_meeting_notes(self):
         """Test meeting notes extraction."""
-        # Mock LLM response with valid JSON
-        mock_response = {
-            "text": '''{
-                "decisions": [{"decision": "Approved budget", "context": "Q4 planning"}],
-                "action_items": [{"task": "Prepare report", "owner": "John"}],
-                "key_points": ["Budget discussion", "Timeline review"],
-                "participants": ["Alice", "Bob"],
-                "next_steps": ["Schedule follow-up"]
-            }'''
-        }
-        
+        # Mock structured LLM response
         mock_chain_instance = Mock()
-        mock_chain_instance.invoke.return_value = mock_response
-        mock_llm_chain.return_value = mock_chain_instance
+        mock_chain_instance.invoke.return_value = MeetingNotesExtraction(
+            decisions=[{"decision": "Approved budget", "context": "Q4 planning"}],
+            action_items=[{"task": "Prepare report", "owner": "John"}],
+            key_points=["Budget discussion", "Timeline review"],
+            participants=["Alice", "Bob"],
+            next_steps=["Schedule follow-up"],
+        )
 
         chain = create_meeting_notes_chain()
+        chain._meeting_notes_chain = mock_chain_instance
         
         # Test extraction
         text = "Meeting notes: We discussed the budget and decided to increase it by 15%."
@@ -82,6 +81,22 @@ class TestMeetingNotesChain:
         
         assert "decisions" in result
         assert "action_items" in result
+        assert result["action_items"][0]["owner"] == "John"
+
+    def test_extract_action_item_without_owner(self):
+        """Test unset optional fields are left out rather than set to None."""
+        mock_chain_instance = Mock()
+        mock_chain_instance.invoke.return_value = MeetingNotesExtraction(
+            action_items=[{"task": "Book a room"}],
+        )
+
+        chain = create_meeting_notes_chain()
+        chain._meeting_notes_chain = mock_chain_instance
+        
+        result = chain.extract_meeting_notes("Someone should book a room.")
+        
+        assert "owner" not in result["action_items"][0]
+        assert result["action_items"][0].get("owner", "Unassigned") == "Unassigned"
 
 
 class TestQAChain:
@@ -19,22 +19,19 @@ class TestDocumentLoader:
         assert isinstance(loader, DocumentLoader)
         assert len(loader.supported_formats) > 0
 
-    def test_supported_formats(self):
+    def test_supported_formats(self, document_loader):
         """Test supported file formats."""
-        loader = create_document_loader()
-        assert '.pdf' in loader.supported_formats
-        assert '.docx' in loader.supported_formats
-        assert '.txt' in loader.supported_formats
+        assert '.pdf' in document_loader.supported_formats
+        assert '.docx' in document_loader.supported_formats
+        assert '.txt' in document_loader.supported_formats
 
-    def test_file_not_found(self):
+    def test_file_not_found(self, document_loader):
         """Test handling of non-existent files."""
-        loader = create_document_loader()
         with pytest.raises(FileNotFoundError):
-            loader.load("nonexistent_file.pdf")
+            document_loader.load("nonexistent_file.pdf")
 
-    def test_unsupported_format(self):
+    def test_unsupported_format(self, document_loader):
         """Test handling of unsupported formats."""
-        loader = create_document_loader()
         # Create a temporary file with unsupported extension
         import tempfile
         with tempfile.NamedTemporaryFile(suffix='.xyz', delete=False) as f:
@@ -42,10 +39,19 @@ class TestDocumentLoader:
         
         try:
             with pytest.raises(ValueError, match="Unsupported file format"):
-                loader.load(temp_path)
+                document_loader.load(temp_path)
         finally:
             Path(temp_path).unlink(missing_ok=True)
 
+    def test_text_newlines_normalized(self, document_loader, tmp_path):
+        """Test CRLF and CR line endings are read as plain newlines."""
+        path = tmp_path / "notes.txt"
+        path.write_bytes(b"First paragraph.\r\n\r\nSecond\rline.")
+        
+        documents = document_loader.load(str(path))
+        
+        assert documents[0].page_content == "First paragraph.\n\nSecond\nline."
+
 
 class TestTextSplitter:
     """Tests for text splitter."""
@@ -57,21 +63,19 @@ class TestTextSplitter:
         assert splitter.chunk_size == 1000
         assert splitter.chunk_overlap == 150
 
-    def test_split_short_text(self):
+    def test_split_short_text(self, small_splitter):
         """Test splitting short text."""
-        splitter = create_text_splitter(chunk_size=100, chunk_overlap=20)
         text = "This is a short text that doesn't need splitting."
         
-        chunks = splitter.split_text(text)
+        chunks = small_splitter.split_text(text)
         assert len(chunks) == 1
         assert chunks[0] == text
 
-    def test_split_long_text(self):
+    def test_split_long_text(self, small_splitter):
         """Test splitting long text."""
-        splitter = create_text_splitter(chunk_size=100, chunk_overlap=20)
         text = "This is a sentence. " * 50  # Create long text
         
-        chunks = splitter.split_text(text)
+        chunks = small_splitter.split_text(text)
         assert len(chunks) > 1
         
         # Check overlap
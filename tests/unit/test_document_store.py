@@ -0,0 +1,78 @@
+"""
+Unit tests for document metadata stores.
+"""
+import pytest
+
+from app.models.document_models import DocumentMetadata, DocumentStatus
+from app.services.document_store import InMemoryDocumentStore, SQLiteDocumentStore
+
+
+def _metadata(document_id: str) -> DocumentMetadata:
+    return DocumentMetadata(
+        document_id=document_id,
+        filename=f"{document_id}.pdf",
+        file_type="pdf",
+        file_size=100,
+    )
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "sqlite":
+        sqlite_store = SQLiteDocumentStore(str(tmp_path / "documents.db"))
+        yield sqlite_store
+        sqlite_store.close()
+    else:
+        yield InMemoryDocumentStore()
+
+
+class TestDocumentStore:
+    """Tests for document metadata stores."""
+
+    def test_put_and_get(self, store):
+        """Test stored metadata round-trips, and updates replace it."""
+        metadata = _metadata("a")
+        store.put(metadata)
+        metadata.status = DocumentStatus.COMPLETED
+        store.put(metadata)
+
+        assert store.get("a").status == DocumentStatus.COMPLETED
+        assert store.get("missing") is None
+        assert store.count() == 1
+
+    def test_pagination(self, store):
+        """Test offset and cursor pages share insertion order."""
+        for document_id in ["c", "a", "b"]:
+            store.put(_metadata(document_id))
+
+        assert [m.document_id for m in store.list(skip=1, limit=5)] == ["a", "b"]
+        assert [m.document_id for m in store.list(limit=5, cursor="c")] == ["a", "b"]
+        assert store.list(cursor="missing") == []
+
+    def test_cursor_walk(self, store):
+        """Test following cursors page by page visits every document once."""
+        for document_id in ["c", "a", "d", "b"]:
+            store.put(_metadata(document_id))
+        store.delete("d")
+
+        seen = []
+        page = store.list(limit=2)
+        while page:
+            seen.extend(m.document_id for m in page)
+            page = store.list(limit=2, cursor=page[-1].document_id)
+
+        assert seen == ["c", "a", "b"]
+
+    def test_delete(self, store):
+        """Test deleted documents disappear from lookups and listings."""
+        store.put(_metadata("a"))
+        store.put(_metadata("b"))
+
+        assert store.delete("a") is True
+        assert store.delete("a") is False
+        assert store.get("a") is None
+        assert [m.document_id for m in store.list()] == ["b"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
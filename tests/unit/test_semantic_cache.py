@@ -0,0 +1,71 @@
+"""
+Unit tests for the semantic cache.
+"""
+import pytest
+from unittest.mock import patch
+
+from app.services.semantic_cache import SemanticCache
+
+
+class TestSemanticCache:
+    """Tests for semantic cache."""
+
+    def test_exact_hit(self):
+        """Test lookup with the same embedding."""
+        cache = SemanticCache(dimension=3, threshold=0.9, max_size=4)
+        cache.put([1.0, 0.0, 0.0], "answer")
+        assert cache.get([1.0, 0.0, 0.0]) == "answer"
+        assert cache.hits == 1
+
+    def test_near_duplicate_hit(self):
+        """Test lookup with a similar but not identical embedding."""
+        cache = SemanticCache(dimension=3, threshold=0.9, max_size=4)
+        cache.put([1.0, 0.0, 0.0], "answer")
+        assert cache.get([0.99, 0.05, 0.0]) == "answer"
+
+    def test_miss_below_threshold(self):
+        """Test dissimilar embeddings miss."""
+        cache = SemanticCache(dimension=3, threshold=0.9, max_size=4)
+        cache.put([1.0, 0.0, 0.0], "answer")
+        assert cache.get([0.0, 1.0, 0.0]) is None
+        assert cache.misses == 1
+
+    def test_lru_eviction(self):
+        """Test least recently used entry is evicted when full."""
+        cache = SemanticCache(dimension=3, threshold=0.9, max_size=2)
+        cache.put([1.0, 0.0, 0.0], "x")
+        cache.put([0.0, 1.0, 0.0], "y")
+        cache.get([1.0, 0.0, 0.0])  # Touch "x"
+        cache.put([0.0, 0.0, 1.0], "z")
+
+        assert len(cache) == 2
+        assert cache.get([1.0, 0.0, 0.0]) == "x"
+        assert cache.get([0.0, 1.0, 0.0]) is None
+        assert cache.get([0.0, 0.0, 1.0]) == "z"
+
+    def test_ttl_expiry(self):
+        """Test expired entries are not returned."""
+        cache = SemanticCache(dimension=3, threshold=0.9, max_size=4, ttl=10)
+        with patch("app.services.semantic_cache.time.monotonic", return_value=100.0):
+            cache.put([1.0, 0.0, 0.0], "answer")
+        with patch("app.services.semantic_cache.time.monotonic", return_value=111.0):
+            assert cache.get([1.0, 0.0, 0.0]) is None
+
+    def test_quantized_near_duplicate_hit(self):
+        """Test int8 storage still matches similar embeddings."""
+        cache = SemanticCache(dimension=3, threshold=0.9, max_size=4, quantize=True)
+        cache.put([1.0, 0.0, 0.0], "answer")
+        assert cache.get([0.99, 0.05, 0.0]) == "answer"
+        assert cache.get([0.0, 1.0, 0.0]) is None
+
+    def test_clear(self):
+        """Test clearing the cache."""
+        cache = SemanticCache(dimension=3, threshold=0.9, max_size=4)
+        cache.put([1.0, 0.0, 0.0], "answer")
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.get([1.0, 0.0, 0.0]) is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,62 @@
+"""
+Unit tests for the TinyLFU summary cache.
+"""
+import pytest
+from unittest.mock import patch
+
+from app.services.tinylfu_cache import TinyLFUCache
+
+
+class TestTinyLFUCache:
+    """Tests for TinyLFU cache."""
+
+    def test_get_and_set(self):
+        """Test stored values are returned and counted as hits."""
+        cache = TinyLFUCache(maxsize=4, ttl=60)
+        cache["a"] = 1
+        assert cache.get("a") == 1
+        assert cache.get("missing") is None
+        assert cache.get_stats()["hits"] == 1
+
+    def test_scan_keeps_frequent_entries(self):
+        """Test one-off keys are rejected instead of evicting reused ones."""
+        cache = TinyLFUCache(maxsize=2, ttl=60)
+        for key in ["hot1", "hot2"]:
+            cache.get(key)
+            cache[key] = key
+            cache.get(key)
+
+        for i in range(20):
+            key = f"scan{i}"
+            cache.get(key)
+            cache[key] = key
+
+        assert cache.get("hot1") == "hot1"
+        assert cache.get("hot2") == "hot2"
+        assert cache.rejections == 20
+
+    def test_frequent_newcomer_is_admitted(self):
+        """Test a key seen more often than the LRU victim replaces it."""
+        cache = TinyLFUCache(maxsize=1, ttl=60)
+        cache["old"] = 1
+        for _ in range(3):
+            cache.get("new")
+        cache["new"] = 2
+
+        assert "new" in cache
+        assert "old" not in cache
+
+    def test_ttl_expiry(self):
+        """Test expired entries are not returned and make room for new ones."""
+        cache = TinyLFUCache(maxsize=1, ttl=10)
+        with patch("app.services.tinylfu_cache.time.monotonic", return_value=100.0):
+            cache.get("a")
+            cache["a"] = 1
+        with patch("app.services.tinylfu_cache.time.monotonic", return_value=111.0):
+            cache["b"] = 2
+            assert cache.get("a") is None
+            assert cache.get("b") == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])